@@ -0,0 +1,45 @@
+"""key due_date indexes on null-free sort key
+
+Revision ID: 3f1d2c9e7a64
+Revises: 82276243faf0
+Create Date: 2025-10-24 11:20:37.512906
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1d2c9e7a64"
+down_revision: str | Sequence[str] | None = "82276243faf0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Keyset pagination sorts due_date NULLs as infinity (app.core.pagination.keyset_key),
+# so a cursor is one row comparison the index can range-scan, NULL or not
+SORT_KEY = "coalesce(due_date, 'infinity'::timestamptz)"
+
+# index name -> filter columns before the sort key
+DUE_DATE_INDEXES = {
+    "ix_todos_due_date_id": [],
+    "ix_todos_completed_due_date_id": ["completed"],
+    "ix_todos_priority_due_date_id": ["priority"],
+    "ix_todos_completed_priority_due_date_id": ["completed", "priority"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, filters in DUE_DATE_INDEXES.items():
+        op.drop_index(name, table_name="todos")
+        op.create_index(name, "todos", [*filters, sa.text(SORT_KEY), "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, filters in DUE_DATE_INDEXES.items():
+        op.drop_index(name, table_name="todos")
+        op.create_index(name, "todos", [*filters, "due_date", "id"], unique=False)
@@ -0,0 +1,45 @@
+"""add todos trigram search indexes
+
+Revision ID: 5bc77d36d48f
+Revises: 844b6049ad64
+Create Date: 2025-10-22 15:37:12.904118
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5bc77d36d48f"
+down_revision: str | Sequence[str] | None = "844b6049ad64"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_todos_title_trgm",
+        "todos",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_todos_description_trgm",
+        "todos",
+        ["description"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_todos_description_trgm", table_name="todos", postgresql_using="gin")
+    op.drop_index("ix_todos_title_trgm", table_name="todos", postgresql_using="gin")
+    # The extension is left installed: other objects may depend on it
@@ -0,0 +1,40 @@
+"""add keyset pagination indexes
+
+Revision ID: 67af7024991b
+Revises: 6c8b5aea510d
+Create Date: 2025-10-21 09:12:44.318204
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "67af7024991b"
+down_revision: str | Sequence[str] | None = "6c8b5aea510d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (sort_field, id) indexes replace the single-column ones they extend
+    op.create_index("ix_todos_created_at_id", "todos", ["created_at", "id"], unique=False)
+    op.create_index("ix_todos_due_date_id", "todos", ["due_date", "id"], unique=False)
+    op.create_index("ix_todos_priority_id", "todos", ["priority", "id"], unique=False)
+    op.create_index("ix_todos_title_id", "todos", ["title", "id"], unique=False)
+    op.drop_index(op.f("ix_todos_due_date"), table_name="todos")
+    op.drop_index(op.f("ix_todos_priority"), table_name="todos")
+    op.drop_index(op.f("ix_todos_title"), table_name="todos")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_todos_title"), "todos", ["title"], unique=False)
+    op.create_index(op.f("ix_todos_priority"), "todos", ["priority"], unique=False)
+    op.create_index(op.f("ix_todos_due_date"), "todos", ["due_date"], unique=False)
+    op.drop_index("ix_todos_title_id", table_name="todos")
+    op.drop_index("ix_todos_priority_id", table_name="todos")
+    op.drop_index("ix_todos_due_date_id", table_name="todos")
+    op.drop_index("ix_todos_created_at_id", table_name="todos")
@@ -0,0 +1,53 @@
+"""add todos filtered sort indexes
+
+Revision ID: 82276243faf0
+Revises: 5bc77d36d48f
+Create Date: 2025-10-23 10:04:51.517302
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "82276243faf0"
+down_revision: str | Sequence[str] | None = "5bc77d36d48f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (filter columns..., sort column, id) for every filter/sort combination of list_filtered
+SORT_INDEXES = {
+    "ix_todos_completed_created_at_id": ["completed", "created_at", "id"],
+    "ix_todos_completed_due_date_id": ["completed", "due_date", "id"],
+    "ix_todos_completed_priority_id": ["completed", "priority", "id"],
+    "ix_todos_completed_title_id": ["completed", "title", "id"],
+    "ix_todos_priority_created_at_id": ["priority", "created_at", "id"],
+    "ix_todos_priority_due_date_id": ["priority", "due_date", "id"],
+    "ix_todos_priority_title_id": ["priority", "title", "id"],
+    "ix_todos_completed_priority_created_at_id": ["completed", "priority", "created_at", "id"],
+    "ix_todos_completed_priority_due_date_id": ["completed", "priority", "due_date", "id"],
+    "ix_todos_completed_priority_title_id": ["completed", "priority", "title", "id"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in SORT_INDEXES.items():
+        op.create_index(name, "todos", columns, unique=False)
+    # Both are prefixes of the (completed, ...) indexes above
+    op.drop_index("ix_todos_completed_due_date", table_name="todos")
+    op.drop_index(op.f("ix_todos_completed"), table_name="todos")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_todos_completed"), "todos", ["completed"], unique=False)
+    op.create_index(
+        "ix_todos_completed_due_date",
+        "todos",
+        ["completed", "due_date"],
+        unique=False,
+    )
+    for name in reversed(SORT_INDEXES):
+        op.drop_index(name, table_name="todos")
@@ -0,0 +1,51 @@
+"""add todos full text search
+
+Revision ID: 844b6049ad64
+Revises: 67af7024991b
+Create Date: 2025-10-22 10:04:31.552870
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "844b6049ad64"
+down_revision: str | Sequence[str] | None = "67af7024991b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored generated column: rewrites the table once, then maintained by PostgreSQL
+    op.add_column(
+        "todos",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')"
+                " || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_todos_search_vector",
+        "todos",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_todos_search_vector", table_name="todos", postgresql_using="gin")
+    op.drop_column("todos", "search_vector")
@@ -0,0 +1,189 @@
+"""Access-log sampling: which request lines to write, and what each stands for.
+
+Most access-log lines are identical fast 200s. ``AccessLogSampler`` decides
+per request, once it has completed, whether its line is written:
+
+- Always, with weight 1: responses that are not 2xx, requests slower than
+  ``slow_ms``, and requests flagged by the application with
+  ``always_log_request()`` (from anywhere in the request, including sync
+  endpoints run in the threadpool)
+- Otherwise with the probability configured for the route (its path
+  template, e.g. ``/api/v1/todos/{id}``), or the default rate
+- Then only while the global token bucket (``max_per_second``, bursts of
+  up to one second's worth) has a token
+
+A written sampled line carries ``sample_weight``: the number of requests
+it stands for (``1 / rate``, plus those that were sampled but refused by
+the token bucket since the route's previous line), so summing weights
+downstream estimates the real request counts.
+
+Usage Example:
+    sampler = AccessLogSampler(default_rate=0.1, route_rates={"/api/v1/health": 0})
+    flags = track_access_log_flags()  # at the start of the request
+    ...
+    weight = sampler.sample(
+        "/api/v1/todos", status_code=200, duration_ms=4.2, flagged=flags.always
+    )
+    if weight is not None:
+        logger.info("request_completed", sample_weight=weight)
+"""
+
+import random
+import time
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class AccessLogFlags:
+    """What the application asked of the current request's access-log line.
+
+    Attributes:
+        always: Write the line whatever the sampling (see ``always_log_request``)
+    """
+
+    always: bool = False
+
+
+_access_log_flags: ContextVar[AccessLogFlags | None] = ContextVar("access_log_flags", default=None)
+
+
+def track_access_log_flags() -> AccessLogFlags:
+    """Start a request's flags (done by the request middleware).
+
+    Returns:
+        The flags that ``always_log_request`` calls in this context set
+    """
+    flags = AccessLogFlags()
+    _access_log_flags.set(flags)
+    return flags
+
+
+def always_log_request() -> None:
+    """Make sure the current request's access-log line is written (not sampled out)."""
+    flags = _access_log_flags.get()
+    if flags is not None:
+        flags.always = True
+
+
+class TokenBucket:
+    """Token bucket limiting events to ``rate`` per second, in bursts of up to ``burst``.
+
+    Not thread-safe: it is meant to be used from the event loop.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+
+    def take(self) -> bool:
+        """Take a token if one is available."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+@dataclass(slots=True)
+class SamplerStats:
+    """Counters of an access-log sampler since start.
+
+    Attributes:
+        always: Lines written unconditionally (not 2xx, slow or flagged)
+        sampled: Sampled lines written
+        skipped: Requests not sampled at their route's rate
+        limited: Sampled requests refused by the token bucket
+    """
+
+    always: int = 0
+    sampled: int = 0
+    skipped: int = 0
+    limited: int = 0
+
+
+class AccessLogSampler:
+    """Decides which access-log lines to write, and their sample weight."""
+
+    def __init__(
+        self,
+        *,
+        default_rate: float = 1.0,
+        route_rates: Mapping[str, float] | None = None,
+        max_per_second: float = 0.0,
+        slow_ms: float = 1000.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            default_rate: Probability of writing a sampled line for routes not in ``route_rates``
+            route_rates: Probability per route path template (0 disables sampled lines)
+            max_per_second: Sampled lines allowed per second overall; 0 for no limit
+            slow_ms: Requests taking at least this long are always written
+            clock: Monotonic time source (injectable for tests)
+            rng: Uniform [0, 1) source (injectable for tests)
+        """
+        self.default_rate = default_rate
+        self.route_rates = dict(route_rates or {})
+        self.slow_ms = slow_ms
+        self.stats = SamplerStats()
+        self._bucket = (
+            TokenBucket(max_per_second, max(max_per_second, 1.0), clock) if max_per_second else None
+        )
+        self._rng = rng
+        self._pending: dict[str, float] = {}
+
+    def sample(
+        self,
+        route: str,
+        *,
+        status_code: int,
+        duration_ms: float,
+        flagged: bool = False,
+    ) -> float | None:
+        """Decide whether to write a completed request's line.
+
+        Args:
+            route: Route path template (the middleware passes ``unmatched`` when none matched)
+            status_code: Response status
+            duration_ms: Time to the last response byte
+            flagged: The application asked for the line (``AccessLogFlags.always``)
+
+        Returns:
+            The line's sample weight, or None to skip it
+        """
+        if not 200 <= status_code < 300 or duration_ms >= self.slow_ms or flagged:
+            self.stats.always += 1
+            return 1.0
+        rate = self.route_rates.get(route, self.default_rate)
+        if rate <= 0 or (rate < 1 and self._rng() >= rate):
+            self.stats.skipped += 1
+            return None
+        weight = 1 / rate
+        if self._bucket is not None and not self._bucket.take():
+            # Carry this request's weight to the route's next written line
+            self._pending[route] = self._pending.get(route, 0.0) + weight
+            self.stats.limited += 1
+            return None
+        self.stats.sampled += 1
+        return weight + self._pending.pop(route, 0.0)
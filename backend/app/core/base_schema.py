@@ -4,53 +4,79 @@ This module provides a base Pydantic model that encapsulates common
 validation quirks specific to our FastAPI + HTML forms tech stack.
 
 Key features:
-- Automatic empty string to None conversion for datetime fields
-- Extensible for other type conversions (int, float, UUID)
+- Automatic empty string to None conversion for optional datetime, int,
+  float and UUID fields, planned once per class and built into its
+  validation schema (no Python call during validation)
+- Extensible for other type conversions (``BLANK_AS_NONE_TYPES``)
 - Single source of truth for validation behavior
 """
 
-from datetime import datetime
-from typing import Annotated, Any, Union, get_args, get_origin
-
-from pydantic import BaseModel, model_validator
+from typing import Any
+
+from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic_core import CoreSchema, core_schema
+
+BLANK_AS_NONE_TYPES = {"datetime", "int", "float", "uuid"}
+"""Core schema types whose nullable fields read blank strings as None."""
+
+BLANK_STRING = core_schema.chain_schema(
+    [
+        core_schema.str_schema(strict=True, strip_whitespace=True, max_length=0),
+        # "" fails none_schema; on_error turns that into the default, None
+        core_schema.with_default_schema(
+            core_schema.none_schema(), default=None, on_error="default"
+        ),
+    ]
+)
+"""Validates blank (empty or whitespace-only) strings to None and rejects anything else."""
+
+
+def _blank_as_none(schema: CoreSchema) -> CoreSchema:
+    """Wrap the schema of a nullable field's type so blank strings validate to None.
+
+    A chain, entirely in pydantic-core (no Python call for any input): first
+    blank strings become None and every other value passes through
+    unchanged, then the result is validated by ``schema`` (None accepted).
+    Values of the field's type (such as ORM attributes read with
+    ``from_attributes``) only fail the first ``str`` check, and the parse and
+    constraint errors of ``schema`` (such as ``greater_than_equal`` or
+    ``datetime_from_date_parsing``) are reported as usual. The JSON schema is
+    that of ``schema``, so the API documentation does not change.
+    """
+    return core_schema.chain_schema(
+        [
+            core_schema.union_schema(
+                [BLANK_STRING, core_schema.any_schema()], mode="left_to_right"
+            ),
+            core_schema.nullable_schema(schema),
+        ],
+        metadata={"pydantic_js_functions": [lambda _schema, handler: handler(schema)]},
+    )
 
 
-def _is_datetime_type(tp: Any) -> bool:
-    """Check if a type annotation is datetime or Optional[datetime].
+def _model_fields(schema: CoreSchema) -> dict[str, Any]:
+    """Find the fields of a model's core schema (inside any validator wrappers)."""
+    while schema["type"] != "model-fields":
+        schema = schema["schema"]
+    return schema["fields"]
 
-    Handles:
-    - datetime
-    - datetime | None (UnionType)
-    - Optional[datetime] (Union)
-    - Annotated[datetime | None, ...] (Annotated with metadata)
 
-    Args:
-        tp: Type annotation to check
+def _coercion_plan(schema: CoreSchema) -> dict[str, dict[str, Any]]:
+    """Find the fields to read blank strings as None for.
 
     Returns:
-        True if the type is datetime or datetime | None (Optional[datetime])
-
-    Examples:
-        >>> _is_datetime_type(datetime)
-        True
-        >>> _is_datetime_type(datetime | None)
-        True
-        >>> _is_datetime_type(Annotated[datetime | None, Field(...)])
-        True
-        >>> _is_datetime_type(str)
-        False
+        For each such field, its ``nullable`` schema (None is accepted before
+        anything else is tried)
     """
-    if tp is datetime:
-        return True
-    origin = get_origin(tp)
-    # Handle Annotated[datetime | None, ...] - recursively check first arg
-    if origin is Annotated:
-        args = get_args(tp)
-        return _is_datetime_type(args[0]) if args else False
-    # Handle both typing.Union (Optional[datetime]) and types.UnionType (datetime | None)
-    if origin is Union or str(origin) == "<class 'types.UnionType'>":
-        return any(_is_datetime_type(a) for a in get_args(tp))
-    return False
+    plan = {}
+    for name, field in _model_fields(schema).items():
+        # Defaults wrap the type's schema: {"type": "default", "schema": {...}}
+        nullable = field["schema"]
+        while nullable["type"] == "default":
+            nullable = nullable["schema"]
+        if nullable["type"] == "nullable" and nullable["schema"]["type"] in BLANK_AS_NONE_TYPES:
+            plan[name] = nullable
+    return plan
 
 
 class BaseSchema(BaseModel):
@@ -61,10 +87,15 @@ class BaseSchema(BaseModel):
     inherit from this class.
 
     Features:
-    - **Empty String Conversion**: Automatically converts empty strings to None
-      for datetime fields. This handles the common case where HTML forms send
-      empty strings for unfilled datetime inputs, but Pydantic expects None
-      or a valid datetime.
+    - **Empty String Conversion**: Empty (or whitespace-only) strings are
+      converted to None for optional datetime, int, float and UUID fields.
+      This handles the common case where HTML forms send empty strings for
+      unfilled inputs, but Pydantic expects None or a valid value. The
+      conversion is part of each subclass's core schema, built once when the
+      class is created, so it applies to ``model_validate``,
+      ``model_validate_json`` and FastAPI request bodies alike. Valid values
+      (such as ORM attributes read with ``from_attributes``) and None are
+      validated as before, with the same errors for invalid input.
 
     Defense-in-Depth Strategy:
     - Frontend should transform empty strings to undefined/null before sending
@@ -82,32 +113,18 @@ class BaseSchema(BaseModel):
         True
 
     Extensibility:
-    - Add similar conversions for int, float, UUID by extending the validator
+    - Add core schema types to ``BLANK_AS_NONE_TYPES``
     - Keep all tech stack quirks in one place
     """
 
-    @model_validator(mode="before")
     @classmethod
-    def _convert_empty_datetime_strings(cls, data: Any) -> Any:
-        """Convert empty strings to None for datetime fields.
-
-        This validator runs before field validation and transforms the input data.
-        It inspects all fields and converts empty strings to None for any field
-        with a datetime type annotation (including Optional[datetime]).
-
-        Args:
-            data: Input data (typically a dict from JSON request body)
-
-        Returns:
-            Modified data with empty datetime strings converted to None
-
-        Note:
-            Only processes dict input. Other input types pass through unchanged.
-        """
-        if isinstance(data, dict):
-            for name, field in cls.model_fields.items():
-                if name in data and _is_datetime_type(field.annotation):
-                    v = data[name]
-                    if isinstance(v, str) and v.strip() == "":
-                        data[name] = None
-        return data
+    def __get_pydantic_core_schema__(
+        cls,
+        source: type[BaseModel],
+        handler: GetCoreSchemaHandler,
+    ) -> CoreSchema:
+        """Build the model's core schema with blank strings accepted as None where planned."""
+        schema = handler(source)
+        for nullable in _coercion_plan(schema).values():
+            nullable["schema"] = _blank_as_none(nullable["schema"])
+        return schema
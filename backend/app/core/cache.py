@@ -0,0 +1,179 @@
+"""In-process read-through entity cache for repository lookups by primary key.
+
+Hot rows read by ID (``GET /api/v1/todos/{id}``) can be served from memory
+instead of a database round trip. The cache is deliberately simple:
+
+- LRU with a size bound: the least recently used entry is evicted first
+- TTL: entries older than ``ttl`` seconds are treated as misses, which
+  bounds staleness from writes made by *other* processes
+- Writes through a repository invalidate the entry in *this* process, when
+  their transaction commits (``invalidate_on_commit``): invalidating on
+  flush inside a unit of work would let a concurrent request re-cache the
+  still-committed old row until the TTL runs out
+
+Entries hold column values, not ORM instances, so a cached row is never
+shared between sessions; the repository rebuilds a session-bound instance
+from them on every hit.
+
+Usage Example:
+    class TodoRepository(BaseRepository[Todo]):
+        cache = entity_cache_for("todos")  # None unless enabled in Settings
+
+    entity_cache_for("todos").stats  # CacheStats(hits=..., misses=..., ...)
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+
+_INVALIDATIONS_KEY = "entity_cache_invalidations"
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters describing cache effectiveness since start (or ``clear``).
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that had to go to the database (including expired entries)
+        evictions: Entries dropped to respect ``max_size``
+        expirations: Entries dropped because they outlived ``ttl``
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class EntityCache:
+    """Size-bounded LRU cache with per-entry TTL.
+
+    Keys are ``(model name, primary key)`` tuples; values are dictionaries of
+    column values. Not thread-safe: it is meant to be used from the event loop.
+
+    Example:
+        cache = EntityCache(max_size=1000, ttl=30)
+        cache.set(("todos", 1), {"id": 1, "title": "Buy milk"})
+        cache.get(("todos", 1))  # {"id": 1, "title": "Buy milk"}
+        cache.invalidate(("todos", 1))
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+            ttl: Seconds an entry stays valid after it was stored
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Number of entries currently stored (including not yet purged expired ones)."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit/miss/eviction/expiration counters."""
+        return replace(self._stats)
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        """Return the cached values for ``key``, or None on a miss or expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        expires_at, values = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return values
+
+    def set(self, key: Hashable, values: dict[str, Any]) -> None:
+        """Store ``values`` under ``key``, evicting the least recently used entry if full."""
+        self._entries[key] = (self._clock() + self.ttl, values)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry for ``key`` if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self._stats = CacheStats()
+
+
+_caches: dict[str, EntityCache] = {}
+
+
+def entity_cache_for(name: str) -> EntityCache | None:
+    """Return the process-wide cache for a repository, if enabled in Settings.
+
+    Caching is opt-in per repository: ``name`` (by convention the table name)
+    must be listed in ``ENTITY_CACHE_MODELS``. Size and TTL come from
+    ``ENTITY_CACHE_MAX_SIZE`` and ``ENTITY_CACHE_TTL_SECONDS``.
+
+    Args:
+        name: Repository cache name, e.g. "todos"
+
+    Returns:
+        The shared cache for ``name``, or None when caching is disabled for it
+    """
+    if name not in settings.entity_cache_models:
+        return None
+    if name not in _caches:
+        _caches[name] = EntityCache(
+            max_size=settings.entity_cache_max_size,
+            ttl=settings.entity_cache_ttl_seconds,
+        )
+    return _caches[name]
+
+
+def invalidate_on_commit(
+    session: AsyncSession, cache: EntityCache, keys: Iterable[Hashable]
+) -> None:
+    """Drop ``keys`` from ``cache`` when ``session``'s transaction commits.
+
+    Call it before committing (or flushing inside a unit of work). The keys
+    wait in ``session.info`` and are dropped if the transaction rolls back.
+    """
+    session.info.setdefault(_INVALIDATIONS_KEY, []).append((cache, list(keys)))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for cache, keys in session.info.pop(_INVALIDATIONS_KEY, ()):
+        for key in keys:
+            cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_INVALIDATIONS_KEY, None)
@@ -0,0 +1,19 @@
+"""Test fixtures shared by the core module tests."""
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced monotonic clock: set ``now`` to move time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    """Provide a FakeClock starting at 0, for components taking a ``clock`` callable."""
+    return FakeClock()
@@ -1,38 +1,261 @@
 """Database session management with SQLAlchemy.
 
 This module provides:
-- Async database engine configuration
+- Async database engine configuration (pool sized from Settings, instrumented,
+  PgBouncer transaction pooling support)
 - Session factory for dependency injection
+- Request-scoped unit of work dependency (one commit per request)
+- Read replica routing for read-only endpoints (round-robin, with
+  read-your-writes stickiness and fallback to the primary)
 - Base class for SQLAlchemy models
 """
 
-from collections.abc import AsyncGenerator
+import math
+import time
+import uuid
+from collections.abc import AsyncGenerator, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import structlog
+from fastapi import Request, Response
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool, Pool
+
+from app.core.pool import InstrumentedPool
+from app.core.settings import PoolerMode, Settings, settings
+from app.core.unit_of_work import unit_of_work
+
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+"""Cookie holding the time (epoch seconds) until which a client reads from the primary."""
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+"""HTTP methods that do not write; any other method counts as a write for stickiness."""
+
+logger = structlog.get_logger()
+
+
+def _session_factory(
+    bind: AsyncEngine, sync_session_class: type[Session] = Session
+) -> sessionmaker:
+    """Create a session factory with the app's session options."""
+    return sessionmaker(
+        bind,
+        class_=AsyncSession,
+        sync_session_class=sync_session_class,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+def _unique_statement_name() -> str:
+    """Name prepared statements uniquely across all app connections sharing a server."""
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def create_engine(url: str, config: Settings = settings) -> AsyncEngine:
+    """Create an async engine with the pool configured in Settings (``DB_POOL_*``).
+
+    The pool is an ``InstrumentedPool``, so checkout waits and timeouts show
+    up in ``GET /api/v1/health/pool`` and the request log line, unless
+    ``DB_POOL_SIZE`` is 0 (``NullPool``).
+
+    With ``DB_POOLER_MODE=transaction`` (PgBouncer in transaction pooling
+    mode) each transaction may run on a different server connection, while
+    asyncpg and SQLAlchemy's asyncpg dialect cache prepared statements per
+    app connection under names like ``__asyncpg_stmt_1__``. So both caches
+    are turned off (every statement is prepared in the transaction that runs
+    it), statement names are made unique (a leftover statement on a server
+    connection never collides with a new one), and the pool gets no
+    overflow: PgBouncer multiplexes, extra app connections would only queue
+    there. Code must stay free of session state for the same reason: use
+    ``SET LOCAL``, transaction-level advisory locks and ``ON COMMIT DROP``
+    temporary tables, never plain ``SET``, ``LISTEN`` or ``WITH HOLD`` cursors.
+
+    Args:
+        url: Database URL (postgresql+asyncpg://...)
+        config: Settings to read pool options from (defaults to the app settings)
+    """
+    transaction_pooling = config.db_pooler_mode == PoolerMode.TRANSACTION
+    connect_args = {}
+    if transaction_pooling:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    pool_args = {"poolclass": NullPool}
+    if config.db_pool_size:
+        pool_args = {
+            "poolclass": InstrumentedPool,
+            "pool_size": config.db_pool_size,
+            "max_overflow": 0 if transaction_pooling else config.db_max_overflow,
+            "pool_timeout": config.db_pool_timeout,
+            "pool_use_lifo": config.db_pool_use_lifo,
+        }
+    return create_async_engine(
+        url,
+        echo=config.log_level == "DEBUG",
+        future=True,
+        connect_args=connect_args,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+        **pool_args,
+    )
 
-from app.core.settings import settings
 
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.log_level == "DEBUG",
-    future=True,
-)
+engine = create_engine(settings.database_url)
 
 # Create async session factory
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+AsyncSessionLocal = _session_factory(engine)
 
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
 
+@dataclass(slots=True, eq=False)
+class Replica:
+    """A read replica and when it may be used again after a failure.
+
+    Attributes:
+        name: URL with the password hidden, for logs and pool telemetry
+        engine: Engine connected to the replica
+        down_until: Clock time before which the replica is skipped
+    """
+
+    name: str
+    engine: AsyncEngine
+    down_until: float = 0.0
+
+
+class ReplicaSet:
+    """Round-robin selection over read replicas, skipping recently failed ones.
+
+    A replica that fails to connect is marked down for ``retry_after``
+    seconds; when no replica is up, callers fall back to the primary.
+
+    Example:
+        replicas = ReplicaSet.from_urls(["postgresql+asyncpg://...replica1/db"], retry_after=30)
+        for replica in replicas.candidates():
+            ...  # try replica; on connection failure: replicas.mark_down(replica)
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Replica],
+        *,
+        retry_after: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the set.
+
+        Args:
+            replicas: Replicas in round-robin order
+            retry_after: Seconds a failed replica is skipped
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.replicas = list(replicas)
+        self.retry_after = retry_after
+        self._clock = clock
+        self._next = 0
+
+    @classmethod
+    def from_urls(cls, urls: Sequence[str], *, retry_after: float) -> "ReplicaSet":
+        """Create engines for replica URLs."""
+        replicas = []
+        for url in urls:
+            replica_engine = create_engine(url)
+            replicas.append(
+                Replica(
+                    name=replica_engine.url.render_as_string(hide_password=True),
+                    engine=replica_engine,
+                ),
+            )
+        return cls(replicas, retry_after=retry_after)
+
+    def __len__(self) -> int:
+        """Number of configured replicas (up or down)."""
+        return len(self.replicas)
+
+    def candidates(self) -> list[Replica]:
+        """Return the replicas that are up, starting with the next in round-robin order."""
+        if not self.replicas:
+            return []
+        start = self._next
+        self._next = (start + 1) % len(self.replicas)
+        now = self._clock()
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.down_until <= now]
+
+    def mark_down(self, replica: Replica) -> None:
+        """Skip ``replica`` for ``retry_after`` seconds."""
+        replica.down_until = self._clock() + self.retry_after
+
+
+replicas = ReplicaSet.from_urls(
+    settings.database_replica_urls,
+    retry_after=settings.database_replica_retry_seconds,
+)
+"""Read replicas from ``DATABASE_REPLICA_URLS`` (empty when none are configured)."""
+
+
+def _connect_for_read() -> Connection:
+    """Connect to the next reachable replica, or to the primary if none is."""
+    for replica in replicas.candidates():
+        try:
+            return replica.engine.sync_engine.connect()
+        except (DBAPIError, OSError) as exc:
+            replicas.mark_down(replica)
+            logger.warning("replica_unavailable", replica=replica.name, error=str(exc))
+    return engine.sync_engine.connect()
+
+
+class ReadSession(Session):
+    """Session class behind ``get_read_db`` that picks its database on first use.
+
+    Nothing is chosen or checked out when the session is created: the first
+    statement connects to the next reachable replica (falling back to the
+    primary), and the session keeps that connection until it is closed.
+    ``bind`` stays the primary engine, so the dialect is known without
+    connecting.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the session; arguments are those of ``Session``."""
+        super().__init__(*args, **kwargs)
+        self.read_connection: Connection | None = None
+
+    def get_bind(self, mapper: Any = None, **kwargs: Any) -> Connection:
+        """Return the read connection, connecting on the first call."""
+        if self.read_connection is None:
+            self.read_connection = _connect_for_read()
+        return self.read_connection
+
+    def close(self) -> None:
+        """Close the session and return its connection to the pool."""
+        super().close()
+        if self.read_connection is not None:
+            self.read_connection.close()
+            self.read_connection = None
+
+
+ReadSessionLocal = _session_factory(engine, sync_session_class=ReadSession)
+"""Session factory for replica reads (see ``get_read_db``)."""
+
+
+def engine_pools() -> dict[str, Pool]:
+    """Return the connection pool of every engine: ``"primary"``, then each replica by name."""
+    pools = {"primary": engine.pool}
+    for replica in replicas.replicas:
+        pools[replica.name] = replica.engine.pool
+    return pools
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for injecting database sessions into FastAPI endpoints.
 
@@ -52,3 +275,87 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def get_db_unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency yielding a session whose repository writes commit once per request.
+
+    Repository mutators only flush; the request's writes are committed
+    together after the endpoint returns, or rolled back if it raises. Use it
+    instead of ``get_db`` for endpoints that write several times.
+
+    Note that FastAPI runs dependency teardown after the response has been
+    sent, so a failing final COMMIT is logged but cannot change the status
+    code. Endpoints that must report commit failures should group their
+    writes with ``unit_of_work`` (e.g. ``TodoService.transaction``) instead.
+
+    Usage:
+        @app.post("/transfers")
+        async def transfer(db: Annotated[AsyncSession, Depends(get_db_unit_of_work)]):
+            ...
+
+    Yields:
+        AsyncSession: Database session inside a unit of work
+    """
+    async with AsyncSessionLocal() as session, unit_of_work(session):
+        yield session
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """Return whether the client wrote recently, so its reads must see the primary."""
+    try:
+        return float(request.cookies.get(PRIMARY_STICKY_COOKIE, "")) > time.time()
+    except ValueError:
+        return False
+
+
+async def read_your_writes(request: Request, response: Response) -> None:
+    """Router dependency: after a write, keep the client's reads on the primary for a while.
+
+    Any request with a method outside ``SAFE_METHODS`` sets the
+    ``PRIMARY_STICKY_COOKIE`` cookie for ``DATABASE_REPLICA_STICKY_SECONDS``,
+    so the client's next reads see its own write even if replicas lag
+    behind. Does nothing when no replicas are configured.
+
+    Usage:
+        router = APIRouter(prefix="/api/v1/todos", dependencies=[Depends(read_your_writes)])
+    """
+    window = settings.database_replica_sticky_seconds
+    if not replicas or window <= 0 or request.method in SAFE_METHODS:
+        return
+    response.set_cookie(
+        PRIMARY_STICKY_COOKIE,
+        str(time.time() + window),
+        max_age=math.ceil(window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for read-only endpoints: a session on a read replica when possible.
+
+    Replicas from ``DATABASE_REPLICA_URLS`` are used round-robin. The
+    primary serves the request instead when no replicas are configured, when
+    every replica is down (unreachable replicas are skipped for
+    ``DATABASE_REPLICA_RETRY_SECONDS``), or when the client wrote within the
+    last ``DATABASE_REPLICA_STICKY_SECONDS`` (see ``read_your_writes``).
+
+    The replica is chosen, and a connection checked out, only when the first
+    statement runs (see ``ReadSession``), so a request that ends before
+    querying holds no connection. The session must not be used for writes:
+    replicas reject them, and reads may lag behind the primary.
+
+    Usage:
+        @app.get("/users")
+        async def list_users(db: Annotated[AsyncSession, Depends(get_read_db)]):
+            ...
+
+    Yields:
+        AsyncSession: Session on a replica, or on the primary as a fallback
+    """
+    factory = ReadSessionLocal
+    if not replicas or reads_pinned_to_primary(request):
+        factory = AsyncSessionLocal
+    async with factory() as session:
+        yield session
@@ -0,0 +1,235 @@
+"""Queue-backed structlog output: rendering and writing on a background thread.
+
+With ``PrintLoggerFactory`` every log call renders its line and writes it
+to stdout on the calling thread, which for request logs is the event loop.
+``QueueLogSink`` keeps only the cheap processors on the caller's side
+(context, level, timestamp) and appends the event dict to a bounded
+buffer; a daemon thread renders what has accumulated and writes it in
+batches:
+
+- The writer wakes every ``flush_interval`` (50 ms by default), or as soon
+  as ``batch_size`` events are waiting, and writes up to ``batch_size``
+  lines per write call, flushing once it has caught up. A log call is a
+  deque append: no lock, no thread wake-up per line
+- When the buffer is full, ``LogOverflow.DROP`` (default) discards the new
+  line and counts it in ``stats.dropped``, ``LogOverflow.BLOCK`` makes the
+  caller wait for room (no loss, but the event loop stalls while it waits)
+- Dropped lines are reported by a ``log_lines_dropped`` line in the output
+  once the writer catches up
+- If the output fails (``write``/``flush`` raises), the batch is counted in
+  ``stats.failed``, the error is reported once on stderr, and the writer
+  carries on: DROP callers keep logging, BLOCK callers are not left waiting
+
+Values in an event dict are rendered later, on the writer thread, so they
+should not be mutated after the log call (plain values, as in our logs,
+are fine). ``exc_info=True`` (``log.exception``) is resolved to the
+exception being handled when the line is queued, since the writer thread
+has none; to render tracebacks on the caller's side instead (e.g. as
+JSON), put ``format_exc_info`` in the caller's processors.
+
+Usage Example:
+    sink = QueueLogSink(structlog.processors.JSONRenderer(), max_size=10_000, batch_size=256)
+    structlog.configure(
+        processors=[merge_contextvars, add_log_level, TimeStamper(fmt="iso")],
+        logger_factory=sink.logger_factory,
+    )
+    atexit.register(sink.close)
+"""
+
+import contextlib
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, TextIO
+
+from structlog.typing import Processor
+
+from app.core.settings import LogOverflow
+
+
+@dataclass(slots=True)
+class LogSinkStats:
+    """Counters of a log sink since start.
+
+    Attributes:
+        queued: Lines accepted into the buffer
+        written: Lines written to the output
+        dropped: Lines discarded because the buffer was full
+        failed: Lines lost because writing or flushing the output raised
+        batches: Writes (each of one or more lines)
+    """
+
+    queued: int = 0
+    written: int = 0
+    dropped: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class QueueLogSink:
+    """Bounded buffer of log events, rendered and written by a daemon thread."""
+
+    def __init__(
+        self,
+        renderer: Processor,
+        *,
+        file: TextIO | None = None,
+        max_size: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+        overflow: LogOverflow = LogOverflow.DROP,
+    ) -> None:
+        """Initialize the sink and start its writer thread.
+
+        Args:
+            renderer: Final structlog processor turning an event dict into a line
+            file: Output (default: stdout at creation)
+            max_size: Events buffered before the overflow policy applies
+            batch_size: Most events rendered and written per write; a full
+                batch wakes the writer before ``flush_interval`` is up
+            flush_interval: Seconds between writes while fewer events are buffered
+            overflow: What a log call does when the buffer is full
+        """
+        self.renderer = renderer
+        self.file = file or sys.stdout
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.stats = LogSinkStats()
+        # deque.append/popleft are atomic, so the log call takes no lock;
+        # only a caller waiting for room (BLOCK) uses the condition
+        self._events: deque[dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._room = threading.Condition()
+        self._closing = False
+        self._reported_drops = 0
+        self._failing = False
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def put(self, event_dict: dict[str, Any]) -> None:
+        """Buffer one event for writing, applying the overflow policy if the buffer is full."""
+        if event_dict.get("exc_info") is True:
+            # Only this thread knows the exception being handled
+            event_dict["exc_info"] = sys.exc_info()
+        if len(self._events) >= self.max_size:
+            if self.overflow == LogOverflow.DROP:
+                self.stats.dropped += 1
+                return
+            with self._room:
+                while len(self._events) >= self.max_size:
+                    self._wake.set()
+                    self._room.wait(self.flush_interval)
+        self._events.append(event_dict)
+        self.stats.queued += 1
+        if len(self._events) >= self.batch_size:
+            self._wake.set()
+
+    def logger_factory(self, *_args: Any) -> "QueueLogger":
+        """structlog ``logger_factory`` whose loggers buffer to this sink."""
+        return QueueLogger(self)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is buffered and stop the writer thread (e.g. at exit)."""
+        self._closing = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def _render(self, event_dict: dict[str, Any]) -> str:
+        try:
+            return str(self.renderer(None, event_dict.get("level", "info"), event_dict))
+        except Exception as exc:  # never lose the line, or the writer thread
+            return f"log_render_failed error={exc!r} event={event_dict!r}"
+
+    def _drop_report(self) -> str | None:
+        """Render a line for drops since the last report, if any."""
+        dropped = self.stats.dropped - self._reported_drops
+        if not dropped:
+            return None
+        self._reported_drops += dropped
+        return self._render(
+            {
+                "event": "log_lines_dropped",
+                "dropped": dropped,
+                "dropped_total": self._reported_drops,
+                "level": "warning",
+                "timestamp": datetime.now(UTC).isoformat(),
+            }
+        )
+
+    def _write(self, batch: list[dict[str, Any]]) -> bool:
+        """Render and write ``batch`` (plus any drop report); return whether anything was."""
+        lines = [self._render(event_dict) for event_dict in batch]
+        report = self._drop_report()
+        if report is not None:
+            lines.append(report)
+        if not lines:
+            return False
+        try:
+            self.file.write("\n".join(lines) + "\n")
+        except Exception as exc:  # never let a broken output stop the writer thread
+            self._output_failed(exc, len(batch))
+            return False
+        self.stats.written += len(batch)
+        self.stats.batches += 1
+        return True
+
+    def _flush(self) -> None:
+        try:
+            self.file.flush()
+        except Exception as exc:  # as in _write
+            self._output_failed(exc, 0)
+        else:
+            self._failing = False
+
+    def _output_failed(self, exc: Exception, lost: int) -> None:
+        """Count lines lost to an output error, reporting the first error of a run on stderr."""
+        self.stats.failed += lost
+        if self._failing:
+            return
+        self._failing = True
+        with contextlib.suppress(Exception):
+            sys.stderr.write(
+                f"log_write_failed error={exc!r} (log lines are lost until the output recovers)\n"
+            )
+
+    def _run(self) -> None:
+        events = self._events
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            closing = self._closing
+            wrote = False
+            while True:
+                batch = [events.popleft() for _ in range(min(self.batch_size, len(events)))]
+                wrote = self._write(batch) or wrote
+                if self.overflow == LogOverflow.BLOCK:
+                    with self._room:
+                        self._room.notify_all()
+                if not events:
+                    break
+            if wrote:
+                self._flush()
+            if closing:
+                return
+
+
+class QueueLogger:
+    """structlog logger that queues the final event dict to a ``QueueLogSink``.
+
+    The processor chain must end with the event dict (no renderer); structlog
+    then calls the method for the log level with it as keyword arguments.
+    """
+
+    def __init__(self, sink: QueueLogSink) -> None:
+        """Initialize the logger for ``sink``."""
+        self._sink = sink
+
+    def msg(self, **event_dict: Any) -> None:
+        """Queue the event."""
+        self._sink.put(event_dict)
+
+    log = debug = info = warn = warning = error = err = critical = fatal = exception = msg
@@ -0,0 +1,509 @@
+"""In-process metrics in the Prometheus text format, aggregated across worker processes.
+
+Counters, gauges and histograms keyed by label values, served at
+``/metrics``:
+
+- ``http_requests_total``, ``http_request_duration_seconds`` and
+  ``http_response_size_bytes`` per method and route template, plus
+  ``http_requests_in_flight`` (recorded by ``RequestIDMiddleware``)
+- ``db_pool_*``: size, connections in use, idle and overflow, and the
+  cumulative checkouts, timeouts and wait of each engine's pool (collected
+  when metrics are rendered or snapshotted)
+- ``repository_call_duration_seconds`` per repository class and method
+  (``timed_call`` on ``BaseRepository`` methods)
+
+Recording is a dict update on the event loop thread: no locks and no
+cross-process communication, so it costs well under a microsecond. The
+snapshot thread only copies (one C-level ``dict``/``list`` copy each,
+atomic under the GIL).
+
+With several uvicorn workers, set ``METRICS_DIR`` to a directory shared by
+them: each process writes its samples to ``<pid>-<start time>.json``
+there every ``METRICS_SNAPSHOT_SECONDS`` (and at exit), and whichever
+worker serves ``/metrics`` adds up its own live samples and the other
+processes' files. Counters and histograms of exited processes keep
+counting (totals never go down, even when a pid is reused); gauges only
+include live processes. Starting processes fold exited ones' files into
+``exited.json``. Other files in the directory are ignored.
+
+Usage Example:
+    jobs = registry.counter("jobs_total", "Jobs run", ("kind",))
+    jobs.inc(("email",))
+
+    @timed_call
+    async def get_by_id(self, id): ...
+"""
+
+import atexit
+import fcntl
+import functools
+import json
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from app.core.database import engine_pools
+from app.core.pool import pool_snapshot
+from app.core.settings import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Media type of the Prometheus text exposition format."""
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Request latency bucket bounds in seconds (Prometheus client defaults)."""
+
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+"""Response size bucket bounds in bytes."""
+
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+"""Repository call latency bucket bounds in seconds."""
+
+type Labels = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """A named metric family with samples keyed by label values.
+
+    Attributes:
+        name: Metric name (counters end in ``_total``)
+        documentation: HELP text
+        labelnames: Names of the labels, in the order values are passed
+        values: Sample per label values (a number, or histogram bucket counts and sum)
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        """Initialize an empty metric family."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: dict[Labels, Any] = {}
+
+    def samples(self) -> dict[Labels, Any]:
+        """Copy of the current samples (safe to take from another thread)."""
+        return dict(self.values)
+
+    def merge(self, total: Any, value: Any) -> Any:
+        """Add the sample of another process to ``total``."""
+        return total + value
+
+    def render(self, samples: dict[Labels, Any]) -> Iterable[str]:
+        """Lines of the text format for ``samples``."""
+        for labels, value in sorted(samples.items()):
+            yield f"{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Counter(Metric):
+    """Monotonic count (or total, e.g. seconds) per label values."""
+
+    type = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Add ``amount`` to the sample for ``labels``."""
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set_total(self, labels: Labels, total: float) -> None:
+        """Mirror a cumulative count kept elsewhere (for collectors)."""
+        self.values[labels] = total
+
+
+class Gauge(Metric):
+    """Value that goes up and down per label values (summed over live processes)."""
+
+    type = "gauge"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Add ``amount`` to the sample for ``labels``."""
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        """Subtract ``amount`` from the sample for ``labels``."""
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, labels: Labels, value: float) -> None:
+        """Set the sample for ``labels``."""
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    """Distribution per label values: a count per bucket plus the sum of observations.
+
+    A sample is a list of ``len(buckets) + 1`` counts (the last for values
+    above every bound) followed by the sum.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float],
+    ) -> None:
+        """Initialize an empty histogram with upper bucket bounds ``buckets`` (ascending)."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation for ``labels``."""
+        sample = self.values.get(labels)
+        if sample is None:
+            sample = self.values[labels] = [0] * (len(self.buckets) + 2)
+        sample[bisect_left(self.buckets, value)] += 1
+        sample[-1] += value
+
+    def samples(self) -> dict[Labels, Any]:
+        """Copy of the current samples, each list copied too."""
+        return {labels: list(sample) for labels, sample in list(self.values.items())}
+
+    def merge(self, total: Any, value: Any) -> Any:
+        """Add another process's bucket counts and sum to ``total``."""
+        return [a + b for a, b in zip(total, value, strict=True)]
+
+    def render(self, samples: dict[Labels, Any]) -> Iterable[str]:
+        """Cumulative ``_bucket`` lines, then ``_sum`` and ``_count``, per label values."""
+        names = (*self.labelnames, "le")
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for labels, sample in sorted(samples.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, sample[:-1], strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket{_label_text(names, (*labels, bound))} {cumulative}"
+            label_text = _label_text(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(sample[-1])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class MetricsRegistry:
+    """The metrics of this process, their collectors, and cross-process snapshots."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry (snapshots off)."""
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+        self.directory: Path | None = None
+        self.interval = 1.0
+        self.path: Path | None = None
+        self._stop = threading.Event()
+
+    def _add[M: Metric](self, metric: M) -> M:
+        if metric.name in self.metrics:
+            msg = f"Metric {metric.name!r} is already registered"
+            raise ValueError(msg)
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register a counter."""
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register a gauge."""
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float],
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._add(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def collector(self, collect: Callable[[], None]) -> Callable[[], None]:
+        """Register ``collect`` to refresh metrics before they are rendered or snapshotted."""
+        self.collectors.append(collect)
+        return collect
+
+    def reset(self) -> None:
+        """Drop every sample (e.g. in a forked child, whose parent reports its own)."""
+        for metric in self.metrics.values():
+            metric.values.clear()
+
+    def snapshot(self) -> dict[str, dict[Labels, Any]]:
+        """Collect, then copy every metric's samples."""
+        for collect in self.collectors:
+            collect()
+        return {name: metric.samples() for name, metric in self.metrics.items()}
+
+    def write_snapshots(self, directory: str | Path, interval: float = 1.0) -> None:
+        """Write this process's samples to ``directory`` every ``interval`` seconds.
+
+        Also at exit, and again from scratch in forked children (e.g.
+        workers forked after the app was imported). Exited processes' files
+        are first folded into ``exited.json``.
+
+        Raises:
+            RuntimeError: If process start times cannot be read (no ``/proc``,
+                i.e. not Linux): without them running processes' files cannot
+                be told from exited ones'
+        """
+        if process_start_time(os.getpid()) is None:
+            msg = "METRICS_DIR needs /proc to read process start times (Linux only)"
+            raise RuntimeError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.interval = interval
+        self.path = _own_snapshot(self.directory)
+        self.fold_exited()
+        self._start_writer()
+        atexit.register(self.write_snapshot)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        self.reset()
+        if self.directory is not None:
+            self.path = _own_snapshot(self.directory)
+            self.fold_exited()
+        self._stop = threading.Event()
+        self._start_writer()
+
+    def _start_writer(self) -> None:
+        thread = threading.Thread(target=self._run_writer, name="metrics-snapshot", daemon=True)
+        thread.start()
+
+    def _run_writer(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write_snapshot()
+
+    def write_snapshot(self) -> None:
+        """Write this process's samples to its file now (no-op with snapshots off)."""
+        if self.path is None:
+            return
+        samples = {
+            name: [[list(labels), value] for labels, value in metric_samples.items()]
+            for name, metric_samples in self.snapshot().items()
+        }
+        _write_json(self.path, samples)
+
+    def _snapshot_files(self, directory: Path) -> Iterator[tuple[Path, bool]]:
+        """Yield (path, running) for each other process's snapshot file.
+
+        Other ``.json`` files in the directory are not ours and are skipped.
+        """
+        for path in directory.glob("*.json"):
+            match = _SNAPSHOT_NAME.fullmatch(path.name)
+            if match is None or path == self.path:
+                continue
+            pid, start = int(match["pid"]), match["start"]
+            yield path, process_start_time(pid) == start
+
+    def fold_exited(self) -> None:
+        """Fold exited processes' counters and histograms into ``exited.json``.
+
+        Keeps the directory from growing with every restarted worker; their
+        gauges are dropped, as they no longer count.
+        """
+        if self.directory is None:
+            return
+        with _locked(self.directory, fcntl.LOCK_EX) as directory:
+            archive = directory / EXITED_SNAPSHOT
+            totals: dict[str, dict[Labels, Any]] = {}
+            self._merge(totals, _read_json(archive) or {}, gauges=False)
+            exited = [path for path, running in self._snapshot_files(directory) if not running]
+            if not exited:
+                return
+            for path in exited:
+                self._merge(totals, _read_json(path) or {}, gauges=False)
+            _write_json(
+                archive,
+                {
+                    name: [[list(labels), value] for labels, value in samples.items()]
+                    for name, samples in totals.items()
+                },
+            )
+            for path in exited:
+                path.unlink(missing_ok=True)
+
+    def _merge(
+        self, totals: dict[str, dict[Labels, Any]], samples: dict[str, list], *, gauges: bool
+    ) -> None:
+        """Add ``samples`` read from a snapshot file into ``totals``."""
+        for name, items in samples.items():
+            metric = self.metrics.get(name)
+            if metric is None or (isinstance(metric, Gauge) and not gauges):
+                continue
+            merged = totals.setdefault(name, {})
+            for labels, value in items:
+                key = tuple(labels)
+                merged[key] = value if key not in merged else metric.merge(merged[key], value)
+
+    def render(self) -> str:
+        """Render every metric, added up across processes, in the text format."""
+        totals = self.snapshot()
+        if self.directory is not None:
+            # Shared lock: never see a folded file both in exited.json and on its own
+            with _locked(self.directory, fcntl.LOCK_SH) as directory:
+                others = [
+                    (_read_json(path), running) for path, running in self._snapshot_files(directory)
+                ]
+                others.append((_read_json(directory / EXITED_SNAPSHOT), False))
+            for samples, running in others:
+                self._merge(totals, samples or {}, gauges=running)
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render(totals[name]))
+        return "\n".join(lines) + "\n"
+
+
+EXITED_SNAPSHOT = "exited.json"
+"""Snapshot file holding the counters and histograms of exited processes."""
+
+_SNAPSHOT_NAME = re.compile(r"(?P<pid>\d+)-(?P<start>\d+)\.json")
+
+
+def process_start_time(pid: int) -> str | None:
+    """When process ``pid`` started (clock ticks since boot), or None if none runs.
+
+    Together with the pid it names one process, even once the pid is reused.
+    Read from ``/proc``, so always None off Linux.
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_bytes()
+    except OSError:
+        return None
+    # Fields after the parenthesized command name start at field 3; starttime is field 22
+    return stat.rpartition(b")")[2].split()[19].decode()
+
+
+def _own_snapshot(directory: Path) -> Path:
+    return directory / f"{os.getpid()}-{process_start_time(os.getpid())}.json"
+
+
+@contextmanager
+def _locked(directory: Path, operation: int) -> Iterator[Path]:
+    """Hold the snapshot directory's lock (shared to read, exclusive to fold)."""
+    with (directory / ".lock").open("a") as lock:
+        fcntl.flock(lock, operation)
+        yield directory
+
+
+def _read_json(path: Path) -> dict[str, list] | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None  # missing, or removed while reading
+
+
+def _write_json(path: Path, data: dict[str, list]) -> None:
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(data))
+    temporary.replace(path)  # readers never see a partial file
+
+
+registry = MetricsRegistry()
+"""The metrics of this process."""
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests completed", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration, to the last response byte",
+    ("method", "route"),
+    buckets=DURATION_BUCKETS,
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being served")
+repository_call_duration = registry.histogram(
+    "repository_call_duration_seconds",
+    "Repository method call duration",
+    ("repository", "method"),
+    buckets=QUERY_BUCKETS,
+)
+
+db_pool_size = registry.gauge("db_pool_size", "Configured persistent connections", ("pool",))
+db_pool_checked_out = registry.gauge("db_pool_checked_out", "Connections in use", ("pool",))
+db_pool_checked_in = registry.gauge("db_pool_checked_in", "Idle connections", ("pool",))
+db_pool_overflow = registry.gauge("db_pool_overflow", "Overflow connections open", ("pool",))
+db_pool_checkouts = registry.counter(
+    "db_pool_checkouts_total", "Connections checked out", ("pool",)
+)
+db_pool_timeouts = registry.counter(
+    "db_pool_timeouts_total", "Checkouts that timed out waiting", ("pool",)
+)
+db_pool_wait = registry.counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for connections", ("pool",)
+)
+
+
+@registry.collector
+def _collect_pools() -> None:
+    for name, pool in engine_pools().items():
+        snapshot = pool_snapshot(pool)
+        if snapshot is None:
+            continue
+        labels = (name,)
+        db_pool_size.set(labels, snapshot.size)
+        db_pool_checked_out.set(labels, snapshot.checked_out)
+        db_pool_checked_in.set(labels, snapshot.checked_in)
+        db_pool_overflow.set(labels, snapshot.overflow)
+        db_pool_checkouts.set_total(labels, snapshot.checkouts)
+        db_pool_timeouts.set_total(labels, snapshot.timeouts)
+        db_pool_wait.set_total(labels, pool.stats.wait_seconds_total)
+
+
+def timed_call[**P, R](
+    method: Callable[P, Awaitable[R]],
+) -> Callable[P, Awaitable[R]]:
+    """Record a repository coroutine method's duration in ``repository_call_duration``.
+
+    Labelled with the instance's class and the method name.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    async def timed(*args: P.args, **kwargs: P.kwargs) -> R:
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            repository_call_duration.observe(
+                time.perf_counter() - start, (type(args[0]).__name__, name)
+            )
+
+    return timed
+
+
+if settings.metrics_dir:
+    registry.write_snapshots(settings.metrics_dir, settings.metrics_snapshot_seconds)
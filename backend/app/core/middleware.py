@@ -1,19 +1,34 @@
 """Middleware components for request processing.
 
 This module provides middleware for:
-- Request ID generation and propagation
-- Structured logging configuration with request context
+- Request ID generation (or propagation from the load balancer)
+- Structured logging configuration with request context (rendered and
+  written on a background thread, see ``app.core.log_sink``)
+- One access-log line per request (sampled, see ``app.core.access_log``),
+  with its connection pool usage
 """
 
+import atexit
 import logging
+import re
 import time
 import uuid
-from collections.abc import Callable
+from typing import Any
 
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.access_log import AccessLogSampler, track_access_log_flags
+from app.core.database import engine
+from app.core.log_sink import QueueLogSink
+from app.core.metrics import (
+    http_request_duration,
+    http_requests,
+    http_requests_in_flight,
+    http_response_size,
+)
+from app.core.pool import PoolUsage, pool_snapshot, track_pool_usage
 from app.core.settings import Environment, settings
 
 # Configure structlog based on environment
@@ -24,31 +39,96 @@ if settings.environment == Environment.PRODUCTION:
 else:
     renderer = structlog.dev.ConsoleRenderer(colors=True)
 
-structlog.configure(
-    processors=[
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
+processors = [
+    structlog.contextvars.merge_contextvars,
+    structlog.processors.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso"),
+]
+if settings.environment == Environment.PRODUCTION:
+    # JSON has no traceback rendering of its own; format it here, on the caller's thread
+    processors.append(structlog.processors.format_exc_info)
+
+# Render and write on a background thread (LOG_QUEUE_SIZE=0: on the caller's)
+log_sink = None
+if settings.log_queue_size:
+    log_sink = QueueLogSink(
         renderer,
-    ],
+        max_size=settings.log_queue_size,
+        batch_size=settings.log_batch_size,
+        flush_interval=settings.log_flush_interval_seconds,
+        overflow=settings.log_overflow,
+    )
+    atexit.register(log_sink.close)
+
+structlog.configure(
+    processors=processors if log_sink else [*processors, renderer],
     wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
     context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
+    logger_factory=log_sink.logger_factory if log_sink else structlog.PrintLoggerFactory(),
     cache_logger_on_first_use=False,
 )
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware that generates a unique request ID for each incoming request.
+access_log_sampler = AccessLogSampler(
+    default_rate=settings.access_log_sample_rate,
+    route_rates=settings.access_log_route_rates,
+    max_per_second=settings.access_log_max_per_second,
+    slow_ms=settings.access_log_slow_ms,
+)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+UNMATCHED_ROUTE = "unmatched"
+"""Route key (metrics label, sampling route) of requests no route matched.
+
+E.g. 404s and CORS preflights answered by middleware.
+"""
+
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+"""Inbound request IDs used as-is; others (or none) are replaced by a new UUID4."""
+
+
+def _inbound_request_id(scope: Scope) -> str | None:
+    """Return the request's ``X-Request-ID`` header (from the load balancer) if acceptable."""
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            request_id = value.decode("latin-1")
+            return request_id if REQUEST_ID_PATTERN.fullmatch(request_id) else None
+    return None
+
+
+class RequestIDMiddleware:
+    """Middleware that assigns a request ID to each request and logs its completion.
 
     The request ID is:
-    1. Generated as a UUID4
+    1. Taken from an inbound 'X-Request-ID' header (set by the load balancer)
+       when it is 1-128 characters of letters, digits and ``._:-``;
+       otherwise generated as a UUID4
     2. Added to the structlog context for automatic inclusion in all logs
     3. Included in the response headers as 'X-Request-ID'
 
-    Logging behavior varies by environment:
-    - Development: Single compact log on completion (e.g., "GET /api/v1/health → 200")
-    - Production: Separate logs for request start and completion with full details
+    Each request gets one access-log line on completion; its format varies
+    by environment:
+    - Development: Compact line (e.g., "GET /api/v1/health → 200")
+    - Production: ``request_completed`` with full details (method, path,
+      route, query, client, status, timings)
+
+    Fast 2xx lines are sampled per route (``ACCESS_LOG_SAMPLE_RATE``,
+    ``ACCESS_LOG_ROUTE_RATES``, ``ACCESS_LOG_MAX_PER_SECOND``; see
+    ``app.core.access_log``) and carry the ``sample_weight`` they stand
+    for; non-2xx, slow (``ACCESS_LOG_SLOW_MS``) and flagged
+    (``always_log_request()``) requests are always logged.
+
+    The duration runs until the last byte of the response body is sent, so
+    it covers streaming responses in full. It is also recorded, with the
+    response size and status, in the ``http_*`` metrics (``/metrics``).
+    The line also reports the request's database checkouts and the time it
+    waited for pool connections (``db_checkouts``/``db_wait_ms``), plus the
+    primary pool's connections in use and overflow at that moment.
+
+    This is plain ASGI middleware: the app runs in the request's own task
+    and context, and response messages pass through unbuffered (only the
+    header is added to ``http.response.start``).
 
     This enables request tracing across the application and correlating logs
     for a specific request.
@@ -57,10 +137,17 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         app.add_middleware(RequestIDMiddleware)
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware around ``app``."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and inject request ID into logs and response."""
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _inbound_request_id(scope) or str(uuid.uuid4())
 
         # Add request ID to structlog context for all subsequent log calls
         structlog.contextvars.clear_contextvars()
@@ -68,46 +155,109 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
 
         logger = structlog.get_logger()
 
-        # Track request duration
+        # Track request duration, pool checkouts and access-log flags
         start_time = time.perf_counter()
+        pool_usage = track_pool_usage()
+        flags = track_access_log_flags()
+        http_requests_in_flight.inc()
 
-        # Production: Log both start and completion with full details
-        if settings.environment == Environment.PRODUCTION:
-            logger.info(
-                "request_started",
-                method=request.method,
-                path=request.url.path,
-                query_params=str(request.url.query) if request.url.query else None,
-                client=request.client.host if request.client else None,
-            )
+        # An exception before the response starts becomes a 500 further out
+        status_code = 500
+        end_time = None
+        response_size = 0
 
-        # Process request
-        response = await call_next(request)
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code, end_time, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+            if message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    end_time = time.perf_counter()
 
-        # Calculate duration
-        duration_ms = (time.perf_counter() - start_time) * 1000
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            # Calculate duration (to the last body byte; background tasks run after it)
+            duration_ms = ((end_time or time.perf_counter()) - start_time) * 1000
 
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
+            # The router leaves the matched route in the scope
+            route = getattr(scope.get("route"), "path", None)
+
+            # Metrics and sampling are keyed by route template only: unmatched paths are
+            # chosen by the client, so they share one key instead of growing the key sets
+            route_key = route or UNMATCHED_ROUTE
+            http_requests_in_flight.dec()
+            labels = (scope["method"], route_key)
+            http_requests.inc((*labels, str(status_code)))
+            http_request_duration.observe(duration_ms / 1000, labels)
+            http_response_size.observe(response_size, labels)
+            sample_weight = access_log_sampler.sample(
+                route_key,
+                status_code=status_code,
+                duration_ms=duration_ms,
+                flagged=flags.always,
+            )
+            if sample_weight is not None:
+                self._log_completion(
+                    logger,
+                    scope,
+                    request_id=request_id,
+                    route=route,
+                    status_code=status_code,
+                    duration_ms=duration_ms,
+                    pool_usage=pool_usage,
+                    sample_weight=sample_weight,
+                )
+
+    @staticmethod
+    def _log_completion(
+        logger: Any,
+        scope: Scope,
+        *,
+        request_id: str,
+        route: str | None,
+        status_code: int,
+        duration_ms: float,
+        pool_usage: PoolUsage,
+        sample_weight: float,
+    ) -> None:
+        """Write the request's access-log line."""
+        query = scope["query_string"].decode("latin-1")
+        db_wait_ms = round(pool_usage.wait_seconds * 1000, 2)
+        pool = pool_snapshot(engine.pool)
 
-        # Log request completion
         if settings.environment == Environment.PRODUCTION:
+            client = scope.get("client")
             logger.info(
                 "request_completed",
-                status_code=response.status_code,
+                method=scope["method"],
+                path=scope["path"],
+                route=route,
+                query_params=query or None,
+                client=client[0] if client else None,
+                status_code=status_code,
                 duration_ms=round(duration_ms, 2),
+                db_checkouts=pool_usage.checkouts,
+                db_wait_ms=db_wait_ms,
+                pool_in_use=pool.checked_out if pool else None,
+                pool_overflow=pool.overflow if pool else None,
+                sample_weight=sample_weight,
             )
         else:
             # Development: Compact one-line log with shortened request ID
             short_id = request_id[-8:]
-            path_with_query = str(request.url.path)
-            if request.url.query:
-                path_with_query = f"{request.url.path}?{request.url.query}"
+            path_with_query = f"{scope['path']}?{query}" if query else scope["path"]
             logger.info(
-                f"{request.method} {path_with_query}",
-                code=response.status_code,
+                f"{scope['method']} {path_with_query}",
+                code=status_code,
                 t=round(duration_ms, 2),
+                db=pool_usage.checkouts,
+                db_wait=db_wait_ms,
+                pool=f"{pool.checked_out}/{pool.size + pool.max_overflow}" if pool else None,
                 request_id=short_id,
+                # Only sampled-down lines stand for more than themselves
+                **({"weight": round(sample_weight, 2)} if sample_weight != 1 else {}),
             )
-
-        return response
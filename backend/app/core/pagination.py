@@ -0,0 +1,268 @@
+"""Keyset (cursor) pagination helpers shared by repositories.
+
+OFFSET pagination makes the database walk and discard every row before the
+requested page, so deep pages get linearly slower. Keyset pagination instead
+remembers the sort key of the last row that was returned and asks for rows
+strictly "after" it, which an index on ``(sort_column, id)`` answers with a
+single range scan regardless of how deep the page is. Nullable sort columns
+are keyed on ``keyset_key(column)`` instead (NULL replaced by a value after
+every other), so their index is on that expression.
+
+This module provides:
+- ``Page``: Result container returned by paginated repository methods
+- ``CountMode``: How (and whether) a paginated query computes its total
+- ``Explain``: ``EXPLAIN (FORMAT JSON)`` construct used for planner row estimates
+- ``encode_cursor`` / ``decode_cursor``: Opaque, URL-safe cursor tokens
+- ``keyset_key``: Sort key of a column, NULL-free for nullable date/time columns
+- ``keyset_order_by`` / ``keyset_predicate``: ORDER BY and WHERE clauses for
+  a ``(keyset_key(sort_column), id)`` keyset
+
+Usage Example:
+    order_by = keyset_order_by(Todo.due_date, Todo.id, descending=False)
+    stmt = select(Todo).order_by(*order_by)
+    if cursor:
+        due_date, id = decode_cursor(cursor, [Todo.due_date, Todo.id], tag="due_date:asc")
+        stmt = stmt.where(
+            keyset_predicate(Todo.due_date, Todo.id, due_date, id, descending=False)
+        )
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum, StrEnum
+from typing import Any
+
+from sqlalchemy import ClauseElement, ColumnElement, Executable, func, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import TypeEngine
+
+from app.core.exceptions import ValidationError
+
+
+class CountMode(StrEnum):
+    """Strategy for the total row count returned alongside a page.
+
+    - ``EXACT``: ``SELECT count(*)`` over every matching row
+    - ``ESTIMATED``: the planner's row estimate (``EXPLAIN``), which costs
+      planning time only; exact on the last page of offset pagination
+    - ``NONE``: no total at all; ``has_more`` says whether a next page exists
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+@dataclass(slots=True)
+class Page[T]:
+    """A single page of results from a paginated repository query.
+
+    Attributes:
+        items: Rows on this page (at most ``limit`` items)
+        total: Number of rows matching the filters, if it was computed
+        next_cursor: Opaque cursor for the following page, or None on the last page
+        has_more: Whether at least one more row follows this page
+        count_mode: How ``total`` was computed (None if the query does not count)
+    """
+
+    items: list[T]
+    total: int | None = None
+    next_cursor: str | None = None
+    has_more: bool = False
+    count_mode: CountMode | None = None
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement (PostgreSQL only).
+
+    Returns a single row holding the JSON plan; the top node's ``Plan Rows``
+    is the planner's estimate of how many rows the statement returns.
+
+    Example:
+        plan = (await session.execute(Explain(stmt))).scalar_one()
+    """
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Executable) -> None:
+        """Wrap the statement to explain."""
+        self.stmt = stmt
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.stmt, **kw)}"
+
+
+def plan_rows(plan: Any) -> int:
+    """Extract the estimated row count from an ``EXPLAIN (FORMAT JSON)`` result."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize sort key values that JSON does not support natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    msg = f"Cannot encode {type(value).__name__} in a pagination cursor"
+    raise TypeError(msg)
+
+
+def encode_cursor(values: Sequence[Any], *, tag: str) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor string.
+
+    Args:
+        values: Sort key values of the last returned row (ending with the primary key)
+        tag: Identifies the ordering the cursor belongs to (e.g. "created_at:desc")
+
+    Returns:
+        Base64url-encoded cursor without padding
+    """
+    payload = json.dumps(
+        {"t": tag, "k": list(values)}, default=_json_default, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _coerce(column: InstrumentedAttribute, raw: Any) -> Any:
+    """Convert a decoded JSON value back into the column's Python type."""
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    if issubclass(python_type, datetime):
+        return datetime.fromisoformat(raw)
+    return python_type(raw)
+
+
+def decode_cursor(
+    cursor: str,
+    columns: Sequence[InstrumentedAttribute],
+    *,
+    tag: str,
+) -> list[Any]:
+    """Decode a cursor produced by ``encode_cursor`` into typed keyset values.
+
+    Args:
+        cursor: Cursor string received from the client
+        columns: Keyset columns, used to restore each value's Python type
+        tag: Ordering the cursor must have been created for
+
+    Returns:
+        List of values, one per column
+
+    Raises:
+        ValidationError: If the cursor is malformed or was issued for another ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        cursor_tag = payload["t"]
+        if len(values) != len(columns):
+            raise ValueError
+        typed = [_coerce(column, raw) for column, raw in zip(columns, values, strict=True)]
+    except (binascii.Error, KeyError, TypeError, ValueError) as e:
+        msg = "Invalid pagination cursor"
+        raise ValidationError(msg) from e
+
+    if cursor_tag != tag:
+        msg = f"Pagination cursor was issued for sort '{cursor_tag}', not '{tag}'"
+        raise ValidationError(msg)
+    return typed
+
+
+class NullSortKey(ColumnElement):
+    """A date/time value sorting after every real one: what NULL sorts as in a keyset.
+
+    PostgreSQL's ``'infinity'`` (which no Python datetime can hold, so no
+    stored value equals it), or on other databases a string after every
+    ISO-formatted date.
+    """
+
+    inherit_cache = True
+    _traverse_internals = (("type", InternalTraversal.dp_type),)
+
+    def __init__(self, type_: TypeEngine) -> None:
+        """Create the sentinel for columns of ``type_``."""
+        self.type = type_
+
+
+@compiles(NullSortKey, "postgresql")
+def _compile_null_sort_key_postgresql(
+    element: NullSortKey, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return f"CAST('infinity' AS {compiler.dialect.type_compiler_instance.process(element.type)})"
+
+
+@compiles(NullSortKey)
+def _compile_null_sort_key(element: NullSortKey, compiler: SQLCompiler, **kw: Any) -> str:
+    return "'9999-12-31'"
+
+
+def keyset_key(column: InstrumentedAttribute) -> ColumnElement:
+    """The sort key of ``column`` in a keyset: the column, or for a nullable one, NULL-free.
+
+    A nullable column's NULLs become ``NullSortKey`` (``coalesce(column,
+    'infinity')`` on PostgreSQL): last ascending and first descending, as
+    PostgreSQL places NULLs by default. Without NULLs one row comparison
+    selects the rows after a cursor, which an index on ``(keyset_key(column),
+    id)`` answers with a single range scan whether or not the cursor row is
+    NULL; ``NULLS LAST`` plus ``OR column IS NULL`` branches cannot.
+
+    Raises:
+        TypeError: For a nullable column that is not a date or datetime
+    """
+    if not column.nullable:
+        return column
+    if not issubclass(column.type.python_type, date):
+        msg = f"No NULL sort key for nullable keyset column {column.key!r} ({column.type})"
+        raise TypeError(msg)
+    return func.coalesce(column, NullSortKey(column.type))
+
+
+def keyset_order_by(
+    column: InstrumentedAttribute,
+    pk: InstrumentedAttribute,
+    *,
+    descending: bool,
+) -> list[ColumnElement]:
+    """Build the ORDER BY clause for a ``(keyset_key(column), pk)`` keyset.
+
+    Both keys share one direction so a single B-tree index on
+    ``(keyset_key(column), pk)`` can be scanned forwards or backwards.
+    """
+    key = keyset_key(column)
+    if descending:
+        return [key.desc(), pk.desc()]
+    return [key.asc(), pk.asc()]
+
+
+def keyset_predicate(
+    column: InstrumentedAttribute,
+    pk: InstrumentedAttribute,
+    value: Any,
+    pk_value: Any,
+    *,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """Build the WHERE clause selecting rows after ``(value, pk_value)``.
+
+    A row-value comparison (``(key, pk) > (:v, :id)``), which PostgreSQL
+    turns into an index range scan. ``value`` None (the cursor row's column
+    was NULL) compares as ``NullSortKey``.
+    """
+    key = tuple_(keyset_key(column), pk)
+    if value is None and column.nullable:
+        value = NullSortKey(column.type)
+    bound = tuple_(value, pk_value, types=[column.type, pk.type])
+    return key < bound if descending else key > bound
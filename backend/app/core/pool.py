@@ -0,0 +1,153 @@
+"""Connection pool with checkout telemetry.
+
+``InstrumentedPool`` is SQLAlchemy's asyncio queue pool plus counters that
+show whether requests wait for connections:
+
+- Checkouts, and the time each one waited for a connection (including
+  opening a new one when the pool grows)
+- Checkout timeouts (``pool_timeout`` exceeded because every connection,
+  overflow included, was in use)
+- Live size, in-use, idle and overflow counts from the pool itself
+
+SQLAlchemy's pool events fire only once a connection has been obtained, so
+they cannot time the wait or see a timeout; the pool wraps ``connect()``
+instead. Waits are also added to the current request's ``PoolUsage`` (see
+``track_pool_usage``), which the request log line reports.
+
+Usage Example:
+    engine = create_async_engine(url, poolclass=InstrumentedPool, pool_size=10)
+    pool_snapshot(engine.pool)  # PoolSnapshot(size=10, checked_out=3, ...)
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Cumulative checkout counters of a pool since start.
+
+    Attributes:
+        checkouts: Connections handed out
+        timeouts: Checkouts that gave up after ``pool_timeout``
+        wait_seconds_total: Time spent waiting for successful checkouts
+        wait_seconds_max: Longest single wait
+    """
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+@dataclass(slots=True)
+class PoolUsage:
+    """Checkouts made while serving one request.
+
+    Attributes:
+        checkouts: Connections checked out
+        wait_seconds: Time spent waiting for them
+    """
+
+    checkouts: int = 0
+    wait_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class PoolSnapshot:
+    """Point-in-time view of a pool (see ``pool_snapshot``).
+
+    Attributes:
+        size: Configured number of persistent connections (``pool_size``)
+        max_overflow: Extra connections allowed beyond ``size``
+        checked_out: Connections in use right now
+        checked_in: Idle connections in the pool
+        overflow: Overflow connections open right now
+        checkouts: Total checkouts since start
+        timeouts: Total checkout timeouts since start
+        wait_ms_avg: Mean checkout wait
+        wait_ms_max: Longest checkout wait
+    """
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_ms_avg: float
+    wait_ms_max: float
+
+
+_pool_usage: ContextVar[PoolUsage | None] = ContextVar("pool_usage", default=None)
+
+
+def track_pool_usage() -> PoolUsage:
+    """Start recording checkouts made in the current context (one request).
+
+    Returns:
+        The usage record that later checkouts in this context add to
+    """
+    usage = PoolUsage()
+    _pool_usage.set(usage)
+    return usage
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Asyncio queue pool that records checkout waits and timeouts in ``stats``."""
+
+    def __init__(self, *args: Any, max_overflow: int = 10, **kwargs: Any) -> None:
+        """Initialize the pool; arguments are those of ``QueuePool``."""
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out a connection, timing the wait."""
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        waited = time.perf_counter() - start
+        self.stats.checkouts += 1
+        self.stats.wait_seconds_total += waited
+        self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, waited)
+        usage = _pool_usage.get()
+        if usage is not None:
+            usage.checkouts += 1
+            usage.wait_seconds += waited
+        return connection
+
+    def recreate(self) -> "InstrumentedPool":
+        """Recreate the pool (after ``dispose`` or invalidation), keeping its counters."""
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def pool_snapshot(pool: Pool) -> PoolSnapshot | None:
+    """Return a snapshot of an ``InstrumentedPool``, or None for other pool classes."""
+    if not isinstance(pool, InstrumentedPool):
+        return None
+    stats = pool.stats
+    return PoolSnapshot(
+        size=pool.size(),
+        max_overflow=pool.max_overflow,
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=stats.checkouts,
+        timeouts=stats.timeouts,
+        wait_ms_avg=round(stats.wait_seconds_total / stats.checkouts * 1000, 3)
+        if stats.checkouts
+        else 0.0,
+        wait_ms_max=round(stats.wait_seconds_max * 1000, 3),
+    )
@@ -7,7 +7,13 @@ Key Features:
 - Python 3.12+ PEP 695 generic syntax for clean type parameters
 - SQLAlchemy 2.0 async operations throughout
 - Type-safe methods with full IDE autocomplete support
-- Generic pagination with metadata support
+- Generic pagination with metadata support (offset and keyset/cursor)
+- Selectable total-count strategies (exact, planner estimate, or none)
+- Single-statement writes via RETURNING (no SELECT before or after)
+- Optional read-through ``get_by_id`` cache, invalidated by writes
+- Set-based bulk writes (one statement and one commit per batch)
+- Bulk loads through COPY into a staging table, merged in one INSERT
+- Commits deferred to the enclosing ``unit_of_work`` block, if any
 - Extensible for domain-specific queries
 
 Usage Example:
@@ -38,14 +44,57 @@ Usage Example:
 When to Extend vs Override:
 - **Extend** for domain-specific queries (e.g., get_by_user, search_by_title)
 - **Override** when you need custom transaction control or caching
+  (to group several writes into one transaction, use ``unit_of_work``)
 - **Use as-is** for simple CRUD operations without special requirements
 """
 
-from collections.abc import Sequence
-
-from sqlalchemy import func, select
+import uuid
+from collections.abc import Mapping, Sequence
+from enum import Enum as PyEnum
+from itertools import batched
+
+from sqlalchemy import (
+    Enum,
+    Select,
+    Table,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    inspect,
+    null,
+    select,
+    text,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    InstrumentedAttribute,
+    Load,
+    load_only,
+    make_transient_to_detached,
+)
+from sqlalchemy.orm.util import identity_key
+
+from app.core.cache import EntityCache, invalidate_on_commit
+from app.core.database import ReadSession
+from app.core.exceptions import NotFoundError
+from app.core.metrics import timed_call
+from app.core.pagination import (
+    CountMode,
+    Explain,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    plan_rows,
+)
+from app.core.unit_of_work import commit_or_flush, has_pending_writes
 
 
 class BaseRepository[T: DeclarativeBase]:
@@ -61,6 +110,8 @@ class BaseRepository[T: DeclarativeBase]:
     Attributes:
         model: The SQLAlchemy model class
         session: The async database session
+        cache: Optional process-wide ``get_by_id`` cache (class attribute, see
+            ``app.core.cache.entity_cache_for``); None disables caching
 
     Example:
         repo = BaseRepository[User](User, session)
@@ -83,11 +134,39 @@ class BaseRepository[T: DeclarativeBase]:
         self.model = model
         self.session = session
 
-    async def get_by_id(self, id: int | str) -> T | None:
+    # asyncpg accepts at most 32767 bind parameters per statement
+    max_bind_params = 32000
+
+    cache: EntityCache | None = None
+
+    @property
+    def pk(self) -> InstrumentedAttribute:
+        """Mapped attribute of the model's (single-column) primary key."""
+        return getattr(self.model, inspect(self.model).primary_key[0].key)
+
+    @property
+    def dialect_name(self) -> str:
+        """Name of the database dialect the session is bound to (e.g. "postgresql").
+
+        Read from the session's configured bind, so it never checks out a connection.
+        """
+        return (self.session.bind or self.session.get_bind()).dialect.name
+
+    @timed_call
+    async def get_by_id(self, id: int | str, *, fields: Sequence[str] | None = None) -> T | None:
         """Retrieve a single instance by its primary key.
 
+        With a ``cache`` configured, rows are served from it when possible and
+        stored in it after a database read on the primary; the returned
+        instance is always bound to this repository's session. Rows read
+        through a ``ReadSession`` (``get_read_db``) are not stored: a lagging
+        replica could cache a row older than a write the client then reads
+        back from the primary (read-your-writes).
+
         Args:
             id: The primary key value (int or str for UUID)
+            fields: Attribute names to load (``load_only``); all columns if None.
+                Other attributes must not be accessed on the returned instance.
 
         Returns:
             The model instance if found, None otherwise
@@ -96,9 +175,64 @@ class BaseRepository[T: DeclarativeBase]:
             user = await repo.get_by_id(123)
             if user:
                 print(f"Found: {user.name}")
+
+            summary = await repo.get_by_id(123, fields=["name"])
         """
-        return await self.session.get(self.model, id)
+        if self.cache is not None:
+            # An instance already in the session may carry changes the cache must not clobber
+            existing = self.session.identity_map.get(identity_key(self.model, id))
+            if existing is not None:
+                return existing
+
+            values = self.cache.get((self.model.__name__, id))
+            if values is not None:
+                instance = self.model(**values)
+                make_transient_to_detached(instance)
+                return await self.session.merge(instance, load=False)
+
+        if fields:
+            stmt = select(self.model).where(self.pk == id).options(self._load_only(fields))
+            instance = (await self.session.scalars(stmt)).one_or_none()
+        else:
+            instance = await self.session.get(self.model, id)
+
+        # Rows read inside an uncommitted unit of work may not be visible to others yet,
+        # and rows read from a replica may predate writes already committed on the primary
+        if (
+            self.cache is not None
+            and instance is not None
+            and not has_pending_writes(self.session)
+            and not isinstance(self.session.sync_session, ReadSession)
+        ):
+            state = inspect(instance)
+            # Cache only fully loaded rows (expired or unrequested columns are missing);
+            # deferred columns are never loaded by default and are not cached
+            names = [attr.key for attr in state.mapper.column_attrs if not attr.deferred]
+            if all(name in state.dict for name in names):
+                self.cache.set(
+                    (self.model.__name__, id),
+                    {name: state.dict[name] for name in names},
+                )
+        return instance
 
+    def _load_only(self, fields: Sequence[str]) -> Load:
+        """Build a ``load_only`` option for the named attributes (plus the primary key).
+
+        Args:
+            fields: Attribute names of the model
+
+        Returns:
+            Loader option to pass to ``select(...).options()``
+        """
+        return load_only(*(getattr(self.model, name) for name in fields))
+
+    def _invalidate(self, ids: Sequence[int | str]) -> None:
+        """Drop cached rows for primary keys being written, once the transaction commits."""
+        if self.cache is not None:
+            name = self.model.__name__
+            invalidate_on_commit(self.session, self.cache, [(name, id) for id in ids])
+
+    @timed_call
     async def list(self, offset: int = 0, limit: int = 100) -> Sequence[T]:
         """Retrieve a paginated list of instances.
 
@@ -120,7 +254,14 @@ class BaseRepository[T: DeclarativeBase]:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
-    async def list_with_count(self, offset: int = 0, limit: int = 100) -> tuple[Sequence[T], int]:
+    @timed_call
+    async def list_with_count(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        *,
+        count: CountMode = CountMode.EXACT,
+    ) -> tuple[Sequence[T], int | None]:
         """Retrieve paginated instances with total count.
 
         This method is useful for UI pagination where you need to display
@@ -129,9 +270,10 @@ class BaseRepository[T: DeclarativeBase]:
         Args:
             offset: Number of records to skip (default: 0)
             limit: Maximum number of records to return (default: 100)
+            count: How to compute the total (default: exact); see ``list_page``
 
         Returns:
-            Tuple of (list of instances, total count)
+            Tuple of (list of instances, total count or None with ``CountMode.NONE``)
 
         Example:
             items, total = await repo.list_with_count(offset=0, limit=20)
@@ -140,24 +282,163 @@ class BaseRepository[T: DeclarativeBase]:
             print(f"Page {current_page} of {total_pages}: {len(items)} items")
             print(f"Showing {offset + 1}-{offset + len(items)} of {total}")
         """
-        # Get total count
-        count_stmt = select(func.count()).select_from(self.model)
-        count_result = await self.session.execute(count_stmt)
-        total = count_result.scalar() or 0
+        page = await self.list_page(offset, limit, count=count)
+        return page.items, page.total
+
+    @timed_call
+    async def list_page(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        *,
+        count: CountMode = CountMode.EXACT,
+    ) -> Page[T]:
+        """Retrieve a page of instances with the total computed as requested.
+
+        An exact ``COUNT(*)`` visits every row, which usually costs more than
+        the page itself. ``CountMode.ESTIMATED`` returns the planner's row
+        estimate instead (exact on other databases), and ``CountMode.NONE``
+        skips the total; ``has_more`` is always set from one extra fetched row.
+
+        Args:
+            offset: Number of records to skip (default: 0)
+            limit: Maximum number of records to return (default: 100)
+            count: How to compute the total (default: exact)
+
+        Returns:
+            Page with the items, total, has_more and the count mode actually used
 
-        # Get paginated items
-        items = await self.list(offset, limit)
+        Example:
+            page = await repo.list_page(offset=0, limit=20, count=CountMode.NONE)
+            if page.has_more:
+                print("Show a 'next' button")
+        """
+        stmt = select(self.model).offset(offset).limit(limit + 1)
+        result = await self.session.execute(stmt)
+        items = list(result.scalars().all())
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        total, count_mode = await self._count_total(
+            select(self.model),
+            count,
+            offset=offset,
+            page_size=len(items),
+            has_more=has_more,
+        )
+        return Page(items=items, total=total, has_more=has_more, count_mode=count_mode)
+
+    @timed_call
+    async def list_keyset(self, cursor: str | None = None, limit: int = 100) -> Page[T]:
+        """Retrieve a page of instances ordered by primary key using a cursor.
+
+        Unlike ``list``, the cost of a page does not grow with its depth: the
+        cursor carries the last primary key seen, so the query is a single
+        primary key index range scan (``WHERE id > :last_id ORDER BY id LIMIT n``).
 
-        return items, total
+        Args:
+            cursor: ``next_cursor`` from the previous page, or None for the first page
+            limit: Maximum number of records to return (default: 100)
 
+        Returns:
+            Page with the items and the cursor for the next page (None on the last page)
+
+        Raises:
+            ValidationError: If the cursor is malformed
+
+        Example:
+            page = await repo.list_keyset(limit=100)
+            while page.next_cursor:
+                page = await repo.list_keyset(cursor=page.next_cursor, limit=100)
+        """
+        pk = self.pk
+        tag = f"{pk.key}:asc"
+        stmt = select(self.model).order_by(pk.asc()).limit(limit + 1)
+        if cursor is not None:
+            (last_pk,) = decode_cursor(cursor, [pk], tag=tag)
+            stmt = stmt.where(pk > last_pk)
+
+        result = await self.session.execute(stmt)
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([getattr(items[-1], pk.key)], tag=tag)
+        return Page(items=items, next_cursor=next_cursor, has_more=next_cursor is not None)
+
+    @staticmethod
+    def _count_query(filtered: Select) -> Select:
+        """Build ``SELECT count(*)`` over the rows matched by a filtered query."""
+        return select(func.count().label("total")).select_from(filtered.subquery())
+
+    async def _count(self, filtered: Select, params: dict | None = None) -> int:
+        """Count the rows matched by a filtered query."""
+        result = await self.session.execute(self._count_query(filtered), params)
+        return result.scalar() or 0
+
+    async def _estimate_count(self, filtered: Select, params: dict | None = None) -> int | None:
+        """Return the planner's row estimate for a query, or None if unavailable.
+
+        Only PostgreSQL is supported; the statement is planned, not executed.
+        """
+        if self.dialect_name != "postgresql":
+            return None
+        result = await self.session.execute(Explain(filtered), params)
+        return plan_rows(result.scalar_one())
+
+    async def _count_total(
+        self,
+        filtered: Select,
+        mode: CountMode,
+        *,
+        offset: int | None,
+        page_size: int,
+        has_more: bool,
+        params: dict | None = None,
+    ) -> tuple[int | None, CountMode]:
+        """Compute the total for a page according to ``mode``.
+
+        Args:
+            filtered: Query selecting every matching row (without order or limit)
+            mode: Requested count mode
+            offset: Offset of the page, or None for cursor pagination
+            page_size: Number of items on the page
+            has_more: Whether rows follow this page
+            params: Values for bind parameters in ``filtered``, if any
+
+        Returns:
+            Tuple of (total or None, count mode actually used). Estimates fall
+            back to an exact count where the database cannot estimate, are
+            exact on the last page, and never undercount the rows already seen.
+        """
+        if mode is CountMode.NONE:
+            return None, mode
+        if mode is CountMode.ESTIMATED:
+            # With offset pagination every row before this page exists, unless the
+            # page is empty because the offset is past the end
+            seen = offset + page_size if offset is not None and (page_size or not offset) else None
+            if seen is not None and not has_more:
+                return seen, CountMode.EXACT
+            estimate = await self._estimate_count(filtered, params)
+            if estimate is not None:
+                if seen is not None:
+                    estimate = max(estimate, seen + 1)
+                return estimate, mode
+        return await self._count(filtered, params), CountMode.EXACT
+
+    @timed_call
     async def create(self, data: dict) -> T:
         """Create a new instance from a dictionary of attributes.
 
+        Issues a single ``INSERT ... RETURNING`` so server-generated columns
+        (primary key, timestamps) come back without a follow-up SELECT.
+
         Args:
             data: Dictionary of model attributes and values
 
         Returns:
-            The newly created model instance (refreshed from database)
+            The newly created model instance (as stored in the database)
 
         Example:
             user = await repo.create({
@@ -166,33 +447,75 @@ class BaseRepository[T: DeclarativeBase]:
             })
             print(f"Created user with ID: {user.id}")
         """
-        instance = self.model(**data)
-        self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        stmt = insert(self.model).values(**data).returning(self.model)
+        instance = (await self.session.scalars(stmt)).one()
+        await commit_or_flush(self.session)
         return instance
 
+    @timed_call
     async def update(self, instance: T, data: dict) -> T:
         """Update an existing instance with new attribute values.
 
+        Equivalent to ``update_by_id`` with the instance's primary key; the
+        instance is refreshed in place from the ``RETURNING`` row.
+
         Args:
             instance: The model instance to update
             data: Dictionary of attributes to update
 
         Returns:
-            The updated model instance (refreshed from database)
+            The updated model instance (as stored in the database)
+
+        Raises:
+            NotFoundError: If the row was deleted in the meantime
 
         Example:
             user = await repo.get_by_id(123)
             if user:
                 user = await repo.update(user, {"name": "Updated Name"})
         """
-        for key, value in data.items():
-            setattr(instance, key, value)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        return await self.update_by_id(getattr(instance, self.pk.key), data)
+
+    @timed_call
+    async def update_by_id(self, id: int | str, data: dict) -> T:
+        """Update an instance by primary key in one ``UPDATE ... RETURNING`` statement.
+
+        No SELECT is needed before or after the write: a missing row is
+        detected from the empty ``RETURNING`` result.
+
+        Args:
+            id: The primary key value
+            data: Dictionary of attributes to update (may be empty)
+
+        Returns:
+            The updated model instance (as stored in the database)
+
+        Raises:
+            NotFoundError: If no row has this primary key
+
+        Example:
+            user = await repo.update_by_id(123, {"name": "Updated Name"})
+        """
+        if not data:
+            # UPDATE needs a SET clause; with nothing to change just load the row
+            instance = await self.get_by_id(id)
+        else:
+            stmt = (
+                update(self.model)
+                .where(self.pk == id)
+                .values(**data)
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            instance = (await self.session.scalars(stmt)).one_or_none()
+            self._invalidate([id])
+            await commit_or_flush(self.session)
+        if instance is None:
+            msg = f"{self.model.__name__} with ID {id} not found"
+            raise NotFoundError(msg)
         return instance
 
+    @timed_call
     async def delete(self, instance: T) -> None:
         """Delete an instance from the database.
 
@@ -205,5 +528,266 @@ class BaseRepository[T: DeclarativeBase]:
                 await repo.delete(user)
                 print("User deleted")
         """
+        id = getattr(instance, self.pk.key)
         await self.session.delete(instance)
-        await self.session.commit()
+        self._invalidate([id])
+        await commit_or_flush(self.session)
+
+    @timed_call
+    async def delete_by_id(self, id: int | str) -> None:
+        """Delete an instance by primary key in one ``DELETE ... RETURNING`` statement.
+
+        Args:
+            id: The primary key value
+
+        Raises:
+            NotFoundError: If no row has this primary key
+
+        Example:
+            await repo.delete_by_id(123)
+        """
+        pk = self.pk
+        stmt = delete(self.model).where(pk == id).returning(pk)
+        deleted = (await self.session.scalars(stmt)).one_or_none()
+        self._invalidate([id])
+        await commit_or_flush(self.session)
+        if deleted is None:
+            msg = f"{self.model.__name__} with ID {id} not found"
+            raise NotFoundError(msg)
+
+    @timed_call
+    async def create_many(self, rows: Sequence[dict]) -> Sequence[T]:
+        """Create many instances in one transaction with multi-row INSERT ... RETURNING.
+
+        Args:
+            rows: Dictionaries of model attributes, one per instance
+
+        Returns:
+            Created instances in the same order as ``rows``
+
+        Example:
+            users = await repo.create_many([{"name": "Ann"}, {"name": "Bob"}])
+        """
+        if not rows:
+            return []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.session.scalars(stmt, list(rows))
+        instances = list(result.all())
+        await commit_or_flush(self.session)
+        return instances
+
+    @timed_call
+    async def update_many(self, rows: Sequence[dict]) -> Sequence[T]:
+        """Update many instances by primary key in one transaction.
+
+        Each row holds the primary key plus the attributes to change; rows may
+        change different attributes. Rows changing the same attributes are
+        applied by one set-based statement. On PostgreSQL that statement is
+        ``UPDATE ... FROM (VALUES ...) RETURNING``; other databases fall back
+        to an executemany UPDATE followed by a SELECT of the affected rows.
+
+        Args:
+            rows: Dictionaries containing the primary key and attributes to update
+
+        Returns:
+            Updated instances; primary keys that matched no row are absent
+
+        Example:
+            users = await repo.update_many([
+                {"id": 1, "name": "Ann"},
+                {"id": 2, "is_active": False},
+            ])
+        """
+        pk = self.pk
+        groups: dict[tuple[str, ...], list[dict]] = {}
+        for row in rows:
+            keys = tuple(sorted(key for key in row if key != pk.key))
+            groups.setdefault(keys, []).append(row)
+
+        updated: dict = {}
+        for keys, group in groups.items():
+            for instance in await self._update_group(keys, group):
+                updated[getattr(instance, pk.key)] = instance
+        self._invalidate([row[pk.key] for row in rows])
+        await commit_or_flush(self.session)
+        return list(updated.values())
+
+    async def _update_group(self, keys: tuple[str, ...], rows: Sequence[dict]) -> Sequence[T]:
+        """Apply one UPDATE statement per chunk of rows that change the same attributes."""
+        pk = self.pk
+        ids = [row[pk.key] for row in rows]
+        if not keys:
+            # Nothing to change: report which rows exist
+            stmt = select(self.model).where(pk.in_(ids))
+            return list((await self.session.scalars(stmt)).all())
+
+        table = self.model.__table__
+        if self.dialect_name != "postgresql":
+            stmt = (
+                update(table)
+                .where(table.c[pk.key] == bindparam(f"b_{pk.key}"))
+                .values({name: bindparam(f"b_{name}") for name in keys})
+            )
+            params = [{f"b_{name}": value for name, value in row.items()} for row in rows]
+            await self.session.execute(stmt, params)
+            stmt = select(self.model).where(pk.in_(ids)).execution_options(populate_existing=True)
+            return list((await self.session.scalars(stmt)).all())
+
+        names = (pk.key, *keys)
+        columns = [column(name, table.c[name].type) for name in names]
+        # A bare NULL in VALUES is untyped; a column of only NULLs would be text
+        nulls = {name: cast(null(), table.c[name].type) for name in names}
+        instances: list[T] = []
+        for chunk in batched(rows, max(1, self.max_bind_params // len(names))):
+            data = values(*columns, name="data").data(
+                [
+                    tuple(nulls[name] if row[name] is None else row[name] for name in names)
+                    for row in chunk
+                ],
+            )
+            stmt = (
+                update(self.model)
+                .where(pk == data.c[pk.key])
+                .values({name: data.c[name] for name in keys})
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            instances.extend((await self.session.scalars(stmt)).all())
+        return instances
+
+    @timed_call
+    async def delete_many(self, ids: Sequence[int | str]) -> Sequence[int | str]:
+        """Delete many instances by primary key in one statement and transaction.
+
+        Uses ``DELETE ... WHERE id = ANY(:ids) RETURNING id`` on PostgreSQL so
+        the whole batch is a single bind parameter; other databases use ``IN``.
+
+        Args:
+            ids: Primary key values to delete
+
+        Returns:
+            Primary keys that were actually deleted
+
+        Example:
+            deleted = await repo.delete_many([1, 2, 3])
+            missing = {1, 2, 3} - set(deleted)
+        """
+        if not ids:
+            return []
+        pk = self.pk
+        if self.dialect_name == "postgresql":
+            condition = pk == any_(bindparam("ids", list(ids), type_=ARRAY(pk.type)))
+        else:
+            condition = pk.in_(list(ids))
+        result = await self.session.scalars(delete(self.model).where(condition).returning(pk))
+        deleted = list(result.all())
+        self._invalidate(deleted)
+        await commit_or_flush(self.session)
+        return deleted
+
+    @timed_call
+    async def bulk_loader(self, columns: Sequence[str]) -> "BulkLoader":
+        """Start loading many rows of ``columns`` into the model's table.
+
+        On PostgreSQL, batches are written with COPY into a temporary staging
+        table (``ON COMMIT DROP``, so it is safe behind PgBouncer in
+        transaction mode) and ``BulkLoader.merge`` moves them into the table
+        with one ``INSERT ... SELECT``. Other databases insert each batch
+        directly. Either way the rows become visible when ``merge`` commits
+        (or when the enclosing ``unit_of_work`` does), all or none.
+
+        Args:
+            columns: Column names every row provides; others get their defaults
+
+        Returns:
+            Loader to ``copy`` batches into, then ``merge``
+
+        Example:
+            loader = await repo.bulk_loader(["name", "email"])
+            for chunk in chunks:
+                await loader.copy(chunk)  # [{"name": ..., "email": ...}, ...]
+            created = await loader.merge()
+        """
+        table = self.model.__table__
+        staging = None
+        if self.dialect_name == "postgresql":
+            staging = f"_load_{table.name}_{uuid.uuid4().hex[:12]}"
+            column_list = ", ".join(f'"{name}"' for name in columns)
+            await self.session.execute(
+                text(
+                    f'CREATE TEMPORARY TABLE "{staging}" ON COMMIT DROP AS '  # noqa: S608
+                    f'SELECT {column_list} FROM "{table.name}" WITH NO DATA',
+                ),
+            )
+        return BulkLoader(self.session, table, columns, staging=staging)
+
+
+class BulkLoader:
+    """Rows copied into a staging table in batches, then merged into their table at once.
+
+    Created by ``BaseRepository.bulk_loader``. Enum members are written by
+    name, as SQLAlchemy's ``Enum`` type stores them.
+
+    Attributes:
+        table: Table the rows are merged into
+        columns: Column names of every row
+        staging: Name of the temporary staging table, or None to insert directly
+        copied: Rows accepted by ``copy`` so far
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        table: Table,
+        columns: Sequence[str],
+        *,
+        staging: str | None,
+    ) -> None:
+        """Initialize the loader (see ``BaseRepository.bulk_loader``)."""
+        self.session = session
+        self.table = table
+        self.columns = tuple(columns)
+        self.staging = staging
+        self.copied = 0
+        self._enum_columns = [
+            index for index, name in enumerate(self.columns) if isinstance(table.c[name].type, Enum)
+        ]
+
+    async def copy(self, rows: Sequence[Mapping]) -> None:
+        """Write a batch of rows (mappings with every column) to the staging table."""
+        if not rows:
+            return
+        if self.staging is None:
+            await self.session.execute(insert(self.table), [dict(row) for row in rows])
+        else:
+            records = [tuple(row[name] for name in self.columns) for row in rows]
+            if self._enum_columns:
+                records = [self._enum_names(record) for record in records]
+            connection = await self.session.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                self.staging,
+                records=records,
+                columns=self.columns,
+            )
+        self.copied += len(rows)
+
+    async def merge(self) -> int:
+        """Insert the staged rows into the table and commit (or flush); return the row count."""
+        if self.staging is not None and self.copied:
+            column_list = ", ".join(f'"{name}"' for name in self.columns)
+            await self.session.execute(
+                text(
+                    f'INSERT INTO "{self.table.name}" ({column_list}) '  # noqa: S608
+                    f'SELECT {column_list} FROM "{self.staging}"',
+                ),
+            )
+        await commit_or_flush(self.session)
+        return self.copied
+
+    def _enum_names(self, record: tuple) -> tuple:
+        values = list(record)
+        for index in self._enum_columns:
+            if isinstance(values[index], PyEnum):
+                values[index] = values[index].name
+        return tuple(values)
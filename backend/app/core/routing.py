@@ -0,0 +1,199 @@
+"""Validate JSON request bodies straight from the raw bytes.
+
+FastAPI decodes a JSON body with ``json.loads`` and then validates the
+resulting dicts and lists against the body model. A body declared with
+``json_body(Model)`` is read with ``await request.body()`` and handed to
+``Model.model_validate_json`` instead, which parses and validates in one
+pass inside pydantic-core (including ``BaseSchema``'s empty-string
+handling). Only public FastAPI APIs are used: the body is a dependency, and
+invalid bodies raise ``RequestValidationError``, so the 422 response is
+FastAPI's as usual (errors located under ``body``, ``json_invalid`` for
+malformed JSON, ``missing`` for an empty body).
+
+As a dependency, the body is not part of FastAPI's generated OpenAPI
+schema. ``JSONBodyRoute`` declares it as the operation's request body and
+``json_body_openapi`` adds the model under ``components/schemas``, so the
+documentation is the same as for a regular body parameter.
+
+Usage Example:
+    router = APIRouter(prefix="/api/v1/todos", route_class=JSONBodyRoute)
+
+    @router.post("")
+    async def create_todo(data: Annotated[TodoCreate, json_body(TodoCreate)]) -> TodoResponse:
+        ...  # data was validated with TodoCreate.model_validate_json(body)
+
+    app.openapi = json_body_openapi(app)
+"""
+
+from collections.abc import Callable
+from email.message import Message
+from functools import cache
+from typing import Any, get_type_hints
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.models import Schema
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+from pydantic.json_schema import models_json_schema
+
+REF_TEMPLATE = "#/components/schemas/{model}"
+"""Where OpenAPI keeps model schemas (as FastAPI's own generator does)."""
+
+
+def _is_json(content_type: str | None) -> bool:
+    """Whether a request's content type is JSON (a missing one is read as JSON, like FastAPI)."""
+    if not content_type:
+        return True
+    message = Message()
+    message["content-type"] = content_type
+    subtype = message.get_content_subtype()
+    return message.get_content_maintype() == "application" and (
+        subtype == "json" or subtype.endswith("+json")
+    )
+
+
+class _JSONBody:
+    """Dependency reading the request body as ``model``."""
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self.model = model
+
+    async def __call__(self, request: Request) -> BaseModel:
+        body = await request.body()
+        if not body:
+            raise RequestValidationError(
+                [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+            )
+        try:
+            if _is_json(request.headers.get("content-type")):
+                return self.model.model_validate_json(body)
+            # Other content types are rejected with the model's own error, as FastAPI does
+            return self.model.model_validate(body)
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [
+                    {**error, "loc": ("body", *error["loc"])}
+                    for error in exc.errors(include_url=False)
+                ],
+                body=body,
+            ) from exc
+
+
+_MODELS: dict[str, type[BaseModel]] = {}
+"""``json_body`` models by name, for ``json_body_openapi`` to add their schemas."""
+
+
+@cache
+def json_body(model: type[BaseModel]) -> Any:
+    """Declare a request body validated from raw JSON bytes with ``model_validate_json``.
+
+    Args:
+        model: Pydantic model of the body (usually a ``BaseSchema``)
+
+    Returns:
+        ``Depends`` marker for ``Annotated[model, json_body(model)]``
+    """
+    _MODELS[model.__name__] = model
+    return Depends(_JSONBody(model))
+
+
+def json_body_model(endpoint: Callable[..., Any]) -> type[BaseModel] | None:
+    """Return the model of ``endpoint``'s ``json_body`` parameter, if it has one."""
+    for hint in get_type_hints(endpoint, include_extras=True).values():
+        for marker in getattr(hint, "__metadata__", ()):
+            dependency = getattr(marker, "dependency", None)
+            if isinstance(dependency, _JSONBody):
+                return dependency.model
+    return None
+
+
+class JSONBodyRoute(APIRoute):
+    """APIRoute documenting its ``json_body`` parameter as the operation's request body."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        model = json_body_model(endpoint)
+        if model is not None:
+            request_body = {
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": REF_TEMPLATE.format(model=model.__name__)}
+                    }
+                },
+                "required": True,
+            }
+            kwargs["openapi_extra"] = {
+                "requestBody": request_body,
+                **(kwargs.get("openapi_extra") or {}),
+            }
+        super().__init__(path, endpoint, **kwargs)
+
+
+def json_body_openapi(app: FastAPI) -> Callable[[], dict[str, Any]]:
+    """Build an ``app.openapi`` that adds the schemas of ``json_body`` models.
+
+    The schema is generated by FastAPI, with the request bodies that
+    ``JSONBodyRoute`` declares; the models they reference are then added to
+    ``components/schemas`` (encoded as FastAPI encodes its own), and the
+    operations get FastAPI's 422 response (whose schema FastAPI adds once
+    any route has parameters). Like FastAPI's, the result is cached on
+    ``app.openapi_schema``.
+
+    Args:
+        app: Application to document
+
+    Returns:
+        Function to assign to ``app.openapi``
+    """
+    generate = app.openapi
+    prefix = REF_TEMPLATE.format(model="")
+
+    def openapi() -> dict[str, Any]:
+        cached = app.openapi_schema
+        schema = generate()
+        if schema is cached:
+            return schema
+
+        operations = [
+            (operation, ref.removeprefix(prefix))
+            for path in schema["paths"].values()
+            for operation in path.values()
+            if (ref := _request_body_ref(operation)) and ref.removeprefix(prefix) in _MODELS
+        ]
+        if not operations:
+            return schema
+
+        _, definitions = models_json_schema(
+            [(_MODELS[name], "validation") for _, name in operations], ref_template=REF_TEMPLATE
+        )
+        schemas = schema.setdefault("components", {}).setdefault("schemas", {})
+        for name, definition in definitions.get("$defs", {}).items():
+            schemas.setdefault(
+                name,
+                jsonable_encoder(
+                    Schema.model_validate(definition), by_alias=True, exclude_none=True
+                ),
+            )
+        if "HTTPValidationError" in schemas:
+            for operation, _ in operations:
+                operation.setdefault("responses", {}).setdefault(
+                    "422",
+                    {
+                        "description": "Validation Error",
+                        "content": {
+                            "application/json": {"schema": {"$ref": prefix + "HTTPValidationError"}}
+                        },
+                    },
+                )
+        return schema
+
+    return openapi
+
+
+def _request_body_ref(operation: Any) -> str | None:
+    """Return the ``$ref`` of an operation's JSON request body schema, if any."""
+    if not isinstance(operation, dict):
+        return None
+    schema = operation.get("requestBody", {}).get("content", {}).get("application/json", {})
+    return schema.get("schema", {}).get("$ref")
@@ -0,0 +1,127 @@
+"""Fast JSON responses: ORM rows straight to bytes, without model validation.
+
+Returning Pydantic models from an endpoint costs three passes per row:
+``model_validate`` builds the model from the ORM object, FastAPI validates
+the return value against ``response_model`` again, and ``jsonable_encoder``
+walks the result before ``json.dumps`` encodes it. For rows already typed
+by the database, one pass is enough:
+
+- ``FieldPlan`` reads a fixed list of attributes from each row into a dict
+  (straight from the instance ``__dict__`` when they are loaded)
+- The plan's ``TypeAdapter``s encode those dicts with the serializers of
+  the response model's field types (same datetime and enum output as
+  ``model_dump_json``, no per-value type inference), and ``json_response``
+  wraps the bytes in a raw ``Response``
+
+Use it for hot read endpoints whose values need no conversion beyond what
+the serializers do; keep ``response_model`` on the route for the OpenAPI
+schema, it is not applied to a ``Response``.
+
+Usage Example:
+    plan = FieldPlan(TodoResponse, ("id", "title", "due_date"))
+    page = plan.page_adapter(TodoListResponse)
+
+    @router.get("/todos", response_model=TodoListResponse)
+    async def list_todos(...) -> Response:
+        return json_response({"items": plan.rows(todos), "total": total, ...}, page)
+"""
+
+from collections.abc import Iterable, Sequence
+from operator import attrgetter, itemgetter
+from typing import Any, TypedDict
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+
+def _row_type(model: type[BaseModel], fields: Sequence[str], **overrides: Any) -> type:
+    """Build a TypedDict with ``model``'s annotations for ``fields`` (or ``overrides``)."""
+    annotations = {
+        name: overrides.get(name, model.model_fields[name].annotation) for name in fields
+    }
+    return TypedDict(f"{model.__name__}Row", annotations)
+
+
+class FieldPlan:
+    """Attributes of a response model to read from each row, and how to encode them.
+
+    Attributes:
+        model: Response model the output matches
+        fields: Field names, read as attributes of each row and used as output keys
+        row_type: TypedDict of those fields with the model's types
+        row_adapter: Encodes one ``row_type`` dict
+        rows_adapter: Encodes a list of them
+    """
+
+    def __init__(self, model: type[BaseModel], fields: Sequence[str] | None = None) -> None:
+        """Initialize the plan.
+
+        Args:
+            model: Response model (for the field types)
+            fields: Fields to read and return, in output order; all of the model's if None
+        """
+        self.model = model
+        self.fields = tuple(fields or model.model_fields)
+        self.row_type = _row_type(model, self.fields)
+        self.row_adapter = TypeAdapter(self.row_type)
+        self.rows_adapter = TypeAdapter(list[self.row_type])
+        self._pages: dict[tuple[type[BaseModel], str], TypeAdapter] = {}
+        # Getters return a bare value, not a tuple, for a single field
+        single = len(self.fields) == 1
+        by_key = itemgetter(*self.fields)
+        by_attribute = attrgetter(*self.fields)
+        self._by_key = (lambda d: (by_key(d),)) if single else by_key
+        self._by_attribute = (lambda row: (by_attribute(row),)) if single else by_attribute
+
+    def _values(self, obj: Any) -> tuple:
+        # Loaded ORM attributes sit in __dict__; unloaded ones (and rows
+        # without __dict__, like SQLAlchemy Row) go through attribute access
+        state = getattr(obj, "__dict__", None)
+        if state is not None:
+            try:
+                return self._by_key(state)
+            except KeyError:
+                pass
+        return self._by_attribute(obj)
+
+    def row(self, obj: Any) -> dict[str, Any]:
+        """Return the planned fields of ``obj`` as a dict."""
+        return dict(zip(self.fields, self._values(obj), strict=True))
+
+    def rows(self, objs: Iterable[Any]) -> list[dict[str, Any]]:
+        """Return the planned fields of every object in ``objs``."""
+        fields = self.fields
+        values = self._values
+        return [dict(zip(fields, values(obj), strict=True)) for obj in objs]
+
+    def page_adapter(self, envelope: type[BaseModel], items: str = "items") -> TypeAdapter:
+        """Return (once per envelope) an adapter for ``envelope`` with planned ``items``.
+
+        Args:
+            envelope: Response model wrapping a list of rows (e.g. a page with totals)
+            items: Name of its list field
+        """
+        key = (envelope, items)
+        if key not in self._pages:
+            row_type = _row_type(
+                envelope, tuple(envelope.model_fields), **{items: list[self.row_type]}
+            )
+            self._pages[key] = TypeAdapter(row_type)
+        return self._pages[key]
+
+
+def json_response(
+    content: Any,
+    adapter: TypeAdapter | None = None,
+    status_code: int = 200,
+) -> Response:
+    """Encode ``content`` as a JSON response in one pass.
+
+    Args:
+        content: Dicts, lists and scalars matching ``adapter``'s type
+        adapter: Adapter to encode with; without one, types are inferred per value
+        status_code: Response status
+    """
+    body = to_json(content) if adapter is None else adapter.dump_json(content)
+    return Response(body, status_code=status_code, media_type="application/json")
@@ -5,9 +5,9 @@ Follows 12-factor app principles - all configuration via environment variables
 with sensible defaults for local development.
 """
 
-from enum import Enum
+from enum import Enum, StrEnum
 
-from pydantic import Field
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -18,6 +18,44 @@ class Environment(str, Enum):
     PRODUCTION = "production"
 
 
+class PoolerMode(StrEnum):
+    """Connection pooler between the app and PostgreSQL (e.g. PgBouncer's pool_mode)."""
+
+    NONE = "none"
+    SESSION = "session"
+    TRANSACTION = "transaction"
+
+
+class LogOverflow(StrEnum):
+    """What a log call does when the background log queue is full."""
+
+    DROP = "drop"
+    BLOCK = "block"
+
+
+def _parse_route_rates(value: str) -> dict[str, float]:
+    """Parse comma-separated route=rate pairs (empty items skipped).
+
+    Raises:
+        ValueError: If a pair has no route or ``=``, or its rate is not a number in 0..1
+    """
+    rates = {}
+    for pair in filter(str.strip, value.split(",")):
+        route, separator, rate = (part.strip() for part in pair.rpartition("="))
+        if not separator or not route:
+            msg = f"Expected route=rate, got {pair.strip()!r}"
+            raise ValueError(msg)
+        try:
+            rates[route] = float(rate)
+        except ValueError:
+            msg = f"Rate of {route!r} is not a number: {rate!r}"
+            raise ValueError(msg) from None
+        if not 0 <= rates[route] <= 1:
+            msg = f"Rate of {route!r} must be between 0 and 1, got {rate}"
+            raise ValueError(msg)
+    return rates
+
+
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables.
@@ -34,6 +72,81 @@ class Settings(BaseSettings):
     Override via DATABASE_URL environment variable.
     """
 
+    # Connection pool (primary and each replica have their own pool)
+    db_pool_size: int = Field(default=5, ge=0)
+    """
+    Persistent connections kept open per engine; 0 disables app-side pooling
+    (NullPool: a new connection per checkout).
+    Override via DB_POOL_SIZE environment variable.
+    """
+
+    db_max_overflow: int = Field(default=10, ge=0)
+    """
+    Extra connections opened beyond DB_POOL_SIZE under load (closed when returned).
+    Override via DB_MAX_OVERFLOW environment variable.
+    """
+
+    db_pool_timeout: float = Field(default=30.0, gt=0)
+    """
+    Seconds a request waits for a free connection before failing.
+    Override via DB_POOL_TIMEOUT environment variable.
+    """
+
+    db_pool_recycle: int = Field(default=-1, ge=-1)
+    """
+    Seconds after which a connection is replaced on checkout (-1 never), e.g. to stay
+    under a server or proxy idle timeout.
+    Override via DB_POOL_RECYCLE environment variable.
+    """
+
+    db_pool_pre_ping: bool = False
+    """
+    Test each connection with a ping on checkout and reconnect if it is dead.
+    Override via DB_POOL_PRE_PING environment variable.
+    """
+
+    db_pool_use_lifo: bool = False
+    """
+    Reuse the most recently returned connection first, letting idle extras time out
+    server-side instead of keeping every connection warm.
+    Override via DB_POOL_USE_LIFO environment variable.
+    """
+
+    db_pooler_mode: PoolerMode = PoolerMode.NONE
+    """
+    Pooler in front of PostgreSQL: "none" (direct), "session" or "transaction"
+    (PgBouncer pool_mode). "transaction" turns off prepared-statement caching,
+    gives prepared statements unique names and drops DB_MAX_OVERFLOW, since
+    consecutive transactions may run on different server connections.
+    Override via DB_POOLER_MODE environment variable.
+    """
+
+    database_replica_urls_str: str = Field(default="", alias="database_replica_urls")
+    """
+    Read replica URLs (comma-separated), same format as DATABASE_URL.
+    Read-only endpoints are spread over them round-robin; empty (default) sends
+    all traffic to the primary.
+    Override via DATABASE_REPLICA_URLS environment variable.
+    """
+
+    @property
+    def database_replica_urls(self) -> list[str]:
+        """Parse read replica URLs from comma-separated string to list."""
+        return [url.strip() for url in self.database_replica_urls_str.split(",") if url.strip()]
+
+    database_replica_sticky_seconds: float = Field(default=5.0, ge=0)
+    """
+    Seconds a client's reads stay on the primary after it writes (read-your-writes),
+    covering replication lag. 0 disables stickiness.
+    Override via DATABASE_REPLICA_STICKY_SECONDS environment variable.
+    """
+
+    database_replica_retry_seconds: float = Field(default=30.0, gt=0)
+    """
+    Seconds an unreachable replica is skipped before it is tried again.
+    Override via DATABASE_REPLICA_RETRY_SECONDS environment variable.
+    """
+
     # CORS Configuration
     cors_origins_str: str = Field(
         default="http://localhost:3000,http://localhost:5173",
@@ -50,6 +163,33 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string to list."""
         return [origin.strip() for origin in self.cors_origins_str.split(",") if origin.strip()]
 
+    # Entity cache
+    entity_cache_models_str: str = Field(default="", alias="entity_cache_models")
+    """
+    Repositories that cache get_by_id results in process (comma-separated names).
+    Names are the repository's cache name, by convention its table (e.g. "todos").
+    Empty (default) disables the cache everywhere.
+    Override via ENTITY_CACHE_MODELS environment variable.
+    """
+
+    @property
+    def entity_cache_models(self) -> set[str]:
+        """Parse entity cache repository names from comma-separated string to set."""
+        return {name.strip() for name in self.entity_cache_models_str.split(",") if name.strip()}
+
+    entity_cache_max_size: int = Field(default=1024, ge=1)
+    """
+    Maximum number of rows kept per cached repository (least recently used evicted first).
+    Override via ENTITY_CACHE_MAX_SIZE environment variable.
+    """
+
+    entity_cache_ttl_seconds: float = Field(default=30.0, gt=0)
+    """
+    Seconds a cached row stays valid. Bounds staleness from writes made by other
+    processes; writes in the same process invalidate immediately.
+    Override via ENTITY_CACHE_TTL_SECONDS environment variable.
+    """
+
     # Environment
     environment: Environment = Environment.DEVELOPMENT
     """
@@ -67,6 +207,91 @@ class Settings(BaseSettings):
     Override via LOG_LEVEL environment variable.
     """
 
+    log_queue_size: int = Field(default=10_000, ge=0)
+    """
+    Log lines buffered for the background writer thread, which renders and writes
+    them in batches off the event loop (see app.core.log_sink).
+    0 renders and writes each line synchronously.
+    Override via LOG_QUEUE_SIZE environment variable.
+    """
+
+    log_batch_size: int = Field(default=256, ge=1)
+    """
+    Most log lines the background writer renders and writes per write call.
+    Override via LOG_BATCH_SIZE environment variable.
+    """
+
+    log_flush_interval_seconds: float = Field(default=0.05, gt=0)
+    """
+    Seconds between background log writes while fewer than LOG_BATCH_SIZE lines wait
+    (a full batch is written at once). Bounds how late a line reaches the output.
+    Override via LOG_FLUSH_INTERVAL_SECONDS environment variable.
+    """
+
+    log_overflow: LogOverflow = LogOverflow.DROP
+    """
+    Policy when the log queue is full: LogOverflow.DROP discards the line (counted and
+    reported in the log), LogOverflow.BLOCK makes the caller wait for room.
+    Override via LOG_OVERFLOW environment variable.
+    """
+
+    # Access log sampling
+    access_log_sample_rate: float = Field(default=1.0, ge=0, le=1)
+    """
+    Probability of writing the access-log line of a fast 2xx request (1 writes all).
+    Non-2xx, slow and flagged requests are always written.
+    Override via ACCESS_LOG_SAMPLE_RATE environment variable.
+    """
+
+    access_log_route_rates_str: str = Field(default="", alias="access_log_route_rates")
+    """
+    Per-route sample rates overriding ACCESS_LOG_SAMPLE_RATE (comma-separated
+    route=rate pairs, routes as path templates), e.g. "/api/v1/health=0,/api/v1/todos/{id}=0.05".
+    Override via ACCESS_LOG_ROUTE_RATES environment variable.
+    """
+
+    @field_validator("access_log_route_rates_str")
+    @classmethod
+    def _check_access_log_route_rates(cls, value: str) -> str:
+        """Reject malformed route=rate pairs and rates outside 0..1 when settings load."""
+        _parse_route_rates(value)
+        return value
+
+    @property
+    def access_log_route_rates(self) -> dict[str, float]:
+        """Parse per-route sample rates from comma-separated route=rate pairs."""
+        return _parse_route_rates(self.access_log_route_rates_str)
+
+    access_log_max_per_second: float = Field(default=0.0, ge=0)
+    """
+    Most sampled access-log lines written per second (token bucket, per process);
+    requests over the budget are folded into the next line's sample_weight. 0 for no limit.
+    Override via ACCESS_LOG_MAX_PER_SECOND environment variable.
+    """
+
+    access_log_slow_ms: float = Field(default=1000.0, ge=0)
+    """
+    Requests taking at least this many milliseconds (to the last response byte)
+    always have their access-log line written.
+    Override via ACCESS_LOG_SLOW_MS environment variable.
+    """
+
+    # Metrics
+    metrics_dir: str = ""
+    """
+    Directory shared by the worker processes for metrics snapshots, so /metrics
+    adds up all workers (empty it at deploy). Empty (default): this process only.
+    Linux only (worker liveness is read from /proc); elsewhere startup fails.
+    Override via METRICS_DIR environment variable.
+    """
+
+    metrics_snapshot_seconds: float = Field(default=1.0, gt=0)
+    """
+    Seconds between a worker's metrics snapshots in METRICS_DIR (how stale other
+    workers' samples can be in /metrics).
+    Override via METRICS_SNAPSHOT_SECONDS environment variable.
+    """
+
     # API Configuration
     api_v1_prefix: str = "/api/v1"
     """
@@ -0,0 +1,76 @@
+"""Tests for access-log sampling."""
+
+import asyncio
+
+import pytest
+
+from app.core.access_log import (
+    AccessLogSampler,
+    TokenBucket,
+    always_log_request,
+    track_access_log_flags,
+)
+
+
+def test_token_bucket_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert [bucket.take() for _ in range(3)] == [True, True, False]
+    clock.now = 0.5
+    assert [bucket.take() for _ in range(2)] == [True, False]
+    clock.now = 10
+    assert [bucket.take() for _ in range(3)] == [True, True, False]  # capped at burst
+
+
+@pytest.mark.parametrize(
+    ("status_code", "duration_ms", "flagged"),
+    [(404, 1, False), (500, 1, False), (301, 1, False), (200, 250, False), (200, 1, True)],
+)
+def test_always_logged(status_code, duration_ms, flagged):
+    sampler = AccessLogSampler(default_rate=0, slow_ms=250)
+
+    weight = sampler.sample(
+        "/items", status_code=status_code, duration_ms=duration_ms, flagged=flagged
+    )
+
+    assert weight == 1
+    assert sampler.stats.always == 1
+
+
+def test_route_rates_and_weight():
+    draws = iter([0.05, 0.5, 0.2, 0.99])
+    sampler = AccessLogSampler(
+        default_rate=1,
+        route_rates={"/health": 0, "/items/{id}": 0.25},
+        rng=lambda: next(draws),
+    )
+
+    assert sampler.sample("/health", status_code=200, duration_ms=1) is None
+    weights = [sampler.sample("/items/{id}", status_code=200, duration_ms=1) for _ in range(4)]
+    assert weights == [4, None, 4, None]
+    assert sampler.sample("/other", status_code=204, duration_ms=1) == 1
+    assert (sampler.stats.sampled, sampler.stats.skipped) == (3, 3)
+
+
+def test_rate_limited_requests_fold_into_next_line(clock):
+    sampler = AccessLogSampler(default_rate=1, max_per_second=1, clock=clock)
+
+    weights = [sampler.sample("/items", status_code=200, duration_ms=1) for _ in range(4)]
+    clock.now = 1
+    weights.append(sampler.sample("/items", status_code=200, duration_ms=1))
+
+    assert weights == [1, None, None, None, 4]
+    assert sum(w for w in weights if w) == 5
+    assert sampler.stats.limited == 3
+
+
+def test_always_log_request_sets_current_flags():
+    always_log_request()  # outside a request: no effect, no error
+    flags = track_access_log_flags()
+
+    async def endpoint() -> None:
+        await asyncio.to_thread(always_log_request)  # e.g. a sync endpoint in the threadpool
+
+    asyncio.run(endpoint())
+
+    assert flags.always
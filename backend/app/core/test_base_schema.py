@@ -0,0 +1,139 @@
+"""Tests for BaseSchema's blank-string handling."""
+
+from datetime import UTC, datetime
+from typing import Annotated
+from uuid import UUID
+
+import pytest
+from pydantic import Field, ValidationError
+
+from app.core.base_schema import BaseSchema
+
+
+class Event(BaseSchema):
+    name: str = ""
+    starts_at: datetime | None = None
+    ends_at: Annotated[datetime | None, Field(description="End")] = None
+    created_at: datetime = datetime(2025, 1, 1, tzinfo=UTC)
+    seats: int | None = None
+    price: float | None = None
+    venue_id: UUID | None = None
+
+
+@pytest.mark.parametrize("blank", ["", "   ", "\t\n"])
+def test_blank_strings_become_none(blank):
+    event = Event.model_validate({"starts_at": blank, "ends_at": blank})
+
+    assert event.starts_at is None
+    assert event.ends_at is None
+
+
+@pytest.mark.parametrize("blank", ["", "   "])
+def test_blank_strings_become_none_from_json(blank):
+    event = Event.model_validate_json(f'{{"starts_at": "{blank}", "ends_at": "{blank}"}}')
+
+    assert event.starts_at is None
+    assert event.ends_at is None
+
+
+@pytest.mark.parametrize("field", ["seats", "price", "venue_id"])
+def test_blank_strings_become_none_for_numbers_and_uuids(field):
+    assert getattr(Event.model_validate({field: " "}), field) is None
+    assert getattr(Event.model_validate_json(f'{{"{field}": ""}}'), field) is None
+
+
+def test_other_values_validate_as_declared():
+    event = Event(
+        name="",
+        starts_at="2025-01-02T03:04:05Z",
+        seats="3",
+        price=1.5,
+        venue_id="12345678-1234-5678-1234-567812345678",
+    )
+
+    assert event.name == ""
+    assert event.starts_at == datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+    assert event.seats == 3
+    assert event.price == 1.5
+    assert event.venue_id == UUID("12345678-1234-5678-1234-567812345678")
+
+
+def test_required_datetime_rejects_blank_string():
+    with pytest.raises(ValidationError):
+        Event(created_at="")
+
+
+def test_invalid_values_report_the_declared_types_errors():
+    with pytest.raises(ValidationError) as exc_info:
+        Event.model_validate_json(
+            '{"starts_at": "2024-13-01", "seats": "x", "price": "x", "venue_id": "nope"}'
+        )
+
+    errors = exc_info.value.errors()
+    assert [(error["type"], error["loc"]) for error in errors] == [
+        ("datetime_from_date_parsing", ("starts_at",)),
+        ("int_parsing", ("seats",)),
+        ("float_parsing", ("price",)),
+        ("uuid_parsing", ("venue_id",)),
+    ]
+    assert "month value is outside expected range of 1-12" in errors[0]["msg"]
+
+
+def test_constraint_errors_are_reported():
+    class Ticket(BaseSchema):
+        quantity: int | None = Field(None, ge=0)
+
+    with pytest.raises(ValidationError) as exc_info:
+        Ticket(quantity=-1)
+
+    assert [error["type"] for error in exc_info.value.errors()] == ["greater_than_equal"]
+    assert Ticket(quantity="").quantity is None
+
+
+def test_from_attributes_reads_values_unchanged():
+    class Row:
+        name = "row"
+        starts_at = datetime(2025, 1, 2, tzinfo=UTC)
+        ends_at = None
+        created_at = datetime(2025, 1, 1, tzinfo=UTC)
+        seats = 0
+        price = None
+        venue_id = UUID(int=1)
+
+    event = Event.model_validate(Row(), from_attributes=True)
+
+    assert (event.starts_at, event.ends_at, event.seats, event.venue_id) == (
+        Row.starts_at,
+        None,
+        0,
+        UUID(int=1),
+    )
+
+
+def _schema_types(schema):
+    if isinstance(schema, dict):
+        if isinstance(schema.get("type"), str):
+            yield schema["type"]
+        for value in schema.values():
+            yield from _schema_types(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            yield from _schema_types(value)
+
+
+def test_blank_string_handling_calls_no_python():
+    """Typed values (as read from ORM rows) never leave pydantic-core: no function validators."""
+    types = set(_schema_types(Event.__pydantic_core_schema__))
+
+    assert "chain" in types
+    assert not {t for t in types if t.startswith("function")}
+
+
+def test_json_schema_is_unchanged():
+    properties = Event.model_json_schema()["properties"]
+
+    assert properties["starts_at"]["anyOf"] == [
+        {"format": "date-time", "type": "string"},
+        {"type": "null"},
+    ]
+    assert properties["ends_at"]["description"] == "End"
@@ -0,0 +1,86 @@
+"""Tests for the in-process entity cache (LRU + TTL)."""
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import CacheStats, EntityCache, entity_cache_for
+from app.core.settings import settings
+
+
+def test_get_set_hit_and_miss():
+    """Test stored values are returned and lookups are counted."""
+    cache = EntityCache(max_size=10, ttl=30)
+
+    assert cache.get(("Todo", 1)) is None
+    cache.set(("Todo", 1), {"id": 1})
+
+    assert cache.get(("Todo", 1)) == {"id": 1}
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_lru_eviction():
+    """Test the least recently used entry is evicted when full."""
+    cache = EntityCache(max_size=2, ttl=30)
+    cache.set(1, {"id": 1})
+    cache.set(2, {"id": 2})
+    cache.get(1)  # 2 is now least recently used
+    cache.set(3, {"id": 3})
+
+    assert cache.get(2) is None
+    assert cache.get(1) == {"id": 1}
+    assert cache.get(3) == {"id": 3}
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_expiry(clock):
+    """Test entries expire after ttl seconds and count as misses."""
+    cache = EntityCache(max_size=10, ttl=5, clock=clock)
+    cache.set(1, {"id": 1})
+
+    clock.now = 4.9
+    assert cache.get(1) == {"id": 1}
+    clock.now = 5.0
+    assert cache.get(1) is None
+    assert cache.stats == CacheStats(hits=1, misses=1, expirations=1)
+    assert len(cache) == 0
+
+
+def test_invalidate_and_clear():
+    """Test invalidation drops one entry and clear resets everything."""
+    cache = EntityCache(max_size=10, ttl=30)
+    cache.set(1, {"id": 1})
+    cache.set(2, {"id": 2})
+
+    cache.invalidate(1)
+    cache.invalidate(99)  # Unknown keys are ignored
+    assert cache.get(1) is None
+    assert cache.get(2) == {"id": 2}
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats == CacheStats()
+
+
+def test_stats_is_a_snapshot():
+    """Test the returned stats do not change with later lookups."""
+    cache = EntityCache(max_size=10, ttl=30)
+    stats = cache.stats
+    cache.get(1)
+
+    assert stats.misses == 0
+
+
+@pytest.mark.parametrize(("enabled", "expected"), [("", False), ("users, todos", True)])
+def test_entity_cache_for_opt_in(monkeypatch, enabled, expected):
+    """Test caches exist only for repositories listed in Settings, one per name."""
+    monkeypatch.setattr(settings, "entity_cache_models_str", enabled)
+    monkeypatch.setattr(cache_module, "_caches", {})
+
+    cache = entity_cache_for("todos")
+
+    assert (cache is not None) is expected
+    if expected:
+        assert cache is entity_cache_for("todos")
+        assert cache.max_size == settings.entity_cache_max_size
+        assert cache.ttl == settings.entity_cache_ttl_seconds
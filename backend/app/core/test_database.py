@@ -0,0 +1,302 @@
+"""Tests for engine configuration and read replica routing.
+
+SQLite files stand in for the primary and replicas.
+"""
+
+import time
+
+import pytest
+import pytest_asyncio
+from fastapi import Request, Response
+from sqlalchemy import Column, Integer, String, event, insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core import database
+from app.core.cache import EntityCache
+from app.core.database import (
+    PRIMARY_STICKY_COOKIE,
+    Replica,
+    ReplicaSet,
+    create_engine,
+    get_read_db,
+    read_your_writes,
+)
+from app.core.pool import InstrumentedPool
+from app.core.repository import BaseRepository
+from app.core.settings import PoolerMode, settings
+
+Base = declarative_base()
+
+
+class Note(Base):
+    """Model read through the primary and the replicas."""
+
+    __tablename__ = "notes"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+class ConnectAttempt(Exception):  # noqa: N818 - a signal, not an error
+    """Raised by ``_connect_args`` instead of connecting."""
+
+
+async def _connect_args(**overrides) -> dict:
+    """Return the DBAPI connect arguments ``create_engine`` would use with ``overrides``."""
+    engine = create_engine(
+        "postgresql+asyncpg://app@pgbouncer/db", settings.model_copy(update=overrides)
+    )
+    captured = {}
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def capture(dialect, conn_rec, cargs, cparams):
+        captured.update(cparams)
+        raise ConnectAttempt
+
+    with pytest.raises(ConnectAttempt):
+        await engine.connect()
+    return captured
+
+
+def _request(method: str = "GET", cookie: str | None = None) -> Request:
+    headers = [(b"cookie", f"{PRIMARY_STICKY_COOKIE}={cookie}".encode())] if cookie else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+async def _engine(path: str) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS marker (name TEXT)"))
+        await conn.execute(text("DELETE FROM marker"))
+        await conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": path})
+    return engine
+
+
+async def _served_by(request: Request) -> str:
+    dependency = get_read_db(request)
+    session = await anext(dependency)
+    try:
+        return (await session.execute(text("SELECT name FROM marker"))).scalar_one()
+    finally:
+        await dependency.aclose()
+
+
+@pytest_asyncio.fixture
+async def databases(tmp_path, monkeypatch, clock):
+    """Point the primary and two replicas at separate SQLite files."""
+    primary = await _engine(str(tmp_path / "primary.db"))
+    replica_a = await _engine(str(tmp_path / "replica_a.db"))
+    replica_b = await _engine(str(tmp_path / "replica_b.db"))
+    replicas = ReplicaSet(
+        [Replica("a", replica_a), Replica("b", replica_b)],
+        retry_after=30,
+        clock=clock,
+    )
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        sessionmaker(primary, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(database, "replicas", replicas)
+    yield tmp_path, replicas, clock
+    for engine in (primary, replica_a, replica_b):
+        await engine.dispose()
+
+
+def test_replica_set_round_robin_skips_down_replicas(clock):
+    """Test candidates rotate and exclude a replica until its retry time passes."""
+    a, b, c = Replica("a", None), Replica("b", None), Replica("c", None)
+    replicas = ReplicaSet([a, b, c], retry_after=10, clock=clock)
+
+    assert replicas.candidates() == [a, b, c]
+    assert replicas.candidates() == [b, c, a]
+
+    replicas.mark_down(a)
+    assert replicas.candidates() == [c, b]
+    clock.now = 10
+    assert replicas.candidates() == [a, b, c]
+
+
+def test_empty_replica_set():
+    """Test a replica set without replicas is falsy and has no candidates."""
+    replicas = ReplicaSet([], retry_after=10)
+
+    assert not replicas
+    assert replicas.candidates() == []
+
+
+@pytest.mark.asyncio()
+async def test_reads_alternate_between_replicas(databases):
+    """Test read sessions go to the replicas round-robin, never the primary."""
+    tmp_path, _, _ = databases
+
+    served = [await _served_by(_request()) for _ in range(4)]
+
+    assert served == [str(tmp_path / name) for name in ("replica_a.db", "replica_b.db") * 2]
+
+
+@pytest.mark.asyncio()
+async def test_recent_writer_reads_from_primary(databases):
+    """Test a client holding an unexpired sticky cookie is served by the primary."""
+    tmp_path, _, _ = databases
+
+    pinned = await _served_by(_request(cookie=str(time.time() + 5)))
+    expired = await _served_by(_request(cookie=str(time.time() - 1)))
+    garbage = await _served_by(_request(cookie="not-a-time"))
+
+    assert pinned == str(tmp_path / "primary.db")
+    assert expired != str(tmp_path / "primary.db")
+    assert garbage != str(tmp_path / "primary.db")
+
+
+@pytest.mark.asyncio()
+async def test_replica_reads_do_not_populate_entity_cache(databases):
+    """Test a row read from a lagging replica is not cached for reads pinned to the primary.
+
+    Otherwise a client reading back its own write (sticky cookie, primary
+    session) would be served the replica's older row from the cache.
+    """
+    _, replicas, _ = databases
+    engines = [database.engine, *(replica.engine for replica in replicas.replicas)]
+    for engine, name in zip(engines, ["After", "Before", "Before"], strict=True):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Note), {"id": 1, "name": name})
+    cache = EntityCache(max_size=10, ttl=30)
+
+    async def read_name(request: Request) -> str:
+        dependency = get_read_db(request)
+        session = await anext(dependency)
+        try:
+            repository = BaseRepository[Note](Note, session)
+            repository.cache = cache
+            return (await repository.get_by_id(1)).name
+        finally:
+            await dependency.aclose()
+
+    assert await read_name(_request()) == "Before"  # the replica has not caught up
+    assert len(cache) == 0
+    assert await read_name(_request(cookie=str(time.time() + 5))) == "After"
+    assert len(cache) == 1  # primary reads are cached
+    assert await read_name(_request(cookie=str(time.time() + 5))) == "After"
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio()
+async def test_unreachable_replica_falls_back(databases):
+    """Test a failing replica is skipped until retry, and the primary serves when none is up."""
+    tmp_path, replicas, clock = databases
+    # The directory does not exist, so connecting fails
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+    replicas.replicas = [Replica("broken", broken), replicas.replicas[0]]
+
+    assert await _served_by(_request()) == str(tmp_path / "replica_a.db")
+    assert replicas.replicas[0].down_until == 30
+
+    replicas.replicas = replicas.replicas[:1]
+    assert await _served_by(_request()) == str(tmp_path / "primary.db")
+
+    clock.now = 30
+    assert replicas.candidates() == replicas.replicas
+    await broken.dispose()
+
+
+@pytest.mark.asyncio()
+async def test_read_session_connects_on_first_statement(databases):
+    """Test a read session holds no connection, and picks no replica, until it queries."""
+    _, replicas, _ = databases
+    a, b = (replica.engine.pool for replica in replicas.replicas)
+
+    dependency = get_read_db(_request())
+    session = await anext(dependency)
+    assert (a.checkedout(), b.checkedout()) == (0, 0)
+
+    await session.execute(text("SELECT name FROM marker"))
+    assert (a.checkedout(), b.checkedout()) == (1, 0)
+
+    await dependency.aclose()
+    assert (a.checkedout(), b.checkedout()) == (0, 0)
+
+
+@pytest.mark.asyncio()
+async def test_unused_read_session_does_not_advance_round_robin(databases):
+    """Test a request that ends before querying leaves replica selection untouched."""
+    tmp_path, _, _ = databases
+
+    dependency = get_read_db(_request())
+    await anext(dependency)
+    await dependency.aclose()
+
+    assert await _served_by(_request()) == str(tmp_path / "replica_a.db")
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(("method", "sticky"), [("POST", True), ("DELETE", True), ("GET", False)])
+async def test_read_your_writes_cookie(databases, method, sticky):
+    """Test writes set the sticky cookie for the configured window and reads do not."""
+    response = Response()
+
+    await read_your_writes(_request(method), response)
+
+    cookie = response.headers.get("set-cookie")
+    if not sticky:
+        assert cookie is None
+        return
+    assert cookie.startswith(f"{PRIMARY_STICKY_COOKIE}=")
+    assert "Max-Age=5" in cookie
+    until = float(cookie.split(";")[0].split("=")[1])
+    assert time.time() < until <= time.time() + 5
+
+
+@pytest.mark.asyncio()
+async def test_read_your_writes_without_replicas(monkeypatch):
+    """Test no cookie is set when all traffic goes to the primary anyway."""
+    monkeypatch.setattr(database, "replicas", ReplicaSet([], retry_after=30))
+    response = Response()
+
+    await read_your_writes(_request("POST"), response)
+
+    assert "set-cookie" not in response.headers
+
+
+@pytest.mark.asyncio()
+async def test_engine_caches_prepared_statements_by_default():
+    """Test a direct connection keeps asyncpg's and SQLAlchemy's statement caches."""
+    connect_args = await _connect_args()
+
+    assert "statement_cache_size" not in connect_args
+    assert "prepared_statement_cache_size" not in connect_args
+
+
+@pytest.mark.asyncio()
+async def test_transaction_pooler_mode_disables_statement_caches():
+    """Test DB_POOLER_MODE=transaction turns off caches and names statements uniquely."""
+    connect_args = await _connect_args(db_pooler_mode=PoolerMode.TRANSACTION)
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name = connect_args["prepared_statement_name_func"]
+    assert name() != name()
+
+
+@pytest.mark.parametrize(
+    ("mode", "pool_size", "pool_class", "max_overflow"),
+    [
+        (PoolerMode.NONE, 5, InstrumentedPool, 10),
+        (PoolerMode.SESSION, 5, InstrumentedPool, 10),
+        (PoolerMode.TRANSACTION, 5, InstrumentedPool, 0),
+        (PoolerMode.TRANSACTION, 0, NullPool, None),
+    ],
+)
+def test_engine_pool_follows_pooler_mode(mode, pool_size, pool_class, max_overflow):
+    """Test transaction pooling drops overflow, and DB_POOL_SIZE=0 disables the pool."""
+    config = settings.model_copy(
+        update={"db_pooler_mode": mode, "db_pool_size": pool_size, "db_max_overflow": 10},
+    )
+    engine = create_engine("postgresql+asyncpg://app@pgbouncer/db", config)
+
+    assert type(engine.pool) is pool_class
+    assert getattr(engine.pool, "max_overflow", None) == max_overflow
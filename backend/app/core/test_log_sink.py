@@ -0,0 +1,183 @@
+"""Tests for the queue-backed log sink."""
+
+import io
+import json
+import threading
+import time
+
+import structlog
+
+from app.core.log_sink import QueueLogSink
+from app.core.settings import LogOverflow
+
+
+class GatedFile(io.StringIO):
+    """Output whose writes wait until ``gate`` is set, to hold the writer thread."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.gate.wait(5)
+        return super().write(text)
+
+
+def render(_logger, _name, event_dict) -> str:
+    return json.dumps(event_dict, sort_keys=True)
+
+
+def lines(file: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in file.getvalue().splitlines()]
+
+
+def test_lines_are_rendered_and_written_in_order():
+    file = io.StringIO()
+    sink = QueueLogSink(render, file=file)
+    logger = structlog.wrap_logger(
+        sink.logger_factory(),
+        processors=[structlog.processors.add_log_level],
+    )
+
+    for i in range(100):
+        logger.info("event", i=i)
+    logger.warning("last")
+    sink.close()
+
+    written = lines(file)
+    assert [line.get("i") for line in written[:100]] == list(range(100))
+    assert written[-1] == {"event": "last", "level": "warning"}
+    assert sink.stats.queued == sink.stats.written == 101
+    assert sink.stats.dropped == 0
+    assert 1 <= sink.stats.batches <= 101
+
+
+def test_batches_are_bounded():
+    file = GatedFile()
+    sink = QueueLogSink(render, file=file, batch_size=10)
+
+    for i in range(26):
+        sink.put({"event": "queued", "i": i})
+    file.gate.set()
+    sink.close()
+
+    assert sink.stats.written == 26
+    assert sink.stats.batches >= 3  # at most 10 lines per write
+
+
+def test_full_queue_drops_and_reports():
+    file = GatedFile()
+    sink = QueueLogSink(render, file=file, max_size=5)
+
+    for i in range(50):
+        sink.put({"event": "line", "i": i})
+    dropped = sink.stats.dropped
+    file.gate.set()
+    sink.close()
+
+    assert dropped >= 44  # at most 5 queued plus one taken by the writer
+    assert sink.stats.queued + dropped == 50
+    (report,) = [line for line in lines(file) if line["event"] == "log_lines_dropped"]
+    assert report["dropped"] == report["dropped_total"] == dropped
+    assert report["level"] == "warning"
+
+
+def test_full_queue_blocks_until_room():
+    file = GatedFile()
+    sink = QueueLogSink(render, file=file, max_size=1, batch_size=1, overflow=LogOverflow.BLOCK)
+    sink.put({"event": "taken"})  # the writer takes it alone, then waits on the gate
+    sink.put({"event": "queued"})  # fills the queue
+
+    blocked = threading.Thread(target=sink.put, args=({"event": "waits"},))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    file.gate.set()
+    blocked.join(5)
+    sink.close()
+    assert [line["event"] for line in lines(file)] == ["taken", "queued", "waits"]
+    assert sink.stats.dropped == 0
+
+
+def test_render_errors_keep_the_line():
+    def failing(_logger, _name, _event_dict):
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    file = io.StringIO()
+    sink = QueueLogSink(failing, file=file)
+    sink.put({"event": "kept"})
+    sink.close()
+
+    assert file.getvalue().startswith("log_render_failed error=RuntimeError('boom')")
+    assert "'kept'" in file.getvalue()
+
+
+class BrokenFile(io.StringIO):
+    """Output whose writes raise until ``broken`` is cleared."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.broken = True
+
+    def write(self, text: str) -> int:
+        if self.broken:
+            msg = "stdout closed"
+            raise OSError(msg)
+        return super().write(text)
+
+
+def test_exception_traceback_is_kept():
+    file = io.StringIO()
+    sink = QueueLogSink(
+        lambda logger, name, event_dict: render(
+            logger, name, structlog.processors.format_exc_info(logger, name, event_dict)
+        ),
+        file=file,
+    )
+    logger = structlog.wrap_logger(sink.logger_factory(), processors=[])
+
+    try:
+        msg = "boom"
+        raise ValueError(msg)
+    except ValueError:
+        logger.exception("failed")  # rendered later, on the writer thread
+    sink.close()
+
+    (line,) = lines(file)
+    assert line["event"] == "failed"
+    assert line["exception"].startswith("Traceback (most recent call last)")
+    assert "ValueError: boom" in line["exception"]
+
+
+def test_write_errors_are_reported_and_the_writer_keeps_going(capsys):
+    file = BrokenFile()
+    sink = QueueLogSink(render, file=file, flush_interval=0.01)
+
+    for i in range(3):
+        sink.put({"event": "lost", "i": i})
+    deadline = time.monotonic() + 5
+    while sink.stats.failed < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    file.broken = False
+    sink.put({"event": "kept"})
+    sink.close()
+
+    assert [line["event"] for line in lines(file)] == ["kept"]
+    assert sink.stats.failed == 3
+    assert sink.stats.written == 1
+    assert capsys.readouterr().err.count("log_write_failed error=OSError('stdout closed')") == 1
+
+
+def test_write_errors_do_not_block_callers():
+    file = BrokenFile()
+    sink = QueueLogSink(render, file=file, max_size=1, batch_size=1, overflow=LogOverflow.BLOCK)
+
+    caller = threading.Thread(target=lambda: [sink.put({"event": "line"}) for _ in range(20)])
+    caller.start()
+    caller.join(5)
+
+    assert not caller.is_alive()
+    sink.close()
+    assert sink.stats.failed == 20
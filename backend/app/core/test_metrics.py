@@ -0,0 +1,202 @@
+"""Tests for the in-process metrics registry and its text rendering."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.core.metrics import (
+    EXITED_SNAPSHOT,
+    MetricsRegistry,
+    process_start_time,
+    repository_call_duration,
+    timed_call,
+)
+
+
+def exited_pid() -> int:
+    """The pid of a process that has exited (and been reaped)."""
+    with subprocess.Popen([sys.executable, "-c", "pass"]) as process:
+        process.wait()
+    return process.pid
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight")
+
+    requests.inc(("/a",))
+    requests.inc(("/a",), 2)
+    requests.inc(('say "hi"\n',))
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 3',
+        'requests_total{route="say \\"hi\\"\\n"} 1',
+        "# HELP in_flight In flight",
+        "# TYPE in_flight gauge",
+        "in_flight 1",
+    ]
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    duration = registry.histogram("duration_seconds", "Duration", ("route",), buckets=(0.1, 1))
+
+    for value in (0.05, 0.1, 0.5, 3):
+        duration.observe(value, ("/a",))
+
+    assert list(duration.render(duration.samples())) == [
+        'duration_seconds_bucket{route="/a",le="0.1"} 2',
+        'duration_seconds_bucket{route="/a",le="1"} 3',
+        'duration_seconds_bucket{route="/a",le="+Inf"} 4',
+        'duration_seconds_sum{route="/a"} 3.65',
+        'duration_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_duplicate_metric_rejected():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs")
+
+    with pytest.raises(ValueError, match="jobs_total"):
+        registry.gauge("jobs_total", "Jobs")
+
+
+def test_collectors_run_before_render():
+    registry = MetricsRegistry()
+    size = registry.gauge("pool_size", "Size", ("pool",))
+    registry.collector(lambda: size.set(("primary",), 5))
+
+    assert 'pool_size{pool="primary"} 5' in registry.render()
+
+
+def snapshot_name(pid: int, start: str | None = None) -> str:
+    """The snapshot file name of process ``pid`` (started at ``start``, default: now running)."""
+    return f"{pid}-{start or process_start_time(pid)}.json"
+
+
+OTHER = {
+    "requests_total": [[["/a"], 2], [["/b"], 1]],
+    "in_flight": [[[], 3]],
+    "duration_seconds": [[[], [0, 1, 4.0]]],
+    "unknown_total": [[[], 1]],
+}
+
+
+def other_processes_registry(tmp_path) -> MetricsRegistry:
+    """A registry with one of each metric recorded, reading snapshots from ``tmp_path``."""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight")
+    duration = registry.histogram("duration_seconds", "Duration", buckets=(1,))
+    requests.inc(("/a",))
+    in_flight.inc()
+    duration.observe(0.5)
+    registry.directory = tmp_path
+    registry.path = tmp_path / snapshot_name(os.getpid())
+    return registry
+
+
+def test_render_adds_up_other_processes(tmp_path):
+    registry = other_processes_registry(tmp_path)
+    (tmp_path / snapshot_name(os.getppid())).write_text(json.dumps(OTHER))
+    (tmp_path / snapshot_name(exited_pid(), "1")).write_text(json.dumps(OTHER))
+    registry.path.write_text(json.dumps(OTHER))  # own file: stale copy
+    (tmp_path / "99999999-1.json").write_text("{")  # being replaced
+
+    text = registry.render()
+
+    assert 'requests_total{route="/a"} 5' in text  # counters include exited processes
+    assert 'requests_total{route="/b"} 2' in text
+    assert "in_flight 4" in text  # gauges only live ones
+    assert 'duration_seconds_bucket{le="+Inf"} 3' in text
+    assert "duration_seconds_sum 8.5" in text
+    assert "unknown_total" not in text
+
+
+def test_render_ignores_other_files(tmp_path):
+    registry = other_processes_registry(tmp_path)
+    (tmp_path / "settings.json").write_text(json.dumps({"in_flight": 1}))
+    (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(OTHER))
+
+    assert "in_flight 1" in registry.render()
+
+
+def test_reused_pid_keeps_the_exited_process_counters(tmp_path):
+    registry = other_processes_registry(tmp_path)
+    # The parent's pid, but an earlier start: a process that exited before the pid was reused
+    (tmp_path / snapshot_name(os.getppid(), "1")).write_text(json.dumps(OTHER))
+    (tmp_path / snapshot_name(os.getppid())).write_text(json.dumps({"in_flight": [[[], 3]]}))
+
+    text = registry.render()
+
+    assert 'requests_total{route="/a"} 3' in text
+    assert "in_flight 4" in text  # only the running process's gauge
+
+
+def test_fold_exited_keeps_totals(tmp_path):
+    registry = other_processes_registry(tmp_path)
+    running = tmp_path / snapshot_name(os.getppid())
+    running.write_text(json.dumps(OTHER))
+    for pid in (exited_pid(), exited_pid()):
+        (tmp_path / snapshot_name(pid, "1")).write_text(json.dumps(OTHER))
+    before = registry.render()
+
+    registry.fold_exited()
+    registry.fold_exited()
+
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == sorted(
+        [running.name, EXITED_SNAPSHOT]
+    )
+    assert registry.render() == before
+    assert 'requests_total{route="/a"} 7' in before
+    assert "in_flight 4" in before
+
+
+def test_write_snapshot_round_trips(tmp_path):
+    registry = MetricsRegistry()
+    duration = registry.histogram("duration_seconds", "Duration", ("route",), buckets=(1,))
+    duration.observe(2, ("/a",))
+    registry.directory = tmp_path
+    registry.path = tmp_path / snapshot_name(os.getpid())
+
+    registry.write_snapshot()
+
+    written = json.loads(registry.path.read_text())
+    assert written == {"duration_seconds": [[["/a"], [0, 1, 2]]]}
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_write_snapshots_needs_process_start_times(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.metrics.process_start_time", lambda _pid: None)
+    registry = MetricsRegistry()
+
+    with pytest.raises(RuntimeError, match="METRICS_DIR"):
+        registry.write_snapshots(tmp_path)
+
+    assert registry.directory is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_timed_call_labels_by_class_and_method():
+    class WidgetRepository:
+        @timed_call
+        async def get_by_name(self, name: str) -> str:
+            return name.upper()
+
+    labels = ("WidgetRepository", "get_by_name")
+    before = repository_call_duration.samples().get(labels, [0] * 14)
+
+    assert asyncio.run(WidgetRepository().get_by_name("a")) == "A"
+    assert WidgetRepository.get_by_name.__name__ == "get_by_name"
+    after = repository_call_duration.samples()[labels]
+    assert sum(after[:-1]) - sum(before[:-1]) == 1
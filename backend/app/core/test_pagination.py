@@ -0,0 +1,137 @@
+"""Tests for keyset (cursor) pagination helpers.
+
+Cursor encoding is tested in isolation; keyset ordering and predicates are
+validated end-to-end against in-memory SQLite, including NULL sort keys.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Column, DateTime, Integer, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.exceptions import ValidationError
+from app.core.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_key,
+    keyset_order_by,
+    keyset_predicate,
+)
+
+Base = declarative_base()
+
+
+class Event(Base):
+    """Model with a nullable sort key for keyset tests."""
+
+    __tablename__ = "events"
+
+    id = Column(Integer, primary_key=True)
+    happened_at = Column(DateTime(timezone=True), nullable=True)
+
+
+@pytest_asyncio.fixture
+async def async_session():
+    """Create an in-memory SQLite session seeded with events (some without timestamps)."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async_session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session_factory() as session:
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        for i in range(1, 13):
+            # Every third event has no timestamp; pairs share a timestamp to exercise ties
+            happened_at = None if i % 3 == 0 else start + timedelta(days=i // 2)
+            session.add(Event(id=i, happened_at=happened_at))
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+def test_cursor_roundtrip():
+    """Test datetimes and ints survive encoding and decoding."""
+    when = datetime(2025, 10, 19, 10, 30, tzinfo=UTC)
+    cursor = encode_cursor([when, 42], tag="happened_at:desc")
+
+    assert decode_cursor(cursor, [Event.happened_at, Event.id], tag="happened_at:desc") == [
+        when,
+        42,
+    ]
+
+
+def test_cursor_is_url_safe():
+    """Test cursors can be passed as query parameters without escaping."""
+    cursor = encode_cursor([None, 1], tag="happened_at:asc")
+
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+def test_cursor_tag_mismatch():
+    """Test a cursor cannot be reused with a different ordering."""
+    cursor = encode_cursor([None, 1], tag="happened_at:asc")
+
+    with pytest.raises(ValidationError, match="happened_at:asc"):
+        decode_cursor(cursor, [Event.happened_at, Event.id], tag="happened_at:desc")
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", encode_cursor([1], tag="id:asc")])
+def test_cursor_malformed(cursor):
+    """Test malformed or wrongly-shaped cursors raise ValidationError."""
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, [Event.happened_at, Event.id], tag="id:asc")
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("descending", [False, True])
+async def test_keyset_pages_match_full_ordering(async_session, descending):
+    """Test walking pages with keyset predicates yields the full ordering exactly once."""
+    order_by = keyset_order_by(Event.happened_at, Event.id, descending=descending)
+    expected = list((await async_session.execute(select(Event.id).order_by(*order_by))).scalars())
+
+    seen: list[int] = []
+    last: Event | None = None
+    while True:
+        stmt = select(Event).order_by(*order_by).limit(5)
+        if last is not None:
+            stmt = stmt.where(
+                keyset_predicate(
+                    Event.happened_at,
+                    Event.id,
+                    last.happened_at,
+                    last.id,
+                    descending=descending,
+                ),
+            )
+        page = list((await async_session.execute(stmt)).scalars())
+        if not page:
+            break
+        seen.extend(event.id for event in page)
+        last = page[-1]
+
+    assert seen == expected
+    assert len(seen) == 12
+    # NULLs sort last ascending and first descending, as in PostgreSQL
+    null_ids = [3, 6, 9, 12]
+    if descending:
+        assert seen[:4] == sorted(null_ids, reverse=True)
+    else:
+        assert seen[-4:] == null_ids
+
+
+def test_keyset_key_rejects_nullable_column_without_sentinel():
+    """Test only nullable date/time columns get a NULL-free sort key."""
+
+    class Note(Base):
+        __tablename__ = "notes"
+
+        id = Column(Integer, primary_key=True)
+        rank = Column(Integer, nullable=True)
+
+    assert keyset_key(Event.id) is Event.id
+    with pytest.raises(TypeError, match="rank"):
+        keyset_key(Note.rank)
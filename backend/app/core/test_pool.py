@@ -0,0 +1,106 @@
+"""Tests for the instrumented connection pool (a SQLite file stands in for the database)."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.pool import InstrumentedPool, pool_snapshot, track_pool_usage
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    """Engine with a single connection and no overflow, so a second checkout must wait."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio()
+async def test_snapshot_of_idle_pool(engine):
+    snapshot = pool_snapshot(engine.pool)
+
+    assert snapshot.size == 1
+    assert snapshot.max_overflow == 0
+    assert snapshot.checked_out == 0
+    assert snapshot.overflow == 0
+    assert snapshot.checkouts == 0
+    assert snapshot.wait_ms_avg == 0.0
+
+
+@pytest.mark.asyncio()
+async def test_counts_checkouts_and_connections_in_use(engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert pool_snapshot(engine.pool).checked_out == 1
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    snapshot = pool_snapshot(engine.pool)
+    assert snapshot.checked_out == 0
+    assert snapshot.checked_in == 1
+    assert snapshot.checkouts == 2
+
+
+@pytest.mark.asyncio()
+async def test_counts_timeouts_when_pool_is_exhausted(engine):
+    async with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            await engine.connect().start()
+
+    snapshot = pool_snapshot(engine.pool)
+    assert snapshot.timeouts == 1
+    assert snapshot.checkouts == 1
+
+
+@pytest.mark.asyncio()
+async def test_records_wait_for_a_busy_connection(engine):
+    async def hold(conn):
+        await asyncio.sleep(0.05)
+        await conn.close()
+
+    conn = await engine.connect()
+    release = asyncio.create_task(hold(conn))
+    async with engine.connect():
+        pass
+    await release
+
+    assert pool_snapshot(engine.pool).wait_ms_max >= 40
+
+
+@pytest.mark.asyncio()
+async def test_usage_is_recorded_for_the_current_context(engine):
+    async def request():
+        usage = track_pool_usage()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return usage
+
+    usage = await asyncio.create_task(request())
+
+    assert usage.checkouts == 1
+    assert usage.wait_seconds >= 0
+
+
+@pytest.mark.asyncio()
+async def test_stats_survive_dispose(engine):
+    async with engine.connect():
+        pass
+    await engine.dispose()
+
+    assert pool_snapshot(engine.pool).checkouts == 1
+
+
+def test_snapshot_ignores_other_pool_classes():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=NullPool)
+
+    assert pool_snapshot(engine.pool) is None
@@ -6,11 +6,15 @@ ensuring type safety, async operations, and pagination functionality.
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from app.core.cache import EntityCache
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import CountMode
 from app.core.repository import BaseRepository
+from app.core.unit_of_work import unit_of_work
 
 # Test model setup
 Base = declarative_base()
@@ -151,6 +155,42 @@ async def test_list_with_count_empty(repository):
     assert total == 0
 
 
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    ("count", "offset", "expected_total", "expected_mode"),
+    [
+        (CountMode.EXACT, 0, 5, CountMode.EXACT),
+        # SQLite has no planner estimate: falls back to an exact count
+        (CountMode.ESTIMATED, 0, 5, CountMode.EXACT),
+        (CountMode.NONE, 0, None, CountMode.NONE),
+    ],
+)
+async def test_list_page_count_modes(repository, count, offset, expected_total, expected_mode):
+    """Test list_page computes the total per count mode and always sets has_more."""
+    for i in range(5):
+        await repository.create({"name": f"Item {i + 1}"})
+
+    page = await repository.list_page(offset=offset, limit=3, count=count)
+
+    assert [item.name for item in page.items] == ["Item 1", "Item 2", "Item 3"]
+    assert page.has_more is True
+    assert page.total == expected_total
+    assert page.count_mode == expected_mode
+
+
+@pytest.mark.asyncio()
+async def test_list_page_estimated_last_page_is_exact(repository):
+    """Test an estimated count on the last offset page is derived from the rows seen."""
+    for i in range(5):
+        await repository.create({"name": f"Item {i + 1}"})
+
+    last = await repository.list_page(offset=3, limit=3, count=CountMode.ESTIMATED)
+    past_end = await repository.list_page(offset=10, limit=3, count=CountMode.ESTIMATED)
+
+    assert (last.total, last.count_mode, last.has_more) == (5, CountMode.EXACT, False)
+    assert (past_end.total, past_end.count_mode, past_end.has_more) == (5, CountMode.EXACT, False)
+
+
 @pytest.mark.asyncio()
 async def test_update(repository):
     """Test updating an existing instance."""
@@ -191,6 +231,46 @@ async def test_delete(repository):
     assert not_found is None
 
 
+@pytest.mark.asyncio()
+async def test_update_by_id(repository):
+    """Test update_by_id writes and returns the row without loading it first."""
+    instance = await repository.create({"name": "Original", "description": "Old"})
+
+    updated = await repository.update_by_id(instance.id, {"name": "Updated"})
+
+    assert updated is instance  # identity map entry refreshed from RETURNING
+    assert updated.name == "Updated"
+    assert updated.description == "Old"
+
+
+@pytest.mark.asyncio()
+async def test_update_by_id_empty_data(repository):
+    """Test update_by_id with nothing to change returns the current row."""
+    instance = await repository.create({"name": "Unchanged"})
+
+    assert (await repository.update_by_id(instance.id, {})).name == "Unchanged"
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("data", [{"name": "Missing"}, {}])
+async def test_update_by_id_not_found(repository, data):
+    """Test update_by_id raises NotFoundError for an unknown primary key."""
+    with pytest.raises(NotFoundError, match="TestModel with ID 999 not found"):
+        await repository.update_by_id(999, data)
+
+
+@pytest.mark.asyncio()
+async def test_delete_by_id(repository):
+    """Test delete_by_id removes the row and raises NotFoundError once it is gone."""
+    instance = await repository.create({"name": "To delete"})
+
+    await repository.delete_by_id(instance.id)
+
+    assert await repository.get_by_id(instance.id) is None
+    with pytest.raises(NotFoundError):
+        await repository.delete_by_id(instance.id)
+
+
 @pytest.mark.asyncio()
 async def test_type_safety(repository):
     """Test that repository maintains type safety."""
@@ -230,3 +310,211 @@ async def test_pagination_use_case(repository):
     page3, _ = await repository.list_with_count(offset=20, limit=10)
     assert len(page3) == 5
     assert page3[0].name == "Item 21"
+
+
+@pytest.mark.asyncio()
+async def test_list_keyset(repository):
+    """Test cursor pagination walks every row exactly once in primary key order."""
+    for i in range(7):
+        await repository.create({"name": f"Item {i + 1}"})
+
+    page = await repository.list_keyset(limit=3)
+    seen = [item.id for item in page.items]
+    while page.next_cursor:
+        page = await repository.list_keyset(cursor=page.next_cursor, limit=3)
+        seen.extend(item.id for item in page.items)
+
+    assert len(page.items) == 1  # Last page is partial and has no cursor
+    assert seen == sorted(seen)
+    assert len(seen) == 7
+
+
+@pytest.mark.asyncio()
+async def test_list_keyset_invalid_cursor(repository):
+    """Test a malformed cursor raises ValidationError."""
+    with pytest.raises(ValidationError):
+        await repository.list_keyset(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio()
+async def test_create_many(repository):
+    """Test create_many inserts every row and preserves request order."""
+    instances = await repository.create_many([{"name": f"Bulk {i}"} for i in range(5)])
+
+    assert [instance.name for instance in instances] == [f"Bulk {i}" for i in range(5)]
+    assert all(instance.id is not None for instance in instances)
+    _, total = await repository.list_with_count()
+    assert total == 5
+
+
+@pytest.mark.asyncio()
+async def test_create_many_empty(repository):
+    """Test create_many with no rows is a no-op."""
+    assert await repository.create_many([]) == []
+
+
+@pytest.mark.asyncio()
+async def test_bulk_loader_inserts_batches_on_merge(repository):
+    """Test bulk_loader writes every batch (directly, off PostgreSQL) and commits on merge."""
+    loader = await repository.bulk_loader(["name", "description"])
+    await loader.copy(
+        [{"name": "Loaded 0", "description": "a"}, {"name": "Loaded 1", "description": "b"}]
+    )
+    await loader.copy([])
+    await loader.copy([{"name": "Loaded 2", "description": None}])
+
+    assert loader.staging is None
+    assert await loader.merge() == 3
+    items, total = await repository.list_with_count()
+    assert total == 3
+    assert [item.name for item in items] == ["Loaded 0", "Loaded 1", "Loaded 2"]
+
+
+@pytest.mark.asyncio()
+async def test_update_many(repository):
+    """Test update_many applies per-row changes and skips unknown IDs."""
+    first, second = await repository.create_many(
+        [{"name": "First", "description": "a"}, {"name": "Second", "description": "b"}],
+    )
+
+    updated = await repository.update_many(
+        [
+            {"id": first.id, "name": "First updated"},
+            {"id": second.id, "description": "b updated"},
+            {"id": 99999, "name": "Missing"},
+        ],
+    )
+
+    by_id = {instance.id: instance for instance in updated}
+    assert set(by_id) == {first.id, second.id}
+    assert by_id[first.id].name == "First updated"
+    assert by_id[first.id].description == "a"
+    assert by_id[second.id].name == "Second"
+    assert by_id[second.id].description == "b updated"
+
+
+@pytest.mark.asyncio()
+async def test_delete_many(repository):
+    """Test delete_many removes matching rows and returns their IDs."""
+    instances = await repository.create_many([{"name": f"Item {i}"} for i in range(3)])
+    ids = [instance.id for instance in instances]
+
+    deleted = await repository.delete_many([ids[0], ids[2], 99999])
+
+    assert sorted(deleted) == [ids[0], ids[2]]
+    remaining = await repository.list()
+    assert [item.id for item in remaining] == [ids[1]]
+
+
+@pytest.fixture()
+def cached_repository(async_session):
+    """Create a repository with a private get_by_id cache."""
+    repository = BaseRepository[TestModel](TestModel, async_session)
+    repository.cache = EntityCache(max_size=10, ttl=30)
+    return repository
+
+
+def _count_statements(session: AsyncSession) -> list[str]:
+    """Record every SQL statement executed through the session's engine."""
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_: statements.append(statement),
+    )
+    return statements
+
+
+@pytest.mark.asyncio()
+async def test_get_by_id_cache_hit_skips_database(cached_repository, async_session):
+    """Test a cached row is served without SQL and attached to the session."""
+    instance = await cached_repository.create({"name": "Hot", "description": "cached"})
+    async_session.expunge_all()  # Simulate a new request's session
+    await cached_repository.get_by_id(instance.id)  # Miss: loads and caches
+    async_session.expunge_all()
+
+    statements = _count_statements(async_session)
+    found = await cached_repository.get_by_id(instance.id)
+
+    assert statements == []
+    assert (found.id, found.name, found.description) == (instance.id, "Hot", "cached")
+    assert found in async_session
+    assert cached_repository.cache.stats.hits == 1
+    assert cached_repository.cache.stats.misses == 1
+
+
+@pytest.mark.asyncio()
+async def test_get_by_id_cache_missing_row_not_cached(cached_repository):
+    """Test lookups of missing rows are not cached."""
+    assert await cached_repository.get_by_id(999) is None
+    assert len(cached_repository.cache) == 0
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("write", ["update", "update_by_id", "update_many", "delete_by_id"])
+async def test_writes_invalidate_cache(cached_repository, async_session, write):
+    """Test every write path drops the cached row."""
+    instance = await cached_repository.create({"name": "Before"})
+    async_session.expunge_all()
+    await cached_repository.get_by_id(instance.id)
+    assert len(cached_repository.cache) == 1
+
+    if write == "update":
+        loaded = await cached_repository.get_by_id(instance.id)
+        await cached_repository.update(loaded, {"name": "After"})
+    elif write == "update_by_id":
+        await cached_repository.update_by_id(instance.id, {"name": "After"})
+    elif write == "update_many":
+        await cached_repository.update_many([{"id": instance.id, "name": "After"}])
+    else:
+        await cached_repository.delete_by_id(instance.id)
+
+    assert len(cached_repository.cache) == 0
+    async_session.expunge_all()
+    found = await cached_repository.get_by_id(instance.id)
+    if write == "delete_by_id":
+        assert found is None
+    else:
+        assert found.name == "After"
+
+
+@pytest.mark.asyncio()
+async def test_writes_in_unit_of_work_invalidate_cache_on_commit(cached_repository, async_session):
+    """Test a write inside a unit of work drops the cached row when it commits, not on flush.
+
+    Until the COMMIT other requests still read the old row and may cache it
+    again; invalidating at the flush would leave that stale entry for the TTL.
+    """
+    instance = await cached_repository.create({"name": "Before"})
+    async_session.expunge_all()
+    await cached_repository.get_by_id(instance.id)
+    key = ("TestModel", instance.id)
+
+    async with unit_of_work(async_session):
+        await cached_repository.update_by_id(instance.id, {"name": "After"})
+        # A concurrent request re-caches the still-committed row
+        cached_repository.cache.set(key, {"id": instance.id, "name": "Before", "description": None})
+
+    assert cached_repository.cache.get(key) is None
+    async_session.expunge_all()
+    assert (await cached_repository.get_by_id(instance.id)).name == "After"
+
+
+@pytest.mark.asyncio()
+async def test_rolled_back_writes_keep_cache(cached_repository, async_session):
+    """Test a rolled-back unit of work leaves the (still correct) cached row alone."""
+    instance = await cached_repository.create({"name": "Before"})
+    async_session.expunge_all()
+    await cached_repository.get_by_id(instance.id)
+
+    async def delete_then_fail() -> None:
+        async with unit_of_work(async_session):
+            await cached_repository.delete_by_id(instance.id)
+            msg = "abort"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError):
+        await delete_then_fail()
+    await async_session.commit()  # nothing left to invalidate
+
+    assert cached_repository.cache.get(("TestModel", instance.id)) is not None
@@ -0,0 +1,105 @@
+"""Tests for validating JSON request bodies from raw bytes."""
+
+from datetime import datetime
+from typing import Annotated
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.base_schema import BaseSchema
+from app.core.routing import JSONBodyRoute, json_body, json_body_openapi
+
+
+class Payload(BaseSchema):
+    title: str
+    due_date: datetime | None = None
+
+
+class Plain(BaseModel):
+    title: str
+
+
+router = APIRouter(route_class=JSONBodyRoute)
+
+
+@router.post("/payload")
+async def payload(data: Annotated[Payload, json_body(Payload)]) -> dict:
+    return {"title": data.title, "due_date": data.due_date}
+
+
+@router.put("/plain/{id}")
+async def plain(id: int, data: Annotated[Plain, json_body(Plain)]) -> dict:
+    return {"id": id, "title": data.title}
+
+
+app = FastAPI()
+app.include_router(router)
+app.openapi = json_body_openapi(app)
+
+
+@pytest.fixture()
+def client():
+    return TestClient(app)
+
+
+def test_valid_body(client):
+    response = client.post("/payload", json={"title": "x", "due_date": ""})
+
+    assert response.status_code == 200
+    assert response.json() == {"title": "x", "due_date": None}
+
+
+def test_invalid_body_errors_are_under_body(client):
+    response = client.post("/payload", json={"due_date": "nope"})
+
+    assert response.status_code == 422
+    assert [(error["type"], error["loc"]) for error in response.json()["detail"]] == [
+        ("missing", ["body", "title"]),
+        ("datetime_from_date_parsing", ["body", "due_date"]),
+    ]
+
+
+def test_malformed_json(client):
+    response = client.post(
+        "/payload", content=b'{"title": ', headers={"content-type": "application/json"}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+    assert response.json()["detail"][0]["loc"] == ["body"]
+
+
+def test_missing_body(client):
+    response = client.post("/payload")
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "missing"
+
+
+def test_other_content_type_keeps_fastapi_handling(client):
+    response = client.post("/payload", content=b"title=x", headers={"content-type": "text/plain"})
+
+    assert response.status_code == 422
+
+
+def test_plain_model_body(client):
+    response = client.put("/plain/1", json={"title": "x"})
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "title": "x"}
+
+
+def test_openapi_documents_the_body():
+    spec = app.openapi()
+    operation = spec["paths"]["/payload"]["post"]
+
+    assert operation["requestBody"] == {
+        "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Payload"}}},
+        "required": True,
+    }
+    assert "default" not in spec["components"]["schemas"]["Payload"]["properties"]["due_date"]
+    assert spec["paths"]["/plain/{id}"]["put"]["responses"]["422"]["content"] == {
+        "application/json": {"schema": {"$ref": "#/components/schemas/HTTPValidationError"}}
+    }
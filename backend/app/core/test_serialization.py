@@ -0,0 +1,77 @@
+"""Tests for field-plan serialization and raw JSON responses."""
+
+import json
+from datetime import UTC, datetime
+from enum import StrEnum
+from types import SimpleNamespace
+
+from pydantic import BaseModel, ConfigDict
+
+from app.core.serialization import FieldPlan, json_response
+
+
+class Color(StrEnum):
+    RED = "red"
+
+
+class Item(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    color: Color
+    seen_at: datetime | None
+
+
+class Page(BaseModel):
+    items: list[Item]
+    total: int | None
+
+
+ROW = SimpleNamespace(
+    id=1,
+    name="Crème ☕",
+    color=Color.RED,
+    seen_at=datetime(2025, 1, 2, 3, 4, 5, 600, tzinfo=UTC),
+    notes="not planned",
+)
+
+
+def test_plan_reads_fields_in_order():
+    plan = FieldPlan(Item, ("name", "id"))
+
+    assert list(plan.row(ROW).items()) == [("name", "Crème ☕"), ("id", 1)]
+    assert plan.rows([ROW, ROW]) == [{"name": "Crème ☕", "id": 1}] * 2
+
+
+def test_plan_with_single_field():
+    assert FieldPlan(Item, ("id",)).rows([ROW]) == [{"id": 1}]
+
+
+def test_plan_falls_back_to_attributes():
+    """Test fields missing from __dict__ (unloaded, or properties) are read as attributes."""
+
+    class Lazy:
+        id = 7
+
+        def __init__(self) -> None:
+            self.name = "x"
+
+    assert FieldPlan(Item, ("id", "name")).row(Lazy()) == {"id": 7, "name": "x"}
+
+
+def test_json_response_matches_model_serialization():
+    """Test the one-pass output equals validating a model and dumping it."""
+    plan = FieldPlan(Item)
+    expected = Item.model_validate(ROW).model_dump_json().encode()
+
+    single = json_response(plan.row(ROW), plan.row_adapter, status_code=201)
+    untyped = json_response([plan.row(ROW)])
+    page = json_response({"items": plan.rows([ROW]), "total": None}, plan.page_adapter(Page))
+
+    assert single.status_code == 201
+    assert single.media_type == "application/json"
+    assert single.body == expected
+    assert json.loads(untyped.body) == [json.loads(expected)]
+    assert page.body == b'{"items":[' + expected + b'],"total":null}'
+    assert plan.page_adapter(Page) is plan.page_adapter(Page)
@@ -0,0 +1,131 @@
+"""Tests for unit-of-work transaction batching with BaseRepository."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Column, Integer, String, event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.cache import EntityCache
+from app.core.repository import BaseRepository
+from app.core.unit_of_work import in_unit_of_work, unit_of_work
+
+Base = declarative_base()
+
+
+class Note(Base):
+    """Model for unit-of-work tests."""
+
+    __tablename__ = "notes"
+
+    id = Column(Integer, primary_key=True)
+    text = Column(String(50), nullable=False)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create an in-memory SQLite database shared by several sessions."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    """Create a session that records how many times it commits."""
+    async with session_factory() as session:
+        session.info["commits"] = 0
+
+        def count_commit(sync_session):
+            sync_session.info["commits"] += 1
+
+        event.listen(session.sync_session, "after_commit", count_commit)
+        yield session
+
+
+async def _texts(session_factory) -> list[str]:
+    """Read committed rows through an independent session."""
+    async with session_factory() as other:
+        return list((await other.scalars(select(Note.text).order_by(Note.id))).all())
+
+
+@pytest.mark.asyncio()
+async def test_autocommit_by_default(session, session_factory):
+    """Test each write commits on its own outside a unit of work."""
+    repo = BaseRepository[Note](Note, session)
+
+    note = await repo.create({"text": "a"})
+    await repo.update_by_id(note.id, {"text": "b"})
+
+    assert session.info["commits"] == 2
+    assert await _texts(session_factory) == ["b"]
+
+
+@pytest.mark.asyncio()
+async def test_writes_commit_once(session, session_factory):
+    """Test writes inside the block share one commit at its end."""
+    repo = BaseRepository[Note](Note, session)
+
+    async with unit_of_work(session):
+        note = await repo.create({"text": "a"})
+        await repo.create_many([{"text": "b"}, {"text": "c"}])
+        await repo.update_by_id(note.id, {"text": "a2"})
+        assert session.info["commits"] == 0
+
+    assert session.info["commits"] == 1
+    assert await _texts(session_factory) == ["a2", "b", "c"]
+    assert not in_unit_of_work(session)
+
+
+@pytest.mark.asyncio()
+async def test_exception_rolls_back_every_write(session, session_factory):
+    """Test a failure anywhere in the block discards all of its writes."""
+    repo = BaseRepository[Note](Note, session)
+
+    async def write_then_fail() -> None:
+        async with unit_of_work(session):
+            await repo.create({"text": "a"})
+            await repo.create({"text": "b"})
+            msg = "boom"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError):
+        await write_then_fail()
+
+    assert session.info["commits"] == 0
+    assert await _texts(session_factory) == []
+    assert not in_unit_of_work(session)
+
+
+@pytest.mark.asyncio()
+async def test_nested_blocks_join_outer(session, session_factory):
+    """Test only the outermost block commits."""
+    repo = BaseRepository[Note](Note, session)
+
+    async with unit_of_work(session):
+        async with unit_of_work(session):
+            await repo.create({"text": "inner"})
+        assert session.info["commits"] == 0
+        await repo.create({"text": "outer"})
+
+    assert session.info["commits"] == 1
+    assert await _texts(session_factory) == ["inner", "outer"]
+
+
+@pytest.mark.asyncio()
+async def test_uncommitted_reads_are_not_cached(session):
+    """Test rows read after a deferred write stay out of the shared cache."""
+    repo = BaseRepository[Note](Note, session)
+    repo.cache = EntityCache(max_size=10, ttl=30)
+
+    async with unit_of_work(session):
+        note = await repo.create({"text": "pending"})
+        session.expunge_all()
+        await repo.get_by_id(note.id)
+        assert len(repo.cache) == 0
+
+    session.expunge_all()
+    await repo.get_by_id(note.id)
+    assert len(repo.cache) == 1
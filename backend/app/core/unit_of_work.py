@@ -0,0 +1,78 @@
+"""Unit of work: group repository writes into a single transaction.
+
+By default every ``BaseRepository`` mutator commits on its own (autocommit),
+so a service that writes three times pays for three commits, and a failure
+in the third write leaves the first two in place. Inside ``unit_of_work``
+the mutators only flush; the block commits once when it exits normally and
+rolls back if it raises, so the writes are atomic and share one commit.
+
+Blocks nest: inner blocks join the outermost one, which alone commits or
+rolls back.
+
+Usage Example:
+    async with unit_of_work(session):
+        todo = await repo.create({"title": "Write report"})
+        await repo.update_by_id(other_id, {"completed": True})
+    # One COMMIT here (or ROLLBACK if either write raised)
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_DEPTH_KEY = "unit_of_work_depth"
+_WRITES_KEY = "unit_of_work_writes"
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    """Return whether commits on ``session`` are currently deferred."""
+    return session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Return whether ``session`` holds flushed but not yet committed repository writes."""
+    return session.info.get(_WRITES_KEY, False)
+
+
+async def commit_or_flush(session: AsyncSession) -> None:
+    """Commit ``session``, or only flush it while a unit of work is open.
+
+    Repositories call this instead of ``session.commit()`` so they work both
+    standalone (autocommit) and inside ``unit_of_work``.
+    """
+    if in_unit_of_work(session):
+        await session.flush()
+        session.info[_WRITES_KEY] = True
+    else:
+        await session.commit()
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Defer repository commits on ``session`` to one commit at the end of the block.
+
+    Args:
+        session: Session shared by the repositories taking part
+
+    Yields:
+        The same session
+
+    Raises:
+        Any exception raised inside the block, after rolling back
+        (outermost block only)
+    """
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            await session.commit()
+    except BaseException:
+        if depth == 0:
+            await session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+        if depth == 0:
+            session.info.pop(_WRITES_KEY, None)
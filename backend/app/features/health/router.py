@@ -3,6 +3,7 @@
 This module provides:
 - Basic liveness check (/health)
 - Database connectivity check (/health/db)
+- Connection pool telemetry (/health/pool)
 
 These endpoints are used by:
 - Container orchestration (Docker, Kubernetes) for health probes
@@ -15,27 +16,36 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import engine_pools, get_read_db
 
-from .schemas import DatabaseHealthResponse, HealthResponse
+from .schemas import DatabaseHealthResponse, HealthResponse, PoolHealthResponse
 from .service import HealthService
 
 router = APIRouter(prefix="/api/v1", tags=["health"])
 
 
-def get_health_service(db: Annotated[AsyncSession, Depends(get_db)]) -> HealthService:
-    """Dependency injection for HealthService."""
+def get_health_service(db: Annotated[AsyncSession, Depends(get_read_db)]) -> HealthService:
+    """Dependency injection for HealthService (read-only, so replicas may serve it)."""
     return HealthService(db)
 
 
+def get_health_service_without_db() -> HealthService:
+    """Dependency injection for HealthService without a session (liveness, pool telemetry).
+
+    Checks served through it never take a pool connection.
+    """
+    return HealthService(pools=engine_pools())
+
+
 @router.get("/health", status_code=status.HTTP_200_OK)
 async def health_check(
-    service: Annotated[HealthService, Depends(get_health_service)],
+    service: Annotated[HealthService, Depends(get_health_service_without_db)],
 ) -> HealthResponse:
     """Basic health check endpoint for liveness probes.
 
     This endpoint verifies that the application is running and responsive.
-    It does not check external dependencies like database.
+    It does not check external dependencies like database, and takes no
+    session, so frequent polling never holds a pool connection.
 
     Args:
         service: HealthService injected via dependency
@@ -84,3 +94,29 @@ async def health_check_db(
         response.status_code = status.HTTP_200_OK
 
     return result
+
+
+@router.get("/health/pool", status_code=status.HTTP_200_OK)
+async def health_check_pool(
+    service: Annotated[HealthService, Depends(get_health_service_without_db)],
+) -> PoolHealthResponse:
+    """Connection pool telemetry for the primary and each read replica.
+
+    Reports configured size, connections in use and idle, overflow, and
+    cumulative checkouts, checkout timeouts and wait times. It takes no
+    database connection, so it keeps answering while the pools are
+    exhausted; "saturated" means some pool has no connection left to hand
+    out (requests are queuing for up to DB_POOL_TIMEOUT).
+
+    Args:
+        service: HealthService injected via dependency
+
+    Returns:
+        PoolHealthResponse: Pool status and per-pool statistics
+
+    Example response:
+        {"status": "healthy", "pools": [{"name": "primary", "size": 5, "max_overflow": 10,
+          "checked_out": 1, "checked_in": 4, "overflow": 0, "checkouts": 1520,
+          "timeouts": 0, "wait_ms_avg": 0.041, "wait_ms_max": 12.7}]}
+    """
+    return await service.check_pool_health()
@@ -25,3 +25,44 @@ class DatabaseHealthResponse(BaseModel):
     status: str
     database: str
     error: str | None = None
+
+
+class PoolStatusResponse(BaseModel):
+    """Connection pool status of one engine.
+
+    Attributes:
+        name: "primary" or the replica URL (password hidden)
+        size: Configured persistent connections (DB_POOL_SIZE)
+        max_overflow: Extra connections allowed under load (DB_MAX_OVERFLOW)
+        checked_out: Connections in use right now
+        checked_in: Idle connections in the pool
+        overflow: Overflow connections open right now
+        checkouts: Total checkouts since start
+        timeouts: Checkouts that gave up after DB_POOL_TIMEOUT since start
+        wait_ms_avg: Mean time a checkout waited for a connection
+        wait_ms_max: Longest checkout wait
+    """
+
+    name: str
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_ms_avg: float
+    wait_ms_max: float
+
+
+class PoolHealthResponse(BaseModel):
+    """Connection pool health response model.
+
+    Attributes:
+        status: "healthy", or "saturated" when any pool has every connection
+            (overflow included) checked out
+        pools: Status of the primary pool followed by each replica's pool
+    """
+
+    status: str
+    pools: list[PoolStatusResponse]
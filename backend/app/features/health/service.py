@@ -3,13 +3,20 @@
 This service handles:
 - Basic application liveness checks
 - Database connectivity validation
+- Connection pool saturation reporting
 - Error handling and status determination
 """
 
+from collections.abc import Mapping
+from dataclasses import asdict
+
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import Pool
+
+from app.core.pool import pool_snapshot
 
-from .schemas import DatabaseHealthResponse, HealthResponse
+from .schemas import DatabaseHealthResponse, HealthResponse, PoolHealthResponse, PoolStatusResponse
 
 
 class HealthService:
@@ -36,16 +43,20 @@ class HealthService:
         - No need for query reuse or testing isolation
 
     Attributes:
-        db: Async database session for connectivity checks
+        db: Async database session for connectivity checks (None for checks
+            that must not hold a connection)
+        pools: Connection pools by engine name, for pool checks
     """
 
-    def __init__(self, db: AsyncSession):
-        """Initialize health service with database session.
+    def __init__(self, db: AsyncSession | None = None, pools: Mapping[str, Pool] | None = None):
+        """Initialize health service with database session and/or pools.
 
         Args:
             db: Async SQLAlchemy session for database operations
+            pools: Connection pools to report on, e.g. ``engine_pools()``
         """
         self.db = db
+        self.pools = pools or {}
 
     async def check_basic_health(self) -> HealthResponse:
         """Perform basic application liveness check.
@@ -88,3 +99,27 @@ class HealthService:
         except Exception as e:
             # Database connection failed - return unhealthy status with error
             return DatabaseHealthResponse(status="unhealthy", database="disconnected", error=str(e))
+
+    async def check_pool_health(self) -> PoolHealthResponse:
+        """Report usage and wait statistics of each connection pool.
+
+        Reads the pools' counters only, so it never waits for a connection
+        and still answers while the pools are exhausted. Pools that are not
+        an ``InstrumentedPool`` are left out.
+
+        Returns:
+            PoolHealthResponse: "saturated" if any pool has no connection
+            left to hand out, with per-pool details
+
+        Example:
+            service = HealthService(pools=engine_pools())
+            health = await service.check_pool_health()
+            primary = health.pools[0]  # checked_out, wait_ms_avg, timeouts, ...
+        """
+        pools = []
+        for name, pool in self.pools.items():
+            snapshot = pool_snapshot(pool)
+            if snapshot is not None:
+                pools.append(PoolStatusResponse(name=name, **asdict(snapshot)))
+        saturated = any(pool.checked_out >= pool.size + pool.max_overflow for pool in pools)
+        return PoolHealthResponse(status="saturated" if saturated else "healthy", pools=pools)
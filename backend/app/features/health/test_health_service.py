@@ -10,6 +10,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core.pool import InstrumentedPool
 from app.features.health.service import HealthService
 
 
@@ -135,3 +136,35 @@ async def test_database_query_execution(async_session):
     value = result.scalar()
 
     assert value == 1
+
+
+@pytest.mark.asyncio()
+async def test_check_pool_health_reports_each_pool(tmp_path):
+    """Test pool health lists instrumented pools and flags a saturated one.
+
+    Validates:
+    - Each InstrumentedPool is reported under its name
+    - Pools of other classes are left out
+    - Status is "saturated" while every connection is checked out
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    other = create_async_engine("sqlite+aiosqlite:///:memory:")
+    service = HealthService(pools={"primary": engine.pool, "other": other.pool})
+    try:
+        idle = await service.check_pool_health()
+        async with engine.connect():
+            busy = await service.check_pool_health()
+    finally:
+        await engine.dispose()
+        await other.dispose()
+
+    assert idle.status == "healthy"
+    assert [pool.name for pool in idle.pools] == ["primary"]
+    assert busy.status == "saturated"
+    assert busy.pools[0].checked_out == 1
+    assert busy.pools[0].checkouts == 1
@@ -0,0 +1,31 @@
+"""Prometheus scrape endpoint.
+
+This module provides:
+- Metrics in the Prometheus text format (/metrics): per-route request
+  counts, latency and response size histograms, requests in flight,
+  connection pool statistics and repository call timings
+
+With several workers and ``METRICS_DIR`` set, whichever worker answers
+reports the totals of all of them (see ``app.core.metrics``).
+"""
+
+from fastapi import APIRouter, Response
+
+from app.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Current metrics, for Prometheus to scrape.
+
+    Takes no database connection: pool statistics are read from the pools.
+    A plain ``def``, so it runs in the threadpool: with ``METRICS_DIR`` set,
+    rendering reads the other workers' snapshot files under a file lock,
+    which must not block this worker's event loop.
+
+    Returns:
+        Response: The metrics in the text exposition format
+    """
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,74 @@
+"""Command line tools for todos.
+
+Commands:
+- ``import``: load todos from an NDJSON or CSV file (or ``-`` for stdin)
+  into ``DATABASE_URL``, the same way as ``POST /api/v1/todos/import``.
+  Prints the result as JSON; exits with status 1 if any row was rejected.
+
+Usage:
+    uv run python -m app.features.todos.cli import todos.ndjson
+    uv run python -m app.features.todos.cli import export.txt --format csv
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.database import AsyncSessionLocal, engine
+
+from .repository import TodoRepository
+from .schemas import FileFormat, TodoImportParams, TodoImportResponse
+from .service import TodoService
+
+READ_CHUNK_SIZE = 1 << 20
+"""Bytes read from the input file at a time."""
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    """Read ``file`` in chunks without blocking the event loop."""
+    while chunk := await asyncio.to_thread(file.read, READ_CHUNK_SIZE):
+        yield chunk
+
+
+async def import_file(file: BinaryIO, file_format: FileFormat) -> TodoImportResponse:
+    """Import todos from ``file`` in one transaction."""
+    try:
+        async with AsyncSessionLocal() as session:
+            service = TodoService(TodoRepository(session))
+            return await service.import_todos(
+                read_chunks(file),
+                TodoImportParams(format=file_format),
+            )
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a command and return the process exit status."""
+    parser = argparse.ArgumentParser(description="Todo command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="Import todos from NDJSON or CSV")
+    importer.add_argument("path", help="File to import, or - for stdin")
+    importer.add_argument(
+        "--format",
+        choices=[file_format.value for file_format in FileFormat],
+        help="Input format (default: from the file extension, ndjson unless .csv)",
+    )
+    args = parser.parse_args(argv)
+
+    path = Path(args.path)
+    file_format = FileFormat(args.format or ("csv" if path.suffix == ".csv" else "ndjson"))
+    if args.path == "-":
+        result = asyncio.run(import_file(sys.stdin.buffer, file_format))
+    else:
+        with path.open("rb") as file:
+            result = asyncio.run(import_file(file, file_format))
+    sys.stdout.write(result.model_dump_json(indent=2) + "\n")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,19 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Boolean, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy import Boolean, Computed, DateTime, Enum, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 
+SEARCH_CONFIG = "english"
+"""PostgreSQL text search configuration used for the search vector and queries."""
+
+DUE_DATE_SORT_KEY = "coalesce(due_date, 'infinity'::timestamptz)"
+"""Indexed sort key of due_date: ``keyset_key(Todo.due_date)`` (NULLs as infinity)."""
+
 
 class PriorityEnum(str, PyEnum):
     """Priority levels for todos."""
@@ -24,19 +31,17 @@ class Todo(Base):
     __tablename__ = "todos"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    title: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
+    completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     priority: Mapped[PriorityEnum] = mapped_column(
         Enum(PriorityEnum),
         default=PriorityEnum.MEDIUM,
         nullable=False,
-        index=True,
     )
     due_date: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
-        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -49,9 +54,65 @@ class Todo(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # Full-text search document: title (weight A) ranks above description (weight B).
+    # Generated by PostgreSQL and deferred, so it is never loaded or sent unless asked for.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
-    # Composite index for common queries (filtering by completion and due date)
-    __table_args__ = (Index("ix_todos_completed_due_date", "completed", "due_date"),)
+    __table_args__ = (
+        # Sort indexes: every filter/sort combination of list_filtered reads its page in
+        # index order (no Sort node). Layout: equality filters, sort field, id tie-breaker.
+        # Priority sorts by enum declaration order (low < medium < high) straight off the index.
+        # due_date is nullable, so its indexes hold its NULL-free sort key (DUE_DATE_SORT_KEY).
+        # No filter
+        Index("ix_todos_created_at_id", "created_at", "id"),
+        Index("ix_todos_due_date_id", text(DUE_DATE_SORT_KEY), "id"),
+        Index("ix_todos_priority_id", "priority", "id"),  # also priority filter + sort
+        Index("ix_todos_title_id", "title", "id"),
+        # completed filter
+        Index("ix_todos_completed_created_at_id", "completed", "created_at", "id"),
+        Index("ix_todos_completed_due_date_id", "completed", text(DUE_DATE_SORT_KEY), "id"),
+        Index("ix_todos_completed_priority_id", "completed", "priority", "id"),
+        Index("ix_todos_completed_title_id", "completed", "title", "id"),
+        # priority filter
+        Index("ix_todos_priority_created_at_id", "priority", "created_at", "id"),
+        Index("ix_todos_priority_due_date_id", "priority", text(DUE_DATE_SORT_KEY), "id"),
+        Index("ix_todos_priority_title_id", "priority", "title", "id"),
+        # completed + priority filters (sort by priority uses ix_todos_completed_priority_id)
+        Index(
+            "ix_todos_completed_priority_created_at_id", "completed", "priority", "created_at", "id"
+        ),
+        Index(
+            "ix_todos_completed_priority_due_date_id",
+            "completed",
+            "priority",
+            text(DUE_DATE_SORT_KEY),
+            "id",
+        ),
+        Index("ix_todos_completed_priority_title_id", "completed", "priority", "title", "id"),
+        # Full-text search (search_vector @@ websearch_to_tsquery(...))
+        Index("ix_todos_search_vector", "search_vector", postgresql_using="gin"),
+        # Substring (ILIKE) and fuzzy search; requires the pg_trgm extension
+        Index(
+            "ix_todos_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_todos_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     def __repr__(self) -> str:
         """String representation of Todo."""
@@ -1,23 +1,79 @@
 """Repository for todo data access operations."""
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from functools import lru_cache
+from typing import Any, Literal, NamedTuple
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    String,
+    bindparam,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only
 
+from app.core.cache import entity_cache_for
+from app.core.exceptions import ValidationError
+from app.core.metrics import timed_call
+from app.core.pagination import (
+    CountMode,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    keyset_order_by,
+    keyset_predicate,
+)
 from app.core.repository import BaseRepository
 
-from .models import Todo
-from .schemas import TodoFilterParams
+from .models import SEARCH_CONFIG, Todo
+from .schemas import SearchMode, SortBy, SortOrder, TodoFilterParams, TodoFilters
+
+LIST_STATEMENT_CACHE_SIZE = 256
+"""Query shapes kept by ``TodoRepository.list_statements`` (sparse fieldsets add shapes)."""
+
+EXPORT_BATCH_SIZE = 1000
+"""Rows fetched per round trip by ``TodoRepository.stream_filtered``."""
+
+
+class ListShape(NamedTuple):
+    """Everything about a list request that changes its SQL, and none of its values."""
+
+    completed: bool
+    priority: bool
+    search_mode: SearchMode | None
+    sort_by: SortBy
+    descending: bool
+    cursor: Literal["value", "null", "id"] | None
+    fields: tuple[str, ...] | None
+    joined_total: bool
+
+
+class ListStatements(NamedTuple):
+    """Statements built for one ``ListShape``."""
+
+    filtered: Select
+    page: Select
 
 
 class TodoRepository(BaseRepository[Todo]):
     """Repository for Todo database operations.
 
     Extends BaseRepository to provide custom filtering and search capabilities
-    for todo items.
+    for todo items. ``get_by_id`` is cached in process when "todos" is listed
+    in ``ENTITY_CACHE_MODELS``.
     """
 
+    cache = entity_cache_for("todos")
+
     def __init__(self, session: AsyncSession) -> None:
         """Initialize repository with database session.
 
@@ -26,23 +82,77 @@ class TodoRepository(BaseRepository[Todo]):
         """
         super().__init__(Todo, session)
 
+    @timed_call
     async def list_filtered(
         self,
         filters: TodoFilterParams,
-    ) -> tuple[Sequence[Todo], int]:
+        *,
+        single_query: bool = True,
+    ) -> Page[Todo]:
         """Retrieve filtered and sorted todo items with pagination.
 
+        ``filters.search`` is matched against title and description
+        according to ``filters.search_mode``:
+
+        - ``fulltext`` (default): ``websearch_to_tsquery`` syntax (words,
+          "quoted phrases", ``or``, ``-excluded``) against the GIN-indexed
+          ``search_vector``; relevance is ``ts_rank``
+        - ``substring``: case-insensitive ``ILIKE '%term%'`` (wildcards in
+          the term are literal), served by the ``pg_trgm`` GIN indexes
+        - ``fuzzy``: ``pg_trgm`` word similarity, tolerating typos and
+          fragments; relevance (also for ``substring``) is ``word_similarity``
+
+        Rows are ordered by the requested sort field with ``id`` as a
+        tie-breaker, so every ordering is total and can be resumed from a
+        cursor. With ``filters.cursor`` set, the page starts right after the
+        row the cursor points to (keyset pagination); otherwise
+        ``filters.offset`` rows are skipped. Every combination of the
+        ``completed``/``priority`` filters and sort field has a B-tree index on
+        ``(filters..., sort_field, id)`` (see ``Todo.__table_args__``), so the
+        page is one index range scan read in order, with no sort of the
+        matching rows. Search results come from the GIN indexes and are
+        sorted after matching.
+        ``sort_by=relevance`` orders by ``ts_rank`` instead; it needs a search
+        term and pages by offset only (next_cursor is always None).
+
+        The statements are built once per query shape (which filters are
+        set, search mode, sort, cursor or offset, fields, count strategy) with
+        every value as a bind parameter and then reused, so a request only
+        validates its parameters and binds values.
+
+        ``filters.count`` selects how the total is computed (see ``CountMode``):
+        an exact count, the planner's estimate, or none at all. ``has_more``
+        is always exact, from one extra fetched row.
+
+        By default an exact total comes back in the same statement as the
+        page: the one-row count is LEFT JOINed to the page, so the total
+        arrives even when the page is empty (offset past the end). A
+        ``count(*) OVER ()`` window is deliberately not used: it pushes every
+        matching row through the window aggregate before LIMIT, which defeats
+        the top-N index scan, and it would count only the rows after a cursor.
+        ``single_query=False`` runs the count and the page as two statements.
+
+        With ``filters.fields`` set only those columns (plus ``id`` and the
+        sort column) are selected; other attributes of the returned todos are
+        not loaded and must not be accessed.
+
         Args:
-            filters: Filter and pagination parameters including offset, limit,
-                completed status, priority, search term, sort field and order
+            filters: Filter and pagination parameters including offset or cursor,
+                limit, completed status, priority, search term, sort field and order
+            single_query: Fetch the total together with the page (default: True)
 
         Returns:
-            Tuple of (filtered items, total count matching filters)
+            Page with the filtered items, the total count matching filters
+            (per ``filters.count``), has_more and the cursor for the next page
+
+        Raises:
+            ValidationError: If the cursor is malformed, was issued for another
+                sort, or is combined with a non-zero offset or relevance sort;
+                or if relevance sort is requested without a search term
 
         Example:
             repo = TodoRepository(session)
             filters = TodoFilterParams(
-                offset=0,
                 limit=20,
                 completed=False,
                 priority=PriorityEnum.HIGH,
@@ -50,41 +160,334 @@ class TodoRepository(BaseRepository[Todo]):
                 sort_by=SortBy.DUE_DATE,
                 sort_order=SortOrder.ASC,
             )
-            items, total = await repo.list_filtered(filters)
+            page = await repo.list_filtered(filters)
+            next_page = await repo.list_filtered(
+                filters.model_copy(update={"cursor": page.next_cursor})
+            )
         """
-        # Build base query
-        query = select(Todo)
+        # Validate the request and collect bind values; the SQL depends only on the shape
+        search, params = self._filter_params(filters)
+        descending = filters.sort_order == SortOrder.DESC
+        params["limit"] = filters.limit + 1
 
-        # Apply filters
-        if filters.completed is not None:
-            query = query.where(Todo.completed == filters.completed)
+        if filters.sort_by == SortBy.RELEVANCE:
+            if filters.cursor is not None:
+                msg = "sort_by=relevance does not support cursor pagination; use offset"
+                raise ValidationError(msg)
+            sort_column = None
+        else:
+            sort_column = getattr(Todo, filters.sort_by.value)
+            cursor_tag = f"{sort_column.key}:{filters.sort_order.value}"
 
-        if filters.priority is not None:
-            query = query.where(Todo.priority == filters.priority)
+        # Pagination (cursor or offset); one extra row is fetched to detect a next page
+        cursor = None
+        if filters.cursor is not None:
+            if filters.offset:
+                msg = "Use either cursor or offset for pagination, not both"
+                raise ValidationError(msg)
+            value, last_id = decode_cursor(filters.cursor, [sort_column, Todo.id], tag=cursor_tag)
+            params["cursor_id"] = last_id
+            if sort_column is Todo.priority and value == filters.priority:
+                cursor = "id"
+            elif value is None:
+                cursor = "null"
+            else:
+                cursor = "value"
+                params["cursor_value"] = value
+        else:
+            params["offset"] = filters.offset
+
+        # Sparse fieldsets: load the requested columns plus the keyset (id, sort column)
+        fields = filters.field_names
+        if fields is not None:
+            keyset = ("id",) if sort_column is None else ("id", sort_column.key)
+            fields = tuple(dict.fromkeys((*fields, *keyset)))
+
+        # Execute query
+        count_mode = filters.count
+        joined_total = count_mode is CountMode.EXACT and single_query
+        statements = self.list_statements(
+            ListShape(
+                completed=filters.completed is not None,
+                priority=filters.priority is not None,
+                search_mode=None if search is None else filters.search_mode,
+                sort_by=filters.sort_by,
+                descending=descending,
+                cursor=cursor,
+                fields=fields,
+                joined_total=joined_total,
+            ),
+        )
+        result = await self.session.execute(statements.page, params)
+        if joined_total:
+            rows = result.all()
+            total = rows[0].total
+            items = [row[0] for row in rows if row[0] is not None]
+        else:
+            items = list(result.scalars().all())
+
+        has_more = len(items) > filters.limit
+        next_cursor = None
+        if has_more:
+            items = items[: filters.limit]
+        if has_more and sort_column is not None:
+            last = items[-1]
+            next_cursor = encode_cursor([getattr(last, sort_column.key), last.id], tag=cursor_tag)
+
+        if not joined_total:
+            total, count_mode = await self._count_total(
+                statements.filtered,
+                count_mode,
+                offset=None if filters.cursor is not None else filters.offset,
+                page_size=len(items),
+                has_more=has_more,
+                params=params,
+            )
+
+        return Page(
+            items=items,
+            total=total,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            count_mode=count_mode,
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=LIST_STATEMENT_CACHE_SIZE)
+    def list_statements(shape: ListShape) -> ListStatements:
+        """Build (once per shape) the statements ``list_filtered`` runs.
+
+        Every value is a named bind parameter (``completed``, ``priority``,
+        ``search``/``pattern``, ``cursor_value``, ``cursor_id``, ``offset``,
+        ``limit``), so the statements are shared by all requests of the same
+        shape and SQLAlchemy's compiled cache finds their SQL by identity.
+
+        Args:
+            shape: What the request filters, sorts, pages and loads by
+
+        Returns:
+            The filtered query (for counts) and the page query to execute
+        """
+        filtered, rank = TodoRepository._apply_filters(select(Todo), shape)
+
+        # Apply sorting (id breaks ties so the order is total and resumable)
+        descending = shape.descending
+        if shape.sort_by == SortBy.RELEVANCE:
+            rank = rank.label("rank")
+            sort_column = None
+            query = filtered.order_by(
+                *TodoRepository._rank_order_by(rank, Todo.id, descending=descending),
+            )
+        else:
+            sort_column = getattr(Todo, shape.sort_by.value)
+            query = filtered.order_by(
+                *keyset_order_by(sort_column, Todo.id, descending=descending),
+            )
 
-        if filters.search is not None:
-            search_term = f"%{filters.search}%"
+        last_id = bindparam("cursor_id", type_=Integer)
+        if shape.cursor == "id":
+            # The priority filter pins the sort value, so the keyset reduces to id.
+            # PostgreSQL estimates (priority, id) < (:p, :id) from priority < :p
+            # alone (no rows), which would make every priority index look equally cheap.
+            query = query.where(Todo.id < last_id if descending else Todo.id > last_id)
+        elif shape.cursor is not None:
+            value = None
+            if shape.cursor == "value":
+                value = bindparam("cursor_value", type_=sort_column.type)
             query = query.where(
-                (Todo.title.ilike(search_term)) | (Todo.description.ilike(search_term)),
+                keyset_predicate(sort_column, Todo.id, value, last_id, descending=descending),
             )
+        else:
+            query = query.offset(bindparam("offset", type_=Integer))
+        query = query.limit(bindparam("limit", type_=Integer))
 
-        # Get total count before pagination
-        count_query = select(func.count()).select_from(query.subquery())
-        count_result = await self.session.execute(count_query)
-        total = count_result.scalar() or 0
+        fields = shape.fields
+        if not shape.joined_total:
+            if fields is not None:
+                query = query.options(load_only(*(getattr(Todo, name) for name in fields)))
+            return ListStatements(filtered=filtered, page=query)
 
-        # Apply sorting
-        sort_column = getattr(Todo, filters.sort_by.value, Todo.created_at)
-        if filters.sort_order.value.lower() == "asc":
-            query = query.order_by(sort_column.asc())
+        # totals LEFT JOIN page: the count row survives even when the page is empty
+        if fields is not None:
+            query = query.with_only_columns(*(getattr(Todo, name) for name in fields))
+        if sort_column is None:
+            query = query.add_columns(rank)
+        page = query.subquery("page")
+        todo = aliased(Todo, page)
+        totals = TodoRepository._count_query(filtered).subquery("totals")
+        if sort_column is None:
+            page_order = TodoRepository._rank_order_by(page.c.rank, todo.id, descending=descending)
         else:
-            query = query.order_by(sort_column.desc())
+            page_order = keyset_order_by(
+                getattr(todo, sort_column.key),
+                todo.id,
+                descending=descending,
+            )
+        stmt = (
+            select(todo, totals.c.total)
+            .select_from(totals.outerjoin(page, true()))
+            .order_by(*page_order)
+        )
+        if fields is not None:
+            stmt = stmt.options(load_only(*(getattr(todo, name) for name in fields)))
+        return ListStatements(filtered=filtered, page=stmt)
+
+    async def stream_filtered(
+        self,
+        filters: TodoFilters,
+        columns: Sequence[str],
+        *,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream every todo matching ``filters``, in their sort order, in batches.
 
-        # Apply pagination
-        query = query.offset(filters.offset).limit(filters.limit)
+        Filters, search and sort work as in ``list_filtered``, without
+        pagination. Only ``columns`` are selected, as plain rows rather than
+        ``Todo`` instances, and they are read from a server-side cursor
+        ``batch_size`` rows at a time (``yield_per``). So neither the
+        process nor the session's identity map ever holds more than one
+        batch, however many rows match.
 
-        # Execute query
-        result = await self.session.execute(query)
-        items = list(result.scalars().all())
+        The query starts before this method returns, so invalid filters and
+        database errors are raised here, not while iterating. The session
+        keeps its connection (and transaction) until the iterator is
+        exhausted or the session is closed.
+
+        Args:
+            filters: Filter, search and sort parameters
+            columns: Todo column names to select, in output order
+            batch_size: Rows fetched from the cursor per batch
+
+        Returns:
+            Async iterator over lists of up to ``batch_size`` rows
+
+        Raises:
+            ValidationError: If relevance sort is requested without a search term
+
+        Example:
+            batches = await repo.stream_filtered(TodoFilters(completed=False), ["id", "title"])
+            async for rows in batches:
+                for row in rows:
+                    print(row.id, row.title)
+        """
+        search, params = self._filter_params(filters)
+        shape = ListShape(
+            completed=filters.completed is not None,
+            priority=filters.priority is not None,
+            search_mode=None if search is None else filters.search_mode,
+            sort_by=filters.sort_by,
+            descending=filters.sort_order == SortOrder.DESC,
+            cursor=None,
+            fields=tuple(columns),
+            joined_total=False,
+        )
+        query, rank = self._apply_filters(select(*(getattr(Todo, name) for name in columns)), shape)
+        if shape.sort_by == SortBy.RELEVANCE:
+            order_by = self._rank_order_by(rank, Todo.id, descending=shape.descending)
+        else:
+            sort_column = getattr(Todo, shape.sort_by.value)
+            order_by = keyset_order_by(sort_column, Todo.id, descending=shape.descending)
+        result = await self.session.stream(
+            query.order_by(*order_by),
+            params,
+            execution_options={"yield_per": batch_size},
+        )
+        return result.partitions()
+
+    def _filter_params(self, filters: TodoFilters) -> tuple[str | None, dict[str, Any]]:
+        """Validate ``filters`` and collect their bind values.
+
+        Returns:
+            Tuple of (normalized search term or None, bind values for ``_apply_filters``)
+
+        Raises:
+            ValidationError: If relevance sort is requested without a search term
+        """
+        search = filters.search if filters.search is not None and filters.search.strip() else None
+        params: dict[str, Any] = {}
+        if filters.completed is not None:
+            params["completed"] = filters.completed
+        if filters.priority is not None:
+            params["priority"] = filters.priority
+        if search is not None:
+            params.update(self._search_params(search, filters.search_mode))
+        if filters.sort_by == SortBy.RELEVANCE and search is None:
+            msg = "sort_by=relevance requires a search term"
+            raise ValidationError(msg)
+        return search, params
+
+    @staticmethod
+    def _apply_filters(
+        query: Select, shape: ListShape
+    ) -> tuple[Select, ColumnElement[float] | None]:
+        """Add the ``completed``/``priority`` filters and search condition of ``shape``.
+
+        Returns:
+            Tuple of (restricted query, relevance expression, or None without search)
+        """
+        if shape.completed:
+            query = query.where(Todo.completed == bindparam("completed"))
+        if shape.priority:
+            query = query.where(Todo.priority == bindparam("priority"))
+        if shape.search_mode is None:
+            return query, None
+        return TodoRepository._apply_search(query, shape.search_mode)
+
+    @staticmethod
+    def _apply_search(filtered: Select, mode: SearchMode) -> tuple[Select, ColumnElement[float]]:
+        """Add the search condition for ``mode`` and build its relevance score.
+
+        The search input is bound as ``search`` (and, for substring matching,
+        the escaped ``ILIKE`` pattern as ``pattern``); see ``_search_params``.
+
+        Args:
+            filtered: Query to restrict
+            mode: Full-text, substring or fuzzy matching
+
+        Returns:
+            Tuple of (restricted query, relevance expression for ``sort_by=relevance``)
+        """
+        search = bindparam("search", type_=String)
+        if mode is SearchMode.FULLTEXT:
+            # Served by the GIN index on search_vector
+            ts_query = func.websearch_to_tsquery(literal(SEARCH_CONFIG, REGCONFIG), search)
+            return (
+                filtered.where(Todo.search_vector.op("@@")(ts_query)),
+                func.ts_rank(Todo.search_vector, ts_query),
+            )
+
+        # Trigram modes are served by the gin_trgm_ops indexes on title and description
+        score = func.greatest(
+            func.word_similarity(search, Todo.title),
+            func.word_similarity(search, func.coalesce(Todo.description, "")),
+        )
+        if mode is SearchMode.SUBSTRING:
+            pattern = bindparam("pattern", type_=String)
+            condition = or_(
+                Todo.title.ilike(pattern, escape="\\"),
+                Todo.description.ilike(pattern, escape="\\"),
+            )
+        else:
+            # "<%": some word-sized part of the column is similar to the input (typos allowed)
+            condition = or_(search.op("<%")(Todo.title), search.op("<%")(Todo.description))
+        return filtered.where(condition), score
+
+    @staticmethod
+    def _search_params(search: str, mode: SearchMode) -> dict[str, str]:
+        """Bind values for the search condition built by ``_apply_search``."""
+        if mode is SearchMode.SUBSTRING:
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return {"search": search, "pattern": f"%{escaped}%"}
+        return {"search": search}
 
-        return items, total
+    @staticmethod
+    def _rank_order_by(
+        rank: ColumnElement[float],
+        pk: ColumnElement[int],
+        *,
+        descending: bool,
+    ) -> list[ColumnElement]:
+        """Order by search rank, ``id`` breaking ties in the same direction."""
+        if descending:
+            return [rank.desc(), pk.desc()]
+        return [rank.asc(), pk.asc()]
@@ -2,16 +2,40 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, read_your_writes
+from app.core.routing import JSONBodyRoute, json_body
+from app.core.serialization import json_response
 
 from .repository import TodoRepository
-from .schemas import TodoCreate, TodoFilterParams, TodoListResponse, TodoResponse, TodoUpdate
+from .schemas import (
+    FileFormat,
+    TodoBulkCreate,
+    TodoBulkDelete,
+    TodoBulkResponse,
+    TodoBulkUpdate,
+    TodoCreate,
+    TodoExportParams,
+    TodoFieldsParams,
+    TodoFilterParams,
+    TodoImportParams,
+    TodoImportResponse,
+    TodoListResponse,
+    TodoResponse,
+    TodoUpdate,
+    todo_field_plan,
+)
 from .service import TodoService
 
-router = APIRouter(prefix="/api/v1/todos", tags=["todos"])
+router = APIRouter(
+    prefix="/api/v1/todos",
+    tags=["todos"],
+    dependencies=[Depends(read_your_writes)],
+    route_class=JSONBodyRoute,
+)
 
 
 def get_todo_service(db: Annotated[AsyncSession, Depends(get_db)]) -> TodoService:
@@ -20,13 +44,19 @@ def get_todo_service(db: Annotated[AsyncSession, Depends(get_db)]) -> TodoServic
     return TodoService(repository)
 
 
+def get_todo_read_service(db: Annotated[AsyncSession, Depends(get_read_db)]) -> TodoService:
+    """Dependency injection for TodoService on a read replica (read-only endpoints)."""
+    repository = TodoRepository(db)
+    return TodoService(repository)
+
+
 @router.post(
     "",
     status_code=status.HTTP_201_CREATED,
     summary="Create a new todo",
 )
 async def create_todo(
-    data: TodoCreate,
+    data: Annotated[TodoCreate, json_body(TodoCreate)],
     service: Annotated[TodoService, Depends(get_todo_service)],
 ) -> TodoResponse:
     return await service.create_todo(data)
@@ -36,35 +66,165 @@ async def create_todo(
     "",
     status_code=status.HTTP_200_OK,
     summary="List todos with filtering",
+    response_model=TodoListResponse,
 )
 async def list_todos(
-    service: Annotated[TodoService, Depends(get_todo_service)],
+    service: Annotated[TodoService, Depends(get_todo_read_service)],
     filters: Annotated[TodoFilterParams, Depends()],
-) -> TodoListResponse:
+) -> Response:
     """List todos with filtering, searching, and pagination.
 
-    Query: offset, limit, completed, priority, search, sort_by, sort_order
+    Query: offset, limit, completed, priority, search, search_mode, sort_by, sort_order,
+    cursor, count, fields
+
+    For deep pagination pass the previous response's ``next_cursor`` as
+    ``cursor`` instead of increasing ``offset``. When the exact ``total`` is
+    not needed, ``count=estimated`` or ``count=none`` (use ``has_more``)
+    avoids counting every matching row. ``fields=title,priority`` returns (and
+    loads) only those item fields plus ``id``.
     """
-    items, total = await service.list_todos(filters)
+    page = await service.list_todos(filters)
+    plan = todo_field_plan(filters.field_names)
+    # Rows go straight to JSON (see app.core.serialization); response_model documents the shape
+    return json_response(
+        {
+            "items": plan.rows(page.items),
+            "total": page.total,
+            "offset": filters.offset,
+            "limit": filters.limit,
+            "next_cursor": page.next_cursor,
+            "has_more": page.has_more,
+            "count_mode": page.count_mode,
+        },
+        plan.page_adapter(TodoListResponse),
+    )
+
 
-    return TodoListResponse(
-        items=[TodoResponse.model_validate(item) for item in items],
-        total=total,
-        offset=filters.offset,
-        limit=filters.limit,
+EXPORT_MEDIA_TYPES = {
+    FileFormat.NDJSON: "application/x-ndjson",
+    FileFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export todos as NDJSON or CSV",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export_todos(
+    service: Annotated[TodoService, Depends(get_todo_read_service)],
+    params: Annotated[TodoExportParams, Depends()],
+) -> StreamingResponse:
+    """Download every todo matching the filters, streamed from a server-side cursor.
+
+    Query: format (ndjson or csv), completed, priority, search, search_mode,
+    sort_by, sort_order, fields
+
+    Filters and sorting work as for the list endpoint, without pagination.
+    Rows are fetched and written in batches, so memory stays flat however
+    many todos match.
+    """
+    chunks = await service.export_todos(params)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[params.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="todos.{params.format.value}"',
+        },
     )
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many todos",
+)
+async def bulk_create_todos(
+    data: Annotated[TodoBulkCreate, json_body(TodoBulkCreate)],
+    service: Annotated[TodoService, Depends(get_todo_service)],
+) -> TodoBulkResponse:
+    """Create up to 1000 todos with one INSERT and one commit."""
+    return await service.bulk_create_todos(data)
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    summary="Import todos from NDJSON or CSV",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+        },
+    },
+)
+async def import_todos(
+    request: Request,
+    service: Annotated[TodoService, Depends(get_todo_service)],
+    params: Annotated[TodoImportParams, Depends()],
+) -> TodoImportResponse:
+    """Create todos from an uploaded NDJSON or CSV file, in one transaction.
+
+    Query: format (ndjson or csv)
+
+    The body is streamed: rows are validated and copied to the database in
+    batches as they arrive. Invalid rows are skipped and reported by line;
+    the export format can be imported as is. Also available from the
+    command line: ``python -m app.features.todos.cli import FILE``.
+    """
+    return await service.import_todos(request.stream(), params)
+
+
+@router.patch(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Update many todos",
+)
+async def bulk_update_todos(
+    data: Annotated[TodoBulkUpdate, json_body(TodoBulkUpdate)],
+    service: Annotated[TodoService, Depends(get_todo_service)],
+) -> TodoBulkResponse:
+    """Partially update up to 1000 todos in one transaction.
+
+    Each result reports "updated" or "not_found" for its item.
+    """
+    return await service.bulk_update_todos(data)
+
+
+@router.delete(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Delete many todos",
+)
+async def bulk_delete_todos(
+    data: Annotated[TodoBulkDelete, json_body(TodoBulkDelete)],
+    service: Annotated[TodoService, Depends(get_todo_service)],
+) -> TodoBulkResponse:
+    """Delete up to 1000 todos with one DELETE and one commit.
+
+    Each result reports "deleted" or "not_found" for its ID.
+    """
+    return await service.bulk_delete_todos(data)
+
+
 @router.get(
     "/{id}",
     status_code=status.HTTP_200_OK,
     summary="Get a todo by ID",
+    response_model=TodoResponse,
 )
 async def get_todo(
     id: int,
-    service: Annotated[TodoService, Depends(get_todo_service)],
-) -> TodoResponse:
-    return await service.get_todo(id)
+    service: Annotated[TodoService, Depends(get_todo_read_service)],
+    params: Annotated[TodoFieldsParams, Depends()],
+) -> Response:
+    """Get a todo; ``fields=title,priority`` returns (and loads) only those fields plus ``id``."""
+    fields = params.field_names
+    todo = await service.get_todo(id, fields)
+    plan = todo_field_plan(fields)
+    return json_response(plan.row(todo), plan.row_adapter)
 
 
 @router.patch(
@@ -74,7 +234,7 @@ async def get_todo(
 )
 async def update_todo(
     id: int,
-    data: TodoUpdate,
+    data: Annotated[TodoUpdate, json_body(TodoUpdate)],
     service: Annotated[TodoService, Depends(get_todo_service)],
 ) -> TodoResponse:
     """Partial update - only provided fields are updated."""
@@ -1,14 +1,24 @@
 """Pydantic schemas for todo API requests and responses."""
 
 from datetime import datetime
-from enum import Enum
+from enum import Enum, StrEnum
+from functools import cache
 
-from pydantic import ConfigDict, Field
+from pydantic import ConfigDict, Field, field_validator
 
 from app.core.base_schema import BaseSchema
+from app.core.exceptions import ValidationError
+from app.core.pagination import CountMode
+from app.core.serialization import FieldPlan
 
 from .models import PriorityEnum
 
+MAX_BULK_ITEMS = 1000
+"""Maximum number of items accepted by one bulk request (one transaction)."""
+
+MAX_IMPORT_ERRORS = 100
+"""Maximum number of rejected rows an import reports individually (all are counted)."""
+
 
 class TodoCreate(BaseSchema):
     """Schema for creating a new todo item.
@@ -72,20 +82,72 @@ class TodoResponse(BaseSchema):
     updated_at: datetime
 
 
+def parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Parse a comma-separated ``fields=`` value into TodoResponse field names.
+
+    ``id`` is always included. Order follows TodoResponse, so equal sets of
+    fields give equal tuples.
+
+    Args:
+        fields: Raw query value, e.g. "title,priority,completed"; None or blank for all fields
+
+    Returns:
+        Field names to load and return, or None for every field
+
+    Raises:
+        ValidationError: If a name is not a TodoResponse field
+    """
+    if fields is None or not fields.strip():
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - TodoResponse.model_fields.keys()
+    if unknown:
+        msg = (
+            f"Unknown field(s) {', '.join(sorted(unknown))}; "
+            f"available: {', '.join(TodoResponse.model_fields)}"
+        )
+        raise ValidationError(msg)
+    return tuple(name for name in TodoResponse.model_fields if name == "id" or name in requested)
+
+
+@cache
+def todo_field_plan(fields: tuple[str, ...] | None = None) -> FieldPlan:
+    """Build (once per field set) the plan serializing Todo rows as TodoResponse items.
+
+    Rows from the database already have TodoResponse's types, so endpoints
+    encode them with this plan and ``json_response`` instead of validating
+    a TodoResponse per row (see ``app.core.serialization``).
+
+    Args:
+        fields: Field names as returned by ``parse_fields``; None for every field
+
+    Returns:
+        Plan reading those attributes, in TodoResponse order (use
+        ``plan.page_adapter(TodoListResponse)`` to encode a list page)
+    """
+    return FieldPlan(TodoResponse, fields)
+
+
 class TodoListResponse(BaseSchema):
     """Schema for paginated todo list response.
 
     Attributes:
         items: List of todo items
-        total: Total count of items matching filters
+        total: Total count of items matching filters (estimated or None per ``count_mode``)
         offset: Current offset in the result set
         limit: Maximum number of items per page
+        next_cursor: Cursor for the next page (pass as ``cursor``), None on the last page
+        has_more: Whether more items follow this page
+        count_mode: How ``total`` was computed
     """
 
     items: list[TodoResponse]
-    total: int
+    total: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
+    has_more: bool = False
+    count_mode: CountMode = CountMode.EXACT
 
 
 class SortOrder(str, Enum):
@@ -102,25 +164,237 @@ class SortBy(str, Enum):
     DUE_DATE = "due_date"
     PRIORITY = "priority"
     TITLE = "title"
+    RELEVANCE = "relevance"
 
 
-class TodoFilterParams(BaseSchema):
-    """Schema for todo list filtering and pagination query parameters.
+class SearchMode(StrEnum):
+    """How the search term is matched against title and description."""
+
+    FULLTEXT = "fulltext"
+    SUBSTRING = "substring"
+    FUZZY = "fuzzy"
+
+
+class TodoFieldsParams(BaseSchema):
+    """Schema for the sparse fieldset query parameter.
+
+    Attributes:
+        fields: Comma-separated TodoResponse fields to return (id is always
+            included); all fields when omitted
+    """
+
+    fields: str | None = Field(
+        None,
+        description="Comma-separated fields to return, e.g. title,priority,completed",
+    )
+
+    @property
+    def field_names(self) -> tuple[str, ...] | None:
+        """Requested field names (see ``parse_fields``), or None for all fields."""
+        return parse_fields(self.fields)
+
+
+class TodoFilters(TodoFieldsParams):
+    """Schema for todo filter, search and sort query parameters (list and export).
 
     Attributes:
-        offset: Number of records to skip (default: 0)
-        limit: Maximum records to return (default: 100)
         completed: Filter by completion status
         priority: Filter by priority level
-        search: Search term for title and description
-        sort_by: Field to sort by (default: created_at)
+        search: Search term for title and description, matched per ``search_mode``
+        search_mode: fulltext (web search syntax: words, "quoted phrases", or,
+            -excluded), substring (fragments) or fuzzy (typos) (default: fulltext)
+        sort_by: Field to sort by (default: created_at); relevance ranks
+            search matches and requires ``search``
         sort_order: Sort direction (default: desc)
+        fields: Comma-separated fields to return for each item (see TodoFieldsParams)
     """
 
-    offset: int = Field(0, ge=0, description="Number of records to skip")
-    limit: int = Field(100, ge=1, le=1000, description="Maximum records to return")
     completed: bool | None = Field(None, description="Filter by completion status")
     priority: PriorityEnum | None = Field(None, description="Filter by priority level")
-    search: str | None = Field(None, description="Search term for title and description")
+    search: str | None = Field(
+        None,
+        description='Search term for title and description, e.g. "weekly report" -draft',
+    )
+    search_mode: SearchMode = Field(
+        SearchMode.FULLTEXT,
+        description="fulltext (words and phrases), substring (fragments) or fuzzy (typos)",
+    )
     sort_by: SortBy = Field(SortBy.CREATED_AT, description="Field to sort by")
     sort_order: SortOrder = Field(SortOrder.DESC, description="Sort direction")
+
+
+class TodoFilterParams(TodoFilters):
+    """Schema for todo list filtering and pagination query parameters.
+
+    Attributes:
+        offset: Number of records to skip (default: 0)
+        limit: Maximum records to return (default: 100)
+        cursor: Keyset pagination cursor from a previous ``next_cursor``;
+            pages from there instead of skipping ``offset`` rows
+        count: How to compute ``total``: exact, estimated or none (default: exact)
+        (filters, search, sort and fields as in TodoFilters)
+    """
+
+    offset: int = Field(0, ge=0, description="Number of records to skip")
+    limit: int = Field(100, ge=1, le=1000, description="Maximum records to return")
+    cursor: str | None = Field(
+        None,
+        description="Cursor from a previous next_cursor (cannot be combined with offset)",
+    )
+    count: CountMode = Field(
+        CountMode.EXACT,
+        description="Total count strategy: exact, estimated (planner estimate) or none",
+    )
+
+
+class FileFormat(StrEnum):
+    """File format of a todo export or import."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TodoExportParams(TodoFilters):
+    """Schema for todo export query parameters.
+
+    Attributes:
+        format: ndjson (one JSON object per line) or csv (header row first)
+        (filters, search, sort and fields as in TodoFilters)
+    """
+
+    format: FileFormat = Field(FileFormat.NDJSON, description="ndjson or csv")
+
+
+class TodoImportParams(BaseSchema):
+    """Schema for todo import query parameters.
+
+    Attributes:
+        format: ndjson (one JSON object per line) or csv (header row first)
+    """
+
+    format: FileFormat = Field(FileFormat.NDJSON, description="ndjson or csv")
+
+
+class TodoImportRow(TodoCreate):
+    """Schema for one imported todo: a TodoCreate plus its historical state.
+
+    Other fields (``id``, ``updated_at``, ...) are ignored, so an export can
+    be imported again.
+
+    Attributes:
+        completed: Completion status (default: false)
+        created_at: Original creation time; the import time when omitted
+    """
+
+    completed: bool = Field(default=False, description="Completion status")
+    created_at: datetime | None = Field(None, description="Original creation time")
+
+
+class TodoImportRowError(BaseSchema):
+    """Schema for a rejected import row.
+
+    Attributes:
+        line: Line of the input the row starts on (1-based)
+        errors: Validation errors, e.g. "title: Field required"
+    """
+
+    line: int
+    errors: list[str]
+
+
+class TodoImportResponse(BaseSchema):
+    """Schema for the result of an import.
+
+    Attributes:
+        imported: Rows created
+        failed: Rows rejected
+        errors: The first MAX_IMPORT_ERRORS rejected rows and why
+    """
+
+    imported: int
+    failed: int
+    errors: list[TodoImportRowError]
+
+
+class TodoBulkCreate(BaseSchema):
+    """Schema for creating many todo items in one transaction.
+
+    Attributes:
+        items: Todo items to create
+    """
+
+    items: list[TodoCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TodoBulkUpdateItem(TodoUpdate):
+    """Schema for one partial update inside a bulk update.
+
+    Attributes:
+        id: Identifier of the todo to update (other fields as in TodoUpdate)
+    """
+
+    id: int
+
+    @field_validator("title", "completed", "priority")
+    @classmethod
+    def _not_null(cls, value: object) -> object:
+        """Reject an explicit null for a NOT NULL column (omit the field to keep it)."""
+        if value is None:
+            msg = "may be omitted but not null"
+            raise ValueError(msg)
+        return value
+
+
+class TodoBulkUpdate(BaseSchema):
+    """Schema for updating many todo items in one transaction.
+
+    Attributes:
+        items: Partial updates, each identifying its todo by ID
+    """
+
+    items: list[TodoBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TodoBulkDelete(BaseSchema):
+    """Schema for deleting many todo items in one transaction.
+
+    Attributes:
+        ids: Identifiers of the todos to delete
+    """
+
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkItemStatus(StrEnum):
+    """Outcome of a single item in a bulk request."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+class TodoBulkItemResult(BaseSchema):
+    """Schema for the outcome of one item in a bulk request.
+
+    Attributes:
+        index: Position of the item in the request
+        id: Todo identifier
+        status: What happened to the item
+        item: Resulting todo for created/updated items
+    """
+
+    index: int
+    id: int
+    status: BulkItemStatus
+    item: TodoResponse | None = None
+
+
+class TodoBulkResponse(BaseSchema):
+    """Schema for bulk request response.
+
+    Attributes:
+        results: One result per request item, in request order
+    """
+
+    results: list[TodoBulkItemResult]
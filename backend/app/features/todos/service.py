@@ -1,10 +1,57 @@
 """Business logic for todo operations."""
 
-from app.core.exceptions import NotFoundError
+import codecs
+import csv
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+from datetime import UTC, datetime
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import Page
+from app.core.serialization import FieldPlan
+from app.core.unit_of_work import unit_of_work
 
 from .models import Todo
 from .repository import TodoRepository
-from .schemas import TodoCreate, TodoFilterParams, TodoUpdate
+from .schemas import (
+    MAX_IMPORT_ERRORS,
+    BulkItemStatus,
+    FileFormat,
+    TodoBulkCreate,
+    TodoBulkDelete,
+    TodoBulkItemResult,
+    TodoBulkResponse,
+    TodoBulkUpdate,
+    TodoCreate,
+    TodoExportParams,
+    TodoFilterParams,
+    TodoImportParams,
+    TodoImportResponse,
+    TodoImportRow,
+    TodoImportRowError,
+    TodoResponse,
+    TodoUpdate,
+    todo_field_plan,
+)
+
+IMPORT_BATCH_SIZE = 5000
+"""Rows validated and copied per batch by ``TodoService.import_todos``."""
+
+IMPORT_COLUMNS = (
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "due_date",
+    "created_at",
+    "updated_at",
+)
+"""Todo columns written by an import (``id`` comes from the table's sequence)."""
 
 
 class TodoService:
@@ -13,31 +60,290 @@ class TodoService:
     def __init__(self, repository: TodoRepository) -> None:
         self.repository = repository
 
+    def transaction(self) -> AbstractAsyncContextManager[AsyncSession]:
+        """Group the service calls made inside the block into one transaction.
+
+        Example:
+            async with service.transaction():
+                await service.create_todo(first)
+                await service.update_todo(other_id, changes)
+            # Both writes are committed together, or neither is
+        """
+        return unit_of_work(self.repository.session)
+
     async def create_todo(self, data: TodoCreate) -> Todo:
         """Create a new todo item."""
         todo_dict = data.model_dump()
         return await self.repository.create(todo_dict)
 
-    async def get_todo(self, id: int) -> Todo:
-        """Retrieve a todo by ID, raises NotFoundError if not found."""
-        todo = await self.repository.get_by_id(id)
+    async def get_todo(self, id: int, fields: tuple[str, ...] | None = None) -> Todo:
+        """Retrieve a todo by ID (only ``fields`` if given), raises NotFoundError if not found."""
+        todo = await self.repository.get_by_id(id, fields=fields)
         if not todo:
             msg = f"Todo with ID {id} not found"
             raise NotFoundError(msg)
         return todo
 
-    async def list_todos(self, filters: TodoFilterParams) -> tuple[list[Todo], int]:
+    async def list_todos(self, filters: TodoFilterParams) -> Page[Todo]:
         """Retrieve filtered and paginated list of todos."""
-        items, total = await self.repository.list_filtered(filters)
-        return list(items), total
+        return await self.repository.list_filtered(filters)
+
+    async def export_todos(self, params: TodoExportParams) -> AsyncIterator[bytes]:
+        """Export every todo matching ``params`` as NDJSON or CSV, one chunk per batch.
+
+        Rows stream from ``TodoRepository.stream_filtered`` and each batch is
+        encoded as it arrives, so memory stays flat regardless of how many
+        rows match. Items have the same fields and JSON representation as
+        ``TodoResponse`` (only ``params.fields`` if given); CSV starts with a
+        header row of the field names.
+
+        The query starts before this returns, so invalid parameters raise
+        here rather than midway through a response.
+
+        Raises:
+            ValidationError: If ``fields`` names unknown fields, or relevance
+                sort is requested without a search term
+        """
+        fields = params.field_names
+        batches = await self.repository.stream_filtered(params, todo_field_plan(fields).fields)
+        if params.format is FileFormat.CSV:
+            return _csv_chunks(batches, todo_field_plan(fields))
+        return _ndjson_chunks(batches, todo_field_plan(fields))
+
+    async def import_todos(
+        self,
+        chunks: AsyncIterable[bytes],
+        params: TodoImportParams,
+    ) -> TodoImportResponse:
+        """Import todos from an NDJSON or CSV byte stream in one transaction.
+
+        The input is read and validated against ``TodoImportRow`` in batches
+        of ``IMPORT_BATCH_SIZE`` rows, which are copied into a staging table
+        as they come (see ``BaseRepository.bulk_loader``) and merged into
+        ``todos`` at the end. Invalid rows are counted and reported (the
+        first ``MAX_IMPORT_ERRORS``) without stopping the load; the valid
+        rows are committed together.
+
+        NDJSON holds one JSON object per line; CSV starts with a header row
+        naming the fields, and empty cells count as missing. Blank lines are
+        skipped. Fields an export adds (``id``, ``updated_at``) are ignored.
+
+        Args:
+            chunks: UTF-8 encoded input, in chunks of any size
+            params: Input format
+
+        Returns:
+            Rows imported and rejected, with the first rejections' errors
+
+        Raises:
+            ValidationError: If the input is not valid UTF-8 (nothing is imported)
+        """
+        now = datetime.now(UTC)
+        is_csv = params.format is FileFormat.CSV
+        records = _records(chunks, quoted=is_csv)
+        parse = _parse_ndjson
+        if is_csv:
+            header = await anext(records, None)
+            parse = _csv_parser(header[1] if header else "")
+
+        failed = 0
+        errors: list[TodoImportRowError] = []
+        async with self.transaction():
+            loader = await self.repository.bulk_loader(IMPORT_COLUMNS)
+            async for batch in _batched(records, IMPORT_BATCH_SIZE):
+                rows = []
+                for line, record in batch:
+                    try:
+                        row = parse(record).model_dump()
+                    except ValueError as exc:
+                        failed += 1
+                        if len(errors) < MAX_IMPORT_ERRORS:
+                            errors.append(TodoImportRowError(line=line, errors=_messages(exc)))
+                        continue
+                    row["created_at"] = row["created_at"] or now
+                    row["updated_at"] = now
+                    rows.append(row)
+                await loader.copy(rows)
+            imported = await loader.merge()
+        return TodoImportResponse(imported=imported, failed=failed, errors=errors)
 
     async def update_todo(self, id: int, data: TodoUpdate) -> Todo:
         """Update an existing todo (partial update, raises NotFoundError if not found)."""
-        todo = await self.get_todo(id)
         update_dict = data.model_dump(exclude_unset=True)
-        return await self.repository.update(todo, update_dict)
+        return await self.repository.update_by_id(id, update_dict)
 
     async def delete_todo(self, id: int) -> None:
         """Delete a todo (raises NotFoundError if not found)."""
-        todo = await self.get_todo(id)
-        await self.repository.delete(todo)
+        await self.repository.delete_by_id(id)
+
+    async def bulk_create_todos(self, data: TodoBulkCreate) -> TodoBulkResponse:
+        """Create many todos in one transaction."""
+        todos = await self.repository.create_many([item.model_dump() for item in data.items])
+        return TodoBulkResponse(
+            results=[
+                TodoBulkItemResult(
+                    index=index,
+                    id=todo.id,
+                    status=BulkItemStatus.CREATED,
+                    item=TodoResponse.model_validate(todo),
+                )
+                for index, todo in enumerate(todos)
+            ],
+        )
+
+    async def bulk_update_todos(self, data: TodoBulkUpdate) -> TodoBulkResponse:
+        """Update many todos in one transaction (missing IDs are reported, not raised)."""
+        ids = [item.id for item in data.items]
+        if len(set(ids)) != len(ids):
+            msg = "Each todo ID may appear only once in a bulk update"
+            raise ValidationError(msg)
+
+        rows = [item.model_dump(exclude_unset=True) for item in data.items]
+        updated = {todo.id: todo for todo in await self.repository.update_many(rows)}
+        results = []
+        for index, item in enumerate(data.items):
+            todo = updated.get(item.id)
+            if todo is None:
+                results.append(
+                    TodoBulkItemResult(index=index, id=item.id, status=BulkItemStatus.NOT_FOUND),
+                )
+            else:
+                results.append(
+                    TodoBulkItemResult(
+                        index=index,
+                        id=item.id,
+                        status=BulkItemStatus.UPDATED,
+                        item=TodoResponse.model_validate(todo),
+                    ),
+                )
+        return TodoBulkResponse(results=results)
+
+    async def bulk_delete_todos(self, data: TodoBulkDelete) -> TodoBulkResponse:
+        """Delete many todos in one transaction (missing IDs are reported, not raised)."""
+        deleted = set(await self.repository.delete_many(data.ids))
+        return TodoBulkResponse(
+            results=[
+                TodoBulkItemResult(
+                    index=index,
+                    id=id,
+                    status=BulkItemStatus.DELETED if id in deleted else BulkItemStatus.NOT_FOUND,
+                )
+                for index, id in enumerate(data.ids)
+            ],
+        )
+
+
+async def _ndjson_chunks(
+    batches: AsyncIterator[Sequence[Row]],
+    plan: FieldPlan,
+) -> AsyncIterator[bytes]:
+    """Encode each batch of rows as newline-delimited JSON objects."""
+    adapter = plan.row_adapter
+    async for rows in batches:
+        yield b"".join([adapter.dump_json(item) + b"\n" for item in plan.rows(rows)])
+
+
+async def _csv_chunks(
+    batches: AsyncIterator[Sequence[Row]],
+    plan: FieldPlan,
+) -> AsyncIterator[bytes]:
+    """Encode a header row, then each batch of rows, as CSV (JSON-style values)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(plan.fields)
+    yield buffer.getvalue().encode()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        items = plan.rows_adapter.dump_python(plan.rows(rows), mode="json")
+        writer.writerows(item.values() for item in items)
+        yield buffer.getvalue().encode()
+
+
+async def _records(chunks: AsyncIterable[bytes], *, quoted: bool) -> AsyncIterator[tuple[int, str]]:
+    """Split UTF-8 input into (line number, record) pairs, skipping blank lines.
+
+    A record is one line, or with ``quoted`` (CSV) as many lines as it takes
+    to close every double-quoted field.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    line_number = 0
+    start = 0
+    pending: list[str] = []
+    quotes = 0
+    tail = ""
+    done = False
+    iterator = aiter(chunks)
+    while not done:
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            chunk, done = b"", True
+        try:
+            text = tail + decoder.decode(chunk, final=done)
+        except UnicodeDecodeError as exc:
+            msg = f"Import is not valid UTF-8 (line {line_number + 1}: {exc.reason})"
+            raise ValidationError(msg) from exc
+        lines = text.split("\n")
+        tail = "" if done else lines.pop()
+        for line in lines:
+            line_number += 1
+            if not pending:
+                start = line_number
+            pending.append(line.removesuffix("\r"))
+            if quoted:
+                quotes += line.count('"')
+                if quotes % 2:
+                    continue
+            record = "\n".join(pending)
+            pending.clear()
+            quotes = 0
+            if record.strip():
+                yield start, record
+    if pending and (record := "\n".join(pending)).strip():
+        yield start, record  # Unterminated quote; rejected when parsed
+
+
+async def _batched[T](items: AsyncIterator[T], size: int) -> AsyncIterator[list[T]]:
+    """Group ``items`` into lists of up to ``size``."""
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_ndjson(record: str) -> TodoImportRow:
+    return TodoImportRow.model_validate_json(record)
+
+
+def _csv_parser(header: str) -> Callable[[str], TodoImportRow]:
+    """Return a function validating one CSV record against ``header`` (a CSV row of names)."""
+    names = [name.strip() for name in next(csv.reader([header]), [])]
+
+    def parse(record: str) -> TodoImportRow:
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as exc:
+            raise ValueError(str(exc)) from exc
+        if len(values) > len(names):
+            msg = f"Expected at most {len(names)} values, got {len(values)}"
+            raise ValueError(msg)
+        return TodoImportRow.model_validate(
+            {name: value for name, value in zip(names, values, strict=False) if value != ""},
+        )
+
+    return parse
+
+
+def _messages(exc: ValueError) -> list[str]:
+    """Turn a row's parse or validation error into messages like "title: Field required"."""
+    if not isinstance(exc, PydanticValidationError):
+        return [str(exc)]
+    return [
+        f"{'.'.join(map(str, error['loc']))}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors(include_url=False)
+    ]
@@ -1,13 +1,25 @@
 """Unit tests for TodoService."""
 
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.pagination import Page
 from app.features.todos.models import PriorityEnum, Todo
-from app.features.todos.schemas import TodoCreate, TodoFilterParams, TodoUpdate
+from app.features.todos.schemas import (
+    BulkItemStatus,
+    FileFormat,
+    TodoBulkCreate,
+    TodoBulkDelete,
+    TodoBulkUpdate,
+    TodoBulkUpdateItem,
+    TodoCreate,
+    TodoFilterParams,
+    TodoImportParams,
+    TodoUpdate,
+)
 
 
 @pytest.mark.asyncio()
@@ -41,7 +53,7 @@ async def test_get_todo_success(todo_service, mock_repository, sample_todo):
     result = await todo_service.get_todo(1)
 
     # Assert
-    mock_repository.get_by_id.assert_called_once_with(1)
+    mock_repository.get_by_id.assert_called_once_with(1, fields=None)
     assert result == sample_todo
 
 
@@ -56,7 +68,7 @@ async def test_get_todo_not_found(todo_service, mock_repository):
         await todo_service.get_todo(999)
 
     assert "999" in str(exc_info.value)
-    mock_repository.get_by_id.assert_called_once_with(999)
+    mock_repository.get_by_id.assert_called_once_with(999, fields=None)
 
 
 @pytest.mark.asyncio()
@@ -67,7 +79,7 @@ async def test_list_todos(todo_service, mock_repository, sample_todo):
 
     todos = [sample_todo]
     total = 1
-    mock_repository.list_filtered = AsyncMock(return_value=(todos, total))
+    mock_repository.list_filtered = AsyncMock(return_value=Page(items=todos, total=total))
 
     filters = TodoFilterParams(
         offset=0,
@@ -80,17 +92,18 @@ async def test_list_todos(todo_service, mock_repository, sample_todo):
     )
 
     # Act
-    result_items, result_total = await todo_service.list_todos(filters)
+    result = await todo_service.list_todos(filters)
 
     # Assert
     mock_repository.list_filtered.assert_called_once_with(filters)
-    assert result_items == todos
-    assert result_total == total
+    assert result.items == todos
+    assert result.total == total
+    assert result.next_cursor is None
 
 
 @pytest.mark.asyncio()
 async def test_update_todo_success(todo_service, mock_repository, sample_todo):
-    """Test updating an existing todo."""
+    """Test updating an existing todo writes by ID without reading it first."""
     # Arrange
     updated_todo = Todo(
         id=1,
@@ -103,7 +116,7 @@ async def test_update_todo_success(todo_service, mock_repository, sample_todo):
         updated_at=datetime(2025, 10, 19, 11, 0, 0, tzinfo=UTC),
     )
     mock_repository.get_by_id = AsyncMock(return_value=sample_todo)
-    mock_repository.update = AsyncMock(return_value=updated_todo)
+    mock_repository.update_by_id = AsyncMock(return_value=updated_todo)
 
     update_data = TodoUpdate(completed=True)
 
@@ -111,8 +124,8 @@ async def test_update_todo_success(todo_service, mock_repository, sample_todo):
     result = await todo_service.update_todo(1, update_data)
 
     # Assert
-    mock_repository.get_by_id.assert_called_once_with(1)
-    mock_repository.update.assert_called_once()
+    mock_repository.update_by_id.assert_called_once_with(1, {"completed": True})
+    mock_repository.get_by_id.assert_not_called()
     assert result.completed is True
 
 
@@ -120,7 +133,9 @@ async def test_update_todo_success(todo_service, mock_repository, sample_todo):
 async def test_update_todo_not_found(todo_service, mock_repository):
     """Test updating a non-existent todo raises NotFoundError."""
     # Arrange
-    mock_repository.get_by_id = AsyncMock(return_value=None)
+    mock_repository.update_by_id = AsyncMock(
+        side_effect=NotFoundError("Todo with ID 999 not found"),
+    )
     update_data = TodoUpdate(completed=True)
 
     # Act & Assert
@@ -128,46 +143,45 @@ async def test_update_todo_not_found(todo_service, mock_repository):
         await todo_service.update_todo(999, update_data)
 
     assert "999" in str(exc_info.value)
-    mock_repository.get_by_id.assert_called_once_with(999)
-    mock_repository.update.assert_not_called()
+    mock_repository.update_by_id.assert_called_once_with(999, {"completed": True})
 
 
 @pytest.mark.asyncio()
-async def test_delete_todo_success(todo_service, mock_repository, sample_todo):
-    """Test deleting an existing todo."""
+async def test_delete_todo_success(todo_service, mock_repository):
+    """Test deleting an existing todo deletes by ID without reading it first."""
     # Arrange
-    mock_repository.get_by_id = AsyncMock(return_value=sample_todo)
-    mock_repository.delete = AsyncMock()
+    mock_repository.get_by_id = AsyncMock()
+    mock_repository.delete_by_id = AsyncMock()
 
     # Act
     await todo_service.delete_todo(1)
 
     # Assert
-    mock_repository.get_by_id.assert_called_once_with(1)
-    mock_repository.delete.assert_called_once_with(sample_todo)
+    mock_repository.delete_by_id.assert_called_once_with(1)
+    mock_repository.get_by_id.assert_not_called()
 
 
 @pytest.mark.asyncio()
 async def test_delete_todo_not_found(todo_service, mock_repository):
     """Test deleting a non-existent todo raises NotFoundError."""
     # Arrange
-    mock_repository.get_by_id = AsyncMock(return_value=None)
+    mock_repository.delete_by_id = AsyncMock(
+        side_effect=NotFoundError("Todo with ID 999 not found"),
+    )
 
     # Act & Assert
     with pytest.raises(NotFoundError) as exc_info:
         await todo_service.delete_todo(999)
 
     assert "999" in str(exc_info.value)
-    mock_repository.get_by_id.assert_called_once_with(999)
-    mock_repository.delete.assert_not_called()
+    mock_repository.delete_by_id.assert_called_once_with(999)
 
 
 @pytest.mark.asyncio()
 async def test_update_todo_partial(todo_service, mock_repository, sample_todo):
     """Test partial update only updates provided fields."""
     # Arrange
-    mock_repository.get_by_id = AsyncMock(return_value=sample_todo)
-    mock_repository.update = AsyncMock(return_value=sample_todo)
+    mock_repository.update_by_id = AsyncMock(return_value=sample_todo)
 
     # Only update title, leave other fields unchanged
     update_data = TodoUpdate(title="Updated Title")
@@ -176,9 +190,172 @@ async def test_update_todo_partial(todo_service, mock_repository, sample_todo):
     await todo_service.update_todo(1, update_data)
 
     # Assert
-    call_args = mock_repository.update.call_args
+    call_args = mock_repository.update_by_id.call_args
     update_dict = call_args[0][1]
     # Only title should be in the update dict
     assert "title" in update_dict
     assert "completed" not in update_dict
     assert "priority" not in update_dict
+
+
+@pytest.mark.asyncio()
+async def test_bulk_create_todos(todo_service, mock_repository, todo_factory):
+    """Test bulk create reports every created todo in request order."""
+    # Arrange
+    created = [todo_factory.create_todo(id=1), todo_factory.create_todo(id=2, title="Second")]
+    mock_repository.create_many = AsyncMock(return_value=created)
+    data = TodoBulkCreate(items=[TodoCreate(title="Test Todo"), TodoCreate(title="Second")])
+
+    # Act
+    result = await todo_service.bulk_create_todos(data)
+
+    # Assert
+    mock_repository.create_many.assert_called_once()
+    assert [r.id for r in result.results] == [1, 2]
+    assert all(r.status == BulkItemStatus.CREATED for r in result.results)
+    assert result.results[1].item.title == "Second"
+
+
+@pytest.mark.asyncio()
+async def test_bulk_update_todos_reports_not_found(todo_service, mock_repository, sample_todo):
+    """Test bulk update marks IDs without a matching row as not_found."""
+    # Arrange
+    mock_repository.update_many = AsyncMock(return_value=[sample_todo])
+    data = TodoBulkUpdate(
+        items=[
+            TodoBulkUpdateItem(id=999, completed=True),
+            TodoBulkUpdateItem(id=1, title="Updated"),
+        ],
+    )
+
+    # Act
+    result = await todo_service.bulk_update_todos(data)
+
+    # Assert
+    rows = mock_repository.update_many.call_args[0][0]
+    assert rows == [{"id": 999, "completed": True}, {"id": 1, "title": "Updated"}]
+    assert [(r.index, r.id, r.status) for r in result.results] == [
+        (0, 999, BulkItemStatus.NOT_FOUND),
+        (1, 1, BulkItemStatus.UPDATED),
+    ]
+    assert result.results[0].item is None
+
+
+@pytest.mark.asyncio()
+async def test_bulk_update_todos_duplicate_ids(todo_service, mock_repository):
+    """Test bulk update rejects the same ID appearing twice."""
+    # Arrange
+    mock_repository.update_many = AsyncMock()
+    data = TodoBulkUpdate(
+        items=[TodoBulkUpdateItem(id=1, completed=True), TodoBulkUpdateItem(id=1, title="x")],
+    )
+
+    # Act & Assert
+    with pytest.raises(ValidationError):
+        await todo_service.bulk_update_todos(data)
+    mock_repository.update_many.assert_not_called()
+
+
+@pytest.mark.asyncio()
+async def test_bulk_delete_todos(todo_service, mock_repository):
+    """Test bulk delete reports deleted and missing IDs."""
+    # Arrange
+    mock_repository.delete_many = AsyncMock(return_value=[1, 3])
+
+    # Act
+    result = await todo_service.bulk_delete_todos(TodoBulkDelete(ids=[1, 2, 3]))
+
+    # Assert
+    mock_repository.delete_many.assert_called_once_with([1, 2, 3])
+    assert [r.status for r in result.results] == [
+        BulkItemStatus.DELETED,
+        BulkItemStatus.NOT_FOUND,
+        BulkItemStatus.DELETED,
+    ]
+
+
+def _mock_loader(mock_repository) -> MagicMock:
+    """Give the mock repository a bulk loader recording the copied rows."""
+    mock_repository.session = MagicMock(info={}, commit=AsyncMock(), rollback=AsyncMock())
+    loader = MagicMock(copied_rows=[])
+    loader.copy = AsyncMock(side_effect=loader.copied_rows.extend)
+    loader.merge = AsyncMock(side_effect=lambda: len(loader.copied_rows))
+    mock_repository.bulk_loader = AsyncMock(return_value=loader)
+    return loader
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+async def test_import_todos_ndjson_reports_row_errors(todo_service, mock_repository, chunk_size):
+    """Test NDJSON import copies valid rows and reports invalid ones by line."""
+    # Arrange
+    loader = _mock_loader(mock_repository)
+    data = (
+        '{"title": "Café ☕", "priority": "high"}\n'
+        "\n"
+        '{"priority": "high"}\n'
+        "not json\r\n"
+        '{"title": "Old", "completed": true, "created_at": "2020-01-01T00:00:00Z", "id": 9}'
+    ).encode()
+
+    # Act
+    result = await todo_service.import_todos(_chunks(data, chunk_size), TodoImportParams())
+
+    # Assert
+    assert (result.imported, result.failed) == (2, 2)
+    assert [(e.line, e.errors) for e in result.errors] == [
+        (3, ["title: Field required"]),
+        (4, [result.errors[1].errors[0]]),
+    ]
+    assert result.errors[1].errors[0].startswith("Invalid JSON")
+    first, old = loader.copied_rows
+    assert (first["title"], first["priority"]) == ("Café ☕", PriorityEnum.HIGH)
+    assert first["created_at"] == first["updated_at"]
+    assert (old["completed"], old["created_at"]) == (True, datetime(2020, 1, 1, tzinfo=UTC))
+    assert "id" not in old
+    mock_repository.session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio()
+async def test_import_todos_csv_quoted_fields(todo_service, mock_repository):
+    """Test CSV import maps the header, spans quoted newlines and treats empty cells as missing."""
+    # Arrange
+    loader = _mock_loader(mock_repository)
+    data = (
+        b"title, description,priority,due_date\r\n"
+        b'First,"two\nlines, ""quoted""",low,\r\n'
+        b"Second,,,2025-01-02T03:04:05Z\n"
+        b"Third,,,,extra\n"
+    )
+
+    # Act
+    result = await todo_service.import_todos(
+        _chunks(data, 5),
+        TodoImportParams(format=FileFormat.CSV),
+    )
+
+    # Assert
+    assert (result.imported, result.failed) == (2, 1)
+    assert result.errors[0].line == 5
+    first, second = loader.copied_rows
+    assert first["description"] == 'two\nlines, "quoted"'
+    assert (second["description"], second["priority"]) == (None, PriorityEnum.MEDIUM)
+    assert second["due_date"] == datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+
+@pytest.mark.asyncio()
+async def test_import_todos_invalid_utf8_rolls_back(todo_service, mock_repository):
+    """Test input that is not UTF-8 fails the whole import."""
+    # Arrange
+    _mock_loader(mock_repository)
+
+    # Act & Assert
+    with pytest.raises(ValidationError, match="UTF-8"):
+        await todo_service.import_todos(_chunks(b'{"title": "\xff"}\n', 4), TodoImportParams())
+    mock_repository.session.rollback.assert_awaited_once()
+    mock_repository.session.commit.assert_not_called()
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the backend.
+
+Each module is runnable on its own, e.g. ``uv run python -m benchmarks.list_count``.
+See ``benchmarks/README.md`` for details.
+"""
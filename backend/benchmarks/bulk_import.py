@@ -0,0 +1,114 @@
+"""Benchmark: import throughput, COPY + staging merge vs ORM inserts.
+
+Loads generated todos through ``TodoService.import_todos`` from NDJSON and
+CSV (validation, COPY into the staging table, one ``INSERT ... SELECT``),
+and compares with the paths it replaces: ``POST /api/v1/todos`` (one
+insert and commit per row, measured on a tenth of the rows) and
+``POST /api/v1/todos/bulk`` (``create_many``, 1000 rows per statement). All
+writes happen in the benchmark's transaction and are rolled back.
+
+Usage:
+    uv run python -m benchmarks.bulk_import --rows 200000 --repeat 3
+"""
+
+import asyncio
+import csv
+import io
+import json
+import time
+from collections.abc import AsyncIterator
+from itertools import batched
+
+from app.features.todos.repository import TodoRepository
+from app.features.todos.schemas import FileFormat, TodoCreate, TodoImportParams
+from app.features.todos.service import TodoService
+from benchmarks.common import WORDS, parse_args, seeded_session
+
+CHUNK_SIZE = 64 * 1024
+"""Bytes per chunk fed to the importer, about what a request body arrives in."""
+
+
+def generate(rows: int) -> list[dict]:
+    """Generate ``rows`` import rows with a mix of optional fields."""
+    priorities = ["low", "medium", "high"]
+    return [
+        {
+            "title": f"Imported {i} {WORDS[i % 20]}",
+            "description": f"{WORDS[(i * 7) % 20]} {WORDS[(i * 11) % 20]}" if i % 2 else None,
+            "priority": priorities[i % 3],
+            "completed": i % 3 == 0,
+            "due_date": None if i % 5 == 0 else f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T09:00:00Z",
+            "created_at": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00Z",
+        }
+        for i in range(rows)
+    ]
+
+
+def encode(rows: list[dict], file_format: FileFormat) -> bytes:
+    """Encode rows as NDJSON or CSV."""
+    if file_format is FileFormat.NDJSON:
+        return "".join(json.dumps(row) + "\n" for row in rows).encode()
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def chunked(data: bytes) -> AsyncIterator[bytes]:
+    """Yield ``data`` in ``CHUNK_SIZE`` pieces."""
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield data[start : start + CHUNK_SIZE]
+
+
+async def timed(label: str, rows: int, fn, *, repeat: int) -> None:
+    """Run ``fn`` ``repeat`` times and print the best rows/s."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<36} {rows:8d} rows   {best * 1000:9.1f} ms   {rows / best:10.0f} rows/s")
+
+
+async def main() -> None:
+    args = parse_args(__doc__.splitlines()[0], rows=200_000)
+    rows = generate(args.rows)
+    async with seeded_session(0) as session:
+        repository = TodoRepository(session)
+        service = TodoService(repository)
+        print(f"best of {args.repeat} runs")
+
+        for file_format in FileFormat:
+            data = encode(rows, file_format)
+
+            async def run(data=data, file_format=file_format) -> None:
+                result = await service.import_todos(
+                    chunked(data),
+                    TodoImportParams(format=file_format),
+                )
+                assert result.imported == len(rows), result  # noqa: S101
+
+            await timed(f"import_todos ({file_format.value})", len(rows), run, repeat=args.repeat)
+
+        items = [TodoCreate.model_validate(row).model_dump() for row in rows]
+
+        async def bulk() -> None:
+            for chunk in batched(items, 1000):
+                await repository.create_many(chunk)
+            session.expunge_all()
+
+        await timed("create_many, 1000 per statement", len(items), bulk, repeat=args.repeat)
+
+        few = items[: len(items) // 10]
+
+        async def one_by_one() -> None:
+            for item in few:
+                await repository.create(item)
+            session.expunge_all()
+
+        await timed("create, one per row", len(few), one_by_one, repeat=1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Shared helpers for benchmarks: seeded sessions, timing and reporting.
+
+Benchmarks that need data run against ``DATABASE_URL`` (migrated with
+``make migrate``). Rows are seeded inside a transaction that is rolled back
+at the end, the same isolation pattern as the ``db_session`` test fixture,
+so a benchmark never leaves data behind.
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.settings import settings
+
+WORDS = [
+    "report",
+    "invoice",
+    "meeting",
+    "urgent",
+    "review",
+    "deploy",
+    "backup",
+    "garden",
+    "groceries",
+    "dentist",
+    "budget",
+    "release",
+    "migrate",
+    "database",
+    "index",
+    "refactor",
+    "laptop",
+    "travel",
+    "booking",
+    "design",
+]
+"""Vocabulary for generated titles and descriptions (searchable by benchmarks)."""
+
+SEED_SQL = text(
+    """
+    INSERT INTO todos (title, description, completed, priority, due_date, created_at, updated_at)
+    SELECT
+        'Todo ' || g || ' ' || (:words)[1 + g % 20] || ' ' || (:words)[1 + (g / 20) % 20],
+        (:words)[1 + (g * 7) % 20] || ' ' || (:words)[1 + (g * 11) % 20] || ' '
+            || (:words)[1 + (g * 13) % 20] || ' ' || md5(g::text),
+        g % 3 = 0,
+        (ARRAY['LOW', 'MEDIUM', 'HIGH'])[1 + g % 3]::priorityenum,
+        CASE WHEN g % 5 = 0 THEN NULL ELSE now() + (g % 365) * interval '1 day' END,
+        now() - g * interval '1 second',
+        now()
+    FROM generate_series(1, :rows) AS g
+    """,
+).bindparams(bindparam("words", type_=ARRAY(String)))
+
+
+def parse_args(description: str, *, rows: int) -> argparse.Namespace:
+    """Parse the options shared by all benchmarks."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--rows", type=int, default=rows, help="Rows to seed")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per case")
+    return parser.parse_args()
+
+
+@asynccontextmanager
+async def seeded_session(rows: int) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session over ``rows`` freshly seeded todos, rolled back on exit."""
+    engine = create_async_engine(settings.database_url, echo=False)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.execute(SEED_SQL, {"rows": rows, "words": WORDS})
+        await connection.execute(text("ANALYZE todos"))
+        session = session_factory(bind=connection)
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+async def measure(fn: Callable[[], Awaitable[object]], *, repeat: int) -> list[float]:
+    """Call ``fn`` once to warm up, then ``repeat`` times; return durations in ms."""
+    await fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def report(label: str, durations: list[float]) -> float:
+    """Print median and p95 for a case and return the median."""
+    median = statistics.median(durations)
+    p95 = statistics.quantiles(durations, n=20)[-1] if len(durations) > 1 else median
+    print(f"{label:<48} median {median:8.3f} ms   p95 {p95:8.3f} ms")
+    return median
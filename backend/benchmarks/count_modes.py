@@ -0,0 +1,53 @@
+"""Benchmark: exact vs estimated vs no total for list pages.
+
+Runs ``TodoRepository.list_filtered`` with each ``CountMode`` for a plain
+listing, a filter, an ILIKE search and a deep offset. ``exact`` counts
+every matching row, ``estimated`` only plans the query (``EXPLAIN``), and
+``none`` fetches ``limit + 1`` rows to report ``has_more``. The estimated
+totals are printed next to the exact ones to show the estimate's error.
+
+Usage:
+    uv run python -m benchmarks.count_modes --rows 200000 --repeat 50
+"""
+
+import asyncio
+
+from app.core.pagination import CountMode
+from app.features.todos.repository import TodoRepository
+from app.features.todos.schemas import TodoFilterParams
+from benchmarks.common import measure, parse_args, report, seeded_session
+
+CASES = {
+    "first page": TodoFilterParams(limit=50),
+    "completed filter": TodoFilterParams(limit=50, completed=True),
+    "ILIKE search": TodoFilterParams(limit=50, search="urgent"),
+    "deep offset": TodoFilterParams(limit=50, offset=10_000),
+}
+
+
+async def main() -> None:
+    args = parse_args(__doc__.splitlines()[0], rows=200_000)
+    async with seeded_session(args.rows) as session:
+        repository = TodoRepository(session)
+        print(f"{args.rows} rows, {args.repeat} calls per case")
+        for name, filters in CASES.items():
+            exact = None
+            for mode in CountMode:
+                mode_filters = filters.model_copy(update={"count": mode})
+                median = report(
+                    f"{name}: count={mode.value}",
+                    await measure(
+                        lambda f=mode_filters: repository.list_filtered(f),
+                        repeat=args.repeat,
+                    ),
+                )
+                page = await repository.list_filtered(mode_filters)
+                if mode is CountMode.EXACT:
+                    exact = median
+                    print(f"{'':<48} total {page.total}")
+                elif exact is not None:
+                    print(f"{'':<48} total {page.total}, speedup {exact / median:5.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""Benchmark: streamed export vs loading every row up front, time and peak memory.
+
+Exports a third of the seeded rows (``completed=true``) and then all of
+them, as NDJSON and CSV, through ``TodoService.export_todos`` (server-side
+cursor, column rows, one chunk per batch) and through the buffered approach
+it replaces: load every matching ``Todo`` into the session, then serialize
+them all. Peak memory is measured with ``tracemalloc`` in a separate run
+from the timings, since tracing slows allocation down. The streamed peak
+should stay about the same at both sizes; the buffered one grows with the
+row count.
+
+Usage:
+    uv run python -m benchmarks.export --rows 100000 --repeat 5
+"""
+
+import asyncio
+import tracemalloc
+
+from sqlalchemy import select
+
+from app.features.todos.models import Todo
+from app.features.todos.repository import TodoRepository
+from app.features.todos.schemas import FileFormat, TodoExportParams, TodoResponse
+from app.features.todos.service import TodoService
+from benchmarks.common import measure, parse_args, report, seeded_session
+
+
+async def streamed(service: TodoService, params: TodoExportParams) -> int:
+    """Export through the service; return the bytes produced."""
+    return sum([len(chunk) async for chunk in await service.export_todos(params)])
+
+
+async def buffered(service: TodoService, params: TodoExportParams) -> int:
+    """Load every matching todo, then serialize them (NDJSON only); return the bytes."""
+    session = service.repository.session
+    query = select(Todo).order_by(Todo.created_at.desc(), Todo.id.desc())
+    if params.completed is not None:
+        query = query.where(Todo.completed == params.completed)
+    todos = (await session.scalars(query)).all()
+    body = "".join(f"{TodoResponse.model_validate(t).model_dump_json()}\n" for t in todos)
+    session.expunge_all()
+    return len(body.encode())
+
+
+async def peak_mib(fn) -> float:
+    """Run ``fn`` once under tracemalloc and return its peak allocation in MiB."""
+    tracemalloc.start()
+    try:
+        await fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+async def main() -> None:
+    args = parse_args(__doc__.splitlines()[0], rows=100_000)
+    async with seeded_session(args.rows) as session:
+        service = TodoService(TodoRepository(session))
+        print(f"{args.rows} rows, {args.repeat} calls per case")
+        for size, completed in (("1/3 of rows", True), ("all rows", None)):
+            cases = {
+                "buffered ndjson": (buffered, FileFormat.NDJSON),
+                "streamed ndjson": (streamed, FileFormat.NDJSON),
+                "streamed csv": (streamed, FileFormat.CSV),
+            }
+            for name, (export, fmt) in cases.items():
+                params = TodoExportParams(completed=completed, format=fmt)
+                report(
+                    f"{size}: {name}",
+                    await measure(lambda e=export, p=params: e(service, p), repeat=args.repeat),
+                )
+                peak = await peak_mib(lambda e=export, p=params: e(service, p))
+                size_mib = await export(service, params) / 2**20
+                print(f"{'':<48} peak {peak:7.1f} MiB   output {size_mib:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""Benchmark: list + total in two round trips vs one.
+
+Compares ``TodoRepository.list_filtered`` with ``single_query=False``
+(``SELECT count(*)`` then the page) and ``single_query=True`` (the count
+LEFT JOINed to the page in one statement) for a plain listing, an ILIKE
+search, a deep offset and a page past the end. The gap grows with the
+network round-trip time to the database; over a local socket it is small.
+
+Usage:
+    uv run python -m benchmarks.list_count --rows 200000 --repeat 50
+"""
+
+import asyncio
+
+from app.features.todos.repository import TodoRepository
+from app.features.todos.schemas import TodoFilterParams
+from benchmarks.common import measure, parse_args, report, seeded_session
+
+CASES = {
+    "first page": TodoFilterParams(limit=50),
+    "completed filter": TodoFilterParams(limit=50, completed=True),
+    "ILIKE search": TodoFilterParams(limit=50, search="urgent"),
+    "deep offset": TodoFilterParams(limit=50, offset=10_000),
+    "past the end": TodoFilterParams(limit=50, offset=10_000_000),
+}
+
+
+async def main() -> None:
+    args = parse_args(__doc__.splitlines()[0], rows=200_000)
+    async with seeded_session(args.rows) as session:
+        repository = TodoRepository(session)
+        print(f"{args.rows} rows, {args.repeat} calls per case")
+        for name, filters in CASES.items():
+            two = report(
+                f"{name}: two queries",
+                await measure(
+                    lambda f=filters: repository.list_filtered(f, single_query=False),
+                    repeat=args.repeat,
+                ),
+            )
+            one = report(
+                f"{name}: one query",
+                await measure(
+                    lambda f=filters: repository.list_filtered(f, single_query=True),
+                    repeat=args.repeat,
+                ),
+            )
+            print(f"{'':<48} speedup {two / one:5.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""Benchmark: per-request CPU to prepare list_filtered statements, rebuilt vs cached by shape.
+
+Before a statement reaches the database, the repository builds the
+``select()`` chain (filters, search, keyset order, pagination, joined
+total) and SQLAlchemy derives its cache key to find the compiled SQL. This
+measures both steps for a few common query shapes: once building the
+statements on every call (what ``list_filtered`` did before) and once
+through ``TodoRepository.list_statements``, the per-shape cache. A reused
+statement also skips the cache key walk, which SQLAlchemy memoizes on the
+statement object. No database is needed; the times are pure Python CPU
+per request.
+
+Usage:
+    uv run python -m benchmarks.list_statements --repeat 20000
+"""
+
+import argparse
+import statistics
+import time
+
+from app.core.pagination import CountMode
+from app.features.todos.repository import ListShape, TodoRepository
+from app.features.todos.schemas import SearchMode, SortBy
+
+SHAPES = {
+    "default page + total": ListShape(
+        completed=False,
+        priority=False,
+        search_mode=None,
+        sort_by=SortBy.CREATED_AT,
+        descending=True,
+        cursor=None,
+        fields=None,
+        joined_total=True,
+    ),
+    "filters + search + cursor": ListShape(
+        completed=True,
+        priority=True,
+        search_mode=SearchMode.FULLTEXT,
+        sort_by=SortBy.DUE_DATE,
+        descending=False,
+        cursor="value",
+        fields=None,
+        joined_total=True,
+    ),
+    f"fields, count={CountMode.NONE.value}": ListShape(
+        completed=True,
+        priority=False,
+        search_mode=None,
+        sort_by=SortBy.TITLE,
+        descending=False,
+        cursor=None,
+        fields=("id", "title", "completed"),
+        joined_total=False,
+    ),
+}
+
+
+def prepare(statements) -> None:
+    """Derive the page statement's cache key, the first step of ``Connection.execute``."""
+    statements.page._generate_cache_key()  # noqa: SLF001
+
+
+def per_call(fn, *, repeat: int) -> float:
+    """Call ``fn`` once to warm up, then ``repeat`` times; return the median in microseconds."""
+    fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20_000, help="Timed calls per case")
+    args = parser.parse_args()
+    build = TodoRepository.list_statements.__wrapped__
+    cached = TodoRepository.list_statements
+
+    print(f"{args.repeat} calls per case (build statements + SQLAlchemy cache key)")
+    for name, shape in SHAPES.items():
+        rebuilt = per_call(lambda s=shape: prepare(build(s)), repeat=args.repeat)
+        reused = per_call(lambda s=shape: prepare(cached(s)), repeat=args.repeat)
+        print(
+            f"{name:<28} rebuilt {rebuilt:8.1f} us   cached {reused:6.2f} us   "
+            f"saved {rebuilt - reused:8.1f} us/request",
+        )
+
+
+if __name__ == "__main__":
+    main()
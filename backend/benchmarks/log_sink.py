@@ -0,0 +1,102 @@
+"""Benchmark: request throughput with log lines written inline vs through the queue sink.
+
+Sends requests through ``RequestIDMiddleware`` (production settings: two
+JSON log lines per request) on the ``benchmarks.middleware`` app, with
+structlog writing to a temporary file and to a pipe read by another
+process (as stdout is under a container runtime or process manager):
+
+- inline: ``PrintLoggerFactory``, each line rendered and written on the
+  event loop (``LOG_QUEUE_SIZE=0``)
+- queue: ``QueueLogSink`` with the default queue and batch sizes, in both
+  overflow modes; its counters show lines written, dropped and the
+  average batch
+
+The sink is closed (buffer written and flushed) before each case's clock
+stops. No database is needed.
+
+Usage:
+    uv run python -m benchmarks.log_sink --requests 20000
+"""
+
+import argparse
+import asyncio
+import shutil
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TextIO
+
+import structlog
+
+from app.core.log_sink import QueueLogSink
+from app.core.middleware import RequestIDMiddleware, processors
+from app.core.settings import Environment, LogOverflow, settings
+from benchmarks.middleware import get, make_app
+
+
+async def run(path: str, requests: int, factory: Callable, *, close: Callable | None) -> float:
+    """Send ``requests`` requests with ``factory`` as logger factory; return requests/s."""
+    app = make_app(RequestIDMiddleware)
+    structlog.configure(logger_factory=factory)
+    await get(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await get(app, path)
+    if close is not None:
+        close()  # counted: the sink must catch up before the case ends
+    return requests / (time.perf_counter() - start)
+
+
+@contextmanager
+def temporary_file() -> Iterator[TextIO]:
+    """A temporary file on disk."""
+    with tempfile.TemporaryFile("w") as file:
+        yield file
+
+
+@contextmanager
+def pipe() -> Iterator[TextIO]:
+    """The write end of a pipe drained by a ``cat`` process."""
+    with subprocess.Popen(  # noqa: S603
+        [shutil.which("cat") or "/bin/cat"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+    ) as cat:
+        yield cat.stdin
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000, help="Requests per case")
+    args = parser.parse_args()
+    settings.environment = Environment.PRODUCTION
+    renderer = structlog.processors.JSONRenderer()
+
+    print(f"{args.requests} sequential requests per case, 2 JSON lines each")
+    for output in (temporary_file, pipe):
+        for path in ("/items", "/stream"):
+            label = f"{output.__name__:<14} GET {path:<8}"
+            with output() as file:
+                structlog.configure(processors=[*processors, renderer])
+                factory = structlog.PrintLoggerFactory(file=file)
+                inline = await run(path, args.requests, factory, close=None)
+            print(f"{label} inline          {inline:8,.0f} req/s")
+
+            structlog.configure(processors=processors)
+            for overflow in LogOverflow:
+                with output() as file:
+                    sink = QueueLogSink(renderer, file=file, overflow=overflow)
+                    rate = await run(path, args.requests, sink.logger_factory, close=sink.close)
+                stats = sink.stats
+                print(
+                    f"{label} queue ({overflow.value:<5})  {rate:8,.0f} req/s   "
+                    f"speedup {rate / inline:4.2f}x   written {stats.written}   "
+                    f"dropped {stats.dropped}   lines/batch {stats.written / stats.batches:5.1f}",
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
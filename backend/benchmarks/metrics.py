@@ -0,0 +1,185 @@
+"""Benchmark: cost of recording metrics, and of rendering ``/metrics`` across workers.
+
+- record: nanoseconds per ``Counter.inc`` and ``Histogram.observe`` (one
+  labelled series, as the request middleware records them), next to the
+  same updates behind a ``threading.Lock`` (how thread-safe client
+  libraries guard every sample), and per ``timed_call`` around a
+  repository-style coroutine vs calling it bare
+- render: time to serve ``/metrics`` with ``--routes`` routes recorded
+  (request count, latency and size histograms per route) in this process
+  and in ``--workers`` other workers' snapshot files (temporary
+  ``METRICS_DIR``)
+
+No database is needed.
+
+Usage:
+    uv run python -m benchmarks.metrics --ops 1000000 --routes 50 --workers 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from pathlib import Path
+
+from app.core.metrics import (
+    DURATION_BUCKETS,
+    SIZE_BUCKETS,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    timed_call,
+)
+
+
+class LockedCounter(Counter):
+    """Counter taking a lock per update."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class LockedHistogram(Histogram):
+    """Histogram taking a lock per observation."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        with self.lock:
+            sample = self.values.get(labels)
+            if sample is None:
+                sample = self.values[labels] = [0] * (len(self.buckets) + 2)
+            sample[bisect_left(self.buckets, value)] += 1
+            sample[-1] += value
+
+
+def per_op_ns(record: Callable[[], object], ops: int) -> float:
+    """Call ``record`` ``ops`` times; return nanoseconds per call."""
+    start = time.perf_counter()
+    for _ in range(ops):
+        record()
+    return (time.perf_counter() - start) / ops * 1e9
+
+
+class Repository:
+    """A repository method that does no I/O, bare and timed."""
+
+    async def bare(self) -> int:
+        return 1
+
+    @timed_call
+    async def timed(self) -> int:
+        return 1
+
+
+async def per_call_ns(call: Callable, ops: int) -> float:
+    """Await ``call()`` ``ops`` times; return nanoseconds per call."""
+    start = time.perf_counter()
+    for _ in range(ops):
+        await call()
+    return (time.perf_counter() - start) / ops * 1e9
+
+
+def http_registry() -> tuple[MetricsRegistry, Counter, Histogram, Histogram]:
+    """A registry with the request middleware's metrics."""
+    registry = MetricsRegistry()
+    labels = ("method", "route")
+    return (
+        registry,
+        registry.counter("http_requests_total", "Requests", (*labels, "status")),
+        registry.histogram("http_request_duration_seconds", "D", labels, buckets=DURATION_BUCKETS),
+        registry.histogram("http_response_size_bytes", "S", labels, buckets=SIZE_BUCKETS),
+    )
+
+
+def record_routes(routes: int, requests: int) -> MetricsRegistry:
+    """Registry with ``requests`` requests recorded on each of ``routes`` routes."""
+    registry, counter, duration, size = http_registry()
+    for route in range(routes):
+        labels = ("GET", f"/api/v1/items{route}/{{id}}")
+        for i in range(requests):
+            counter.inc((*labels, "200"))
+            duration.observe(0.001 * (i % 50), labels)
+            size.observe(100 * i, labels)
+    return registry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=1_000_000, help="Updates per recording case")
+    parser.add_argument("--routes", type=int, default=50, help="Routes recorded per process")
+    parser.add_argument("--workers", type=int, default=8, help="Other workers' snapshot files")
+    parser.add_argument("--renders", type=int, default=50, help="Renders timed per case")
+    args = parser.parse_args()
+
+    labels = ("GET", "/api/v1/todos/{id}")
+    counter = Counter("c_total", "C", ("method", "route", "status"))
+    locked_counter = LockedCounter("c_total", "C", ("method", "route", "status"))
+    histogram = Histogram("h", "H", ("method", "route"), buckets=DURATION_BUCKETS)
+    locked_histogram = LockedHistogram("h", "H", ("method", "route"), buckets=DURATION_BUCKETS)
+    status_labels = (*labels, "200")
+
+    print(f"record ({args.ops:,} updates per case)")
+    for name, plain, locked in (
+        (
+            "counter inc",
+            lambda: counter.inc(status_labels),
+            lambda: locked_counter.inc(status_labels),
+        ),
+        (
+            "histogram observe",
+            lambda: histogram.observe(0.042, labels),
+            lambda: locked_histogram.observe(0.042, labels),
+        ),
+    ):
+        plain_ns = per_op_ns(plain, args.ops)
+        locked_ns = per_op_ns(locked, args.ops)
+        print(f"  {name:<18} {plain_ns:6.0f} ns   with lock {locked_ns:6.0f} ns")
+
+    repository = Repository()
+    bare_ns = asyncio.run(per_call_ns(repository.bare, args.ops))
+    timed_ns = asyncio.run(per_call_ns(repository.timed, args.ops))
+    print(
+        f"  {'timed_call':<18} {timed_ns:6.0f} ns   bare call {bare_ns:6.0f} ns   "
+        f"overhead {timed_ns - bare_ns:5.0f} ns"
+    )
+
+    print(f"render ({args.routes} routes per process, mean of {args.renders})")
+    with tempfile.TemporaryDirectory() as directory:
+        worker = record_routes(args.routes, 100)
+        snapshot = {
+            name: [[list(key), value] for key, value in samples.items()]
+            for name, samples in worker.snapshot().items()
+        }
+        own = record_routes(args.routes, 100)
+        for workers in (0, args.workers):
+            own.directory = Path(directory) if workers else None
+            for pid in range(workers):
+                # Not running: gauges are skipped, the rest merges as for live workers
+                Path(directory, f"{os.getpid() + 100_000 + pid}-1.json").write_text(
+                    json.dumps(snapshot)
+                )
+            start = time.perf_counter()
+            for _ in range(args.renders):
+                text = own.render()
+            elapsed_ms = (time.perf_counter() - start) / args.renders * 1000
+            print(
+                f"  {workers + 1:>3} process(es)   {elapsed_ms:7.2f} ms   "
+                f"{len(text) / 1024:7.1f} KiB   {text.count(chr(10)):6,} lines"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark: request throughput, BaseHTTPMiddleware vs plain ASGI request-ID middleware.
+
+Sends requests through a small app (a JSON endpoint and a streamed one,
+no database) wrapped in:
+
+- before: ``RequestIDMiddleware`` as a ``BaseHTTPMiddleware`` (the app runs
+  in a separate task, the response goes through a memory stream, the URL
+  is rebuilt for the log line), reproduced here with the same logging
+- now: ``app.core.middleware.RequestIDMiddleware`` (plain ASGI)
+- none: the bare app, for reference
+
+Log lines are rendered as configured and written to ``os.devnull``.
+Requests go straight to the ASGI interface, one at a time.
+
+Usage:
+    uv run python -m benchmarks.middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from collections.abc import Callable
+
+import structlog
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.database import engine
+from app.core.middleware import RequestIDMiddleware
+from app.core.pool import pool_snapshot, track_pool_usage
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    """The request-ID middleware as it was (development log format)."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        request_id = str(uuid.uuid4())
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        logger = structlog.get_logger()
+        start_time = time.perf_counter()
+        pool_usage = track_pool_usage()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        response.headers["X-Request-ID"] = request_id
+        pool = pool_snapshot(engine.pool)
+        path_with_query = str(request.url.path)
+        if request.url.query:
+            path_with_query = f"{request.url.path}?{request.url.query}"
+        logger.info(
+            f"{request.method} {path_with_query}",
+            code=response.status_code,
+            t=round(duration_ms, 2),
+            db=pool_usage.checkouts,
+            db_wait=round(pool_usage.wait_seconds * 1000, 2),
+            pool=f"{pool.checked_out}/{pool.size + pool.max_overflow}" if pool else None,
+            request_id=request_id[-8:],
+        )
+        return response
+
+
+def make_app(middleware: type | None) -> FastAPI:
+    """App with a small JSON endpoint and a 100-chunk streamed one."""
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items() -> dict:
+        return {"items": [1, 2, 3], "total": 3}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for i in range(100):
+                yield b'{"id": %d}\n' % i
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def get(app: FastAPI, path: str) -> int:
+    """Send one GET through ``app``'s ASGI interface; return the status."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"limit=3",
+        "headers": [(b"host", b"bench")],
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+    status = 0
+    done = asyncio.Event()
+
+    async def receive() -> dict:
+        if not done.is_set():
+            done.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # the client stays connected
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def throughput(app: FastAPI, path: str, requests: int) -> float:
+    """Send ``requests`` requests one after another; return requests per second."""
+    await get(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await get(app, path)
+    return requests / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000, help="Requests per case")
+    args = parser.parse_args()
+    apps = {
+        "none": make_app(None),
+        "before": make_app(LegacyRequestIDMiddleware),
+        "now": make_app(RequestIDMiddleware),
+    }
+
+    print(f"{args.requests} sequential requests per case")
+    for path in ("/items", "/stream"):
+        assert {await get(app, path) for app in apps.values()} == {200}  # noqa: S101
+        rates = {name: await throughput(app, path, args.requests) for name, app in apps.items()}
+        print(
+            f"GET {path:<8} "
+            + "   ".join(f"{name} {rate:8,.0f} req/s" for name, rate in rates.items())
+            + f"   speedup {rates['now'] / rates['before']:4.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    with open(os.devnull, "w") as devnull:
+        structlog.configure(logger_factory=structlog.PrintLoggerFactory(file=devnull))
+        asyncio.run(main())
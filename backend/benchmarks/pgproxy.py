@@ -0,0 +1,276 @@
+"""Stand-in for PgBouncer: a minimal PostgreSQL proxy with session and transaction pooling.
+
+Used by ``benchmarks.pooler_modes`` when no real PgBouncer is at hand. Like
+PgBouncer it answers the client's startup itself and multiplexes clients
+over at most ``--pool-size`` server connections:
+
+- ``session``: a client keeps one server connection until it disconnects,
+  then the connection is reset with ``DISCARD ALL`` and reused
+- ``transaction``: a client holds a server connection only until the server
+  reports it idle again (``ReadyForQuery`` outside a transaction), so
+  prepared statements and other session state leak between clients exactly
+  as they do behind PgBouncer in transaction mode
+
+It only does what the benchmark needs: plain-text connections, trust
+authentication towards the server, one database and user, no cancel
+requests and no admin console. Do not use it for anything else.
+
+Usage:
+    uv run python -m benchmarks.pgproxy --mode transaction --port 6432 --pool-size 20
+    # then point DATABASE_URL at postgresql+asyncpg://postgres@127.0.0.1:6432/db
+"""
+
+import argparse
+import asyncio
+import contextlib
+import struct
+from collections.abc import Callable
+
+from sqlalchemy.engine import make_url
+
+from app.core.settings import settings
+
+PROTOCOL_VERSION = 196608
+SSL_REQUEST = 80877103
+GSS_REQUEST = 80877104
+
+Message = tuple[bytes, bytes]
+"""A protocol message: type byte and payload (without the length prefix)."""
+
+
+async def read_message(reader: asyncio.StreamReader) -> Message | None:
+    """Read one typed message, or return None at end of stream."""
+    try:
+        header = await reader.readexactly(5)
+        (length,) = struct.unpack("!i", header[1:])
+        return header[:1], await reader.readexactly(length - 4)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def encode(kind: bytes, payload: bytes = b"") -> bytes:
+    """Encode a typed message."""
+    return kind + struct.pack("!i", len(payload) + 4) + payload
+
+
+def startup_packet(user: str, database: str) -> bytes:
+    """Encode a StartupMessage."""
+    params = f"user\0{user}\0database\0{database}\0\0".encode()
+    return struct.pack("!ii", len(params) + 8, PROTOCOL_VERSION) + params
+
+
+class ServerConnection:
+    """An authenticated connection to PostgreSQL."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.parameters: list[bytes] = []
+
+    @classmethod
+    async def open(cls, connect: Callable, user: str, database: str) -> "ServerConnection":
+        """Connect and complete the startup, keeping the ParameterStatus messages."""
+        conn = cls(*await connect())
+        conn.writer.write(startup_packet(user, database))
+        while (message := await read_message(conn.reader)) is not None:
+            kind, payload = message
+            if kind == b"R" and payload[:4] != b"\0\0\0\0":
+                msg = "the stand-in proxy only supports trust authentication"
+                raise RuntimeError(msg)
+            if kind == b"E":
+                raise RuntimeError(payload.decode(errors="replace"))
+            if kind == b"S":
+                conn.parameters.append(encode(kind, payload))
+            if kind == b"Z":
+                return conn
+        msg = "server closed the connection during startup"
+        raise RuntimeError(msg)
+
+    async def reset(self) -> bool:
+        """Run ``DISCARD ALL`` (PgBouncer's ``server_reset_query``); False if it failed."""
+        self.writer.write(encode(b"Q", b"DISCARD ALL\0"))
+        while (message := await read_message(self.reader)) is not None:
+            if message[0] == b"Z":
+                return message[1] == b"I"
+        return False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ServerPool:
+    """At most ``size`` server connections, opened on demand and handed out FIFO."""
+
+    def __init__(self, connect: Callable, user: str, database: str, size: int) -> None:
+        self.connect = connect
+        self.user = user
+        self.database = database
+        self.idle: asyncio.Queue[ServerConnection] = asyncio.Queue()
+        self.slots = asyncio.Semaphore(size)
+        self.parameters: list[bytes] = []
+
+    async def acquire(self) -> ServerConnection:
+        await self.slots.acquire()
+        if not self.idle.empty():
+            return self.idle.get_nowait()
+        try:
+            conn = await ServerConnection.open(self.connect, self.user, self.database)
+        except BaseException:
+            self.slots.release()
+            raise
+        self.parameters = self.parameters or conn.parameters
+        return conn
+
+    def release(self, conn: ServerConnection | None) -> None:
+        """Return ``conn`` for reuse, or just free its slot if it is None (discarded)."""
+        if conn is not None:
+            self.idle.put_nowait(conn)
+        self.slots.release()
+
+
+async def client_startup(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+    """Read the client's startup packet, declining SSL/GSS encryption; False to hang up."""
+    while True:
+        try:
+            (length,) = struct.unpack("!i", await reader.readexactly(4))
+            body = await reader.readexactly(length - 4)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return False
+        (code,) = struct.unpack("!i", body[:4])
+        if code in (SSL_REQUEST, GSS_REQUEST):
+            writer.write(b"N")
+            continue
+        return code == PROTOCOL_VERSION
+
+
+async def pipe_to_client(
+    server: ServerConnection,
+    writer: asyncio.StreamWriter,
+    done: Callable[[bytes], bool],
+) -> bool:
+    """Forward server messages until ``done(status)`` on a ReadyForQuery; False if it closed."""
+    while (message := await read_message(server.reader)) is not None:
+        writer.write(encode(*message))
+        if message[0] == b"Z" and done(message[1]):
+            await writer.drain()
+            return True
+    return False
+
+
+async def cancel(task: asyncio.Task) -> None:
+    """Cancel ``task`` and wait until it has stopped reading."""
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+class Proxy:
+    """Accepts clients and runs each in session or transaction pooling mode."""
+
+    def __init__(self, pool: ServerPool, mode: str) -> None:
+        self.pool = pool
+        self.mode = mode
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            if await client_startup(reader, writer):
+                await self.greet(writer)
+                if self.mode == "session":
+                    await self.session(reader, writer)
+                else:
+                    await self.transaction(reader, writer)
+        finally:
+            writer.close()
+
+    async def greet(self, writer: asyncio.StreamWriter) -> None:
+        """Answer the startup as the server would, with a live server's parameters."""
+        if not self.pool.parameters:
+            self.pool.release(await self.pool.acquire())
+        writer.write(encode(b"R", struct.pack("!i", 0)))
+        writer.writelines(self.pool.parameters)
+        writer.write(encode(b"K", struct.pack("!ii", 0, 0)))
+        writer.write(encode(b"Z", b"I"))
+        await writer.drain()
+
+    async def session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        server = await self.pool.acquire()
+        forward = asyncio.create_task(pipe_to_client(server, writer, lambda _status: False))
+        clean = False
+        try:
+            while (message := await read_message(reader)) is not None and message[0] != b"X":
+                server.writer.write(encode(*message))
+            await cancel(forward)
+            clean = await server.reset()
+        finally:
+            await cancel(forward)
+            if not clean:
+                server.close()
+            self.pool.release(server if clean else None)
+
+    async def transaction(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        state = {"server": None, "forward": None, "pending": 0, "unsynced": False}
+
+        def released(status: bytes) -> bool:
+            state["pending"] -= 1
+            if state["pending"] > 0 or state["unsynced"] or status != b"I":
+                return False
+            self.pool.release(state["server"])
+            state["server"] = None
+            return True
+
+        try:
+            while (message := await read_message(reader)) is not None and message[0] != b"X":
+                if state["server"] is None:
+                    if state["forward"] is not None:
+                        await state["forward"]
+                    state["server"] = await self.pool.acquire()
+                    state["forward"] = asyncio.create_task(
+                        pipe_to_client(state["server"], writer, released),
+                    )
+                # Query and Sync each end a batch answered by one ReadyForQuery
+                if message[0] in (b"Q", b"S"):
+                    state["pending"] += 1
+                    state["unsynced"] = False
+                else:
+                    state["unsynced"] = True
+                state["server"].writer.write(encode(*message))
+        finally:
+            if state["server"] is not None:
+                # Disconnected mid-transaction: the server connection is unusable
+                await cancel(state["forward"])
+                state["server"].close()
+                self.pool.release(None)
+
+
+async def serve(mode: str, host: str, port: int, pool_size: int) -> asyncio.Server:
+    """Start a proxy to the database in ``DATABASE_URL``."""
+    url = make_url(settings.database_url)
+    socket_dir = url.query.get("host")
+    if socket_dir:
+
+        def connect():
+            return asyncio.open_unix_connection(f"{socket_dir}/.s.PGSQL.{url.port or 5432}")
+    else:
+
+        def connect():
+            return asyncio.open_connection(url.host, url.port or 5432)
+
+    pool = ServerPool(connect, url.username or "postgres", url.database or "postgres", pool_size)
+    return await asyncio.start_server(Proxy(pool, mode).handle, host, port)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["session", "transaction"], default="transaction")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6432)
+    parser.add_argument("--pool-size", type=int, default=20, help="Server connections")
+    args = parser.parse_args()
+    server = await serve(args.mode, args.host, args.port, args.pool_size)
+    print(f"{args.mode} pooling on {args.host}:{args.port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""Benchmark: throughput direct vs through a pooler in session and transaction mode.
+
+Several app workers (one engine each, as with several uvicorn workers)
+serve a list request (``TodoRepository.list_filtered``, first 20 rows plus
+total) from many concurrent tasks, against:
+
+- PostgreSQL directly, also with ``DB_POOLER_MODE=transaction`` to show
+  what re-preparing every statement costs on its own
+- a pooler in session mode: every app connection pins a server connection,
+  so the pooler needs as many server connections as the apps hold
+- a pooler in transaction mode with the engine's default prepared-statement
+  caching (fails as soon as a cached statement is used on another server
+  connection), with ``DB_POOLER_MODE=transaction``, and with that plus
+  ``DB_POOL_SIZE=0`` (NullPool)
+
+Pass ``--session-url``/``--transaction-url`` to use real PgBouncer
+instances; otherwise ``benchmarks.pgproxy`` stand-ins are started against
+``DATABASE_URL`` (trust authentication only). The stand-in is Python, so
+its overhead is larger than PgBouncer's; compare modes through the same
+pooler. Rows are not seeded, the benchmark reads whatever ``todos`` holds.
+
+Usage:
+    uv run python -m benchmarks.pooler_modes --app-workers 4 --requests 4000
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import create_engine
+from app.core.settings import PoolerMode, Settings, settings
+from app.features.todos.repository import TodoRepository
+from app.features.todos.schemas import TodoFilterParams
+
+
+@asynccontextmanager
+async def pooler(url: str | None, mode: str, port: int, server_connections: int):
+    """Yield ``url``, or start a ``benchmarks.pgproxy`` stand-in and yield its URL."""
+    if url:
+        yield url
+        return
+    proxy = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "benchmarks.pgproxy",
+        f"--mode={mode}",
+        f"--port={port}",
+        f"--pool-size={server_connections}",
+        stdout=subprocess.PIPE,
+    )
+    await proxy.stdout.readline()  # "... pooling on host:port" once listening
+    try:
+        stand_in = make_url(settings.database_url).set(host="127.0.0.1", port=port, query={})
+        yield stand_in.render_as_string(hide_password=False)
+    finally:
+        proxy.terminate()
+        await proxy.wait()
+
+
+async def run(url: str, config: Settings, args) -> tuple[float, list[float]]:
+    """Serve ``args.requests`` list requests; return (requests/s, latencies in ms)."""
+    engines = [create_engine(url, config) for _ in range(args.app_workers)]
+    factories = [sessionmaker(engine, class_=AsyncSession) for engine in engines]
+    filters = TodoFilterParams(limit=20)
+    latencies: list[float] = []
+    remaining = iter(range(args.requests))
+
+    async def client(factory: sessionmaker) -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            async with factory() as session:
+                await TodoRepository(session).list_filtered(filters)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(client(factories[i % len(factories)]) for i in range(args.concurrency)),
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        for engine in engines:
+            await engine.dispose()
+    return len(latencies) / elapsed, latencies
+
+
+async def case(label: str, url: str, config: Settings, args, *, server_connections: int) -> None:
+    try:
+        throughput, latencies = await asyncio.wait_for(run(url, config, args), args.timeout)
+    except Exception as exc:  # report the failure mode and go on
+        reason = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+        print(f"{label:<44} FAILED: {type(exc).__name__}: {reason[:70]}")
+        return
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{label:<44} {throughput:8.0f} req/s   median {statistics.median(latencies):7.2f} ms"
+        f"   p95 {p95:7.2f} ms   server conns {server_connections:3d}",
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app-workers", type=int, default=4, help="Engines (uvicorn workers)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent requests")
+    parser.add_argument("--requests", type=int, default=4000, help="Requests per case")
+    parser.add_argument("--pool-size", type=int, default=10, help="DB_POOL_SIZE per worker")
+    parser.add_argument("--server-connections", type=int, default=10, help="Transaction mode")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds per case")
+    parser.add_argument("--session-url", help="Real PgBouncer in session mode")
+    parser.add_argument("--transaction-url", help="Real PgBouncer in transaction mode")
+    args = parser.parse_args()
+
+    app_connections = args.app_workers * args.pool_size
+    direct = settings.model_copy(update={"db_pool_size": args.pool_size, "db_max_overflow": 0})
+    transaction = direct.model_copy(update={"db_pooler_mode": PoolerMode.TRANSACTION})
+    null_pool = transaction.model_copy(update={"db_pool_size": 0})
+    print(
+        f"{args.app_workers} app workers x {args.pool_size} connections, "
+        f"{args.concurrency} concurrent requests, {args.requests} requests per case",
+    )
+
+    for label, config in (("direct", direct), ("direct, DB_POOLER_MODE", transaction)):
+        await case(label, settings.database_url, config, args, server_connections=app_connections)
+
+    async with pooler(args.session_url, "session", 6491, app_connections) as url:
+        await case("session pooling", url, direct, args, server_connections=app_connections)
+
+    servers = args.server_connections
+    async with pooler(args.transaction_url, "transaction", 6492, servers) as url:
+        for label, config in (
+            ("transaction pooling, default engine", direct),
+            ("transaction pooling, DB_POOLER_MODE", transaction),
+            ("  + DB_POOL_SIZE=0 (NullPool)", null_pool),
+        ):
+            await case(label, url, config, args, server_connections=servers)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
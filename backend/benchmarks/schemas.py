@@ -0,0 +1,77 @@
+"""Benchmark: schema construction throughput, per-instance introspection vs planned core schema.
+
+Builds instances of each todo schema from the inputs it gets in the app,
+with ``BaseSchema`` as it was (a ``mode="before"`` validator that walked
+every field annotation in Python for each instance, see
+``benchmarks.write_path``) and as it is now (blank-string handling planned
+once per class, inside the core schema):
+
+- ``TodoCreate`` / ``TodoUpdate`` / ``TodoImportRow``: request dicts, half
+  of them with an empty due date
+- ``TodoCreate``: the same bodies as JSON bytes (``model_validate_json``)
+- ``TodoResponse``: ORM rows (``from_attributes``), as listed per request
+
+Both versions build equal instances (checked before timing). No database
+is needed.
+
+Usage:
+    uv run python -m benchmarks.schemas --repeat 5
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.features.todos.schemas import TodoCreate, TodoImportRow, TodoResponse, TodoUpdate
+from benchmarks.serialization import make_todos
+from benchmarks.write_path import legacy, make_todo
+
+INSTANCES = 10_000
+"""Instances built per timed run."""
+
+
+def per_second(build: Callable[[Any], Any], inputs: list[Any], *, repeat: int) -> float:
+    """Build an instance from every input ``repeat`` times; return the best instances/s."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in inputs:
+            build(value)
+        best = min(best, time.perf_counter() - start)
+    return len(inputs) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (best kept)")
+    args = parser.parse_args()
+    bodies = [make_todo(i) for i in range(INSTANCES)]
+    updates = [{**body, "completed": bool(i % 2)} for i, body in enumerate(bodies)]
+    rows = [{**body, "completed": False, "created_at": ""} for body in bodies]
+    cases = [
+        ("TodoCreate", "dict", TodoCreate, "model_validate", bodies),
+        ("TodoCreate", "JSON", TodoCreate, "model_validate_json", list(map(json.dumps, bodies))),
+        ("TodoUpdate", "dict", TodoUpdate, "model_validate", updates),
+        ("TodoImportRow", "dict", TodoImportRow, "model_validate", rows),
+        ("TodoResponse", "ORM row", TodoResponse, "model_validate", make_todos(INSTANCES)),
+    ]
+
+    print(f"{INSTANCES} instances per run, best of {args.repeat}")
+    for name, source, model, method, inputs in cases:
+        before = getattr(legacy(model), method)
+        now = getattr(model, method)
+        # The former validator edited input dicts in place: give it copies
+        fresh = (lambda value: dict(value)) if isinstance(inputs[0], dict) else (lambda v: v)
+        assert before(fresh(inputs[0])).model_dump() == now(inputs[0]).model_dump()  # noqa: S101
+        old_rate = per_second(lambda v, b=before, f=fresh: b(f(v)), inputs, repeat=args.repeat)
+        new_rate = per_second(lambda v, n=now, f=fresh: n(f(v)), inputs, repeat=args.repeat)
+        print(
+            f"{name:<14} {source:<8} before {old_rate:10,.0f}/s   now {new_rate:10,.0f}/s   "
+            f"speedup {new_rate / old_rate:4.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
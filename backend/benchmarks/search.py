@@ -0,0 +1,69 @@
+"""Benchmark: full-text search (GIN) vs ILIKE '%term%' (sequential scan).
+
+Times the first page (50 rows, newest first) plus its exact total for a
+common word, two words and a rare token, once through
+``TodoRepository.list_filtered`` (``search_vector @@ websearch_to_tsquery``,
+served by the GIN index) and once through the ``title ILIKE '%x%' OR
+description ILIKE '%x%'`` filter that the search used to run. Relevance
+ranking (``sort_by=relevance``) is timed for the full-text side only.
+
+Usage:
+    uv run python -m benchmarks.search --rows 1000000 --repeat 20
+"""
+
+import asyncio
+
+from sqlalchemy import func, or_, select, text
+
+from app.features.todos.models import Todo
+from app.features.todos.repository import TodoRepository
+from app.features.todos.schemas import SortBy, TodoFilterParams
+from benchmarks.common import measure, parse_args, report, seeded_session
+
+# The rare token is a word only seeded into one row's description (md5 of its number)
+CASES = {
+    "common word": ("urgent", "urgent"),
+    "two words": ("urgent budget", "urgent"),
+    "rare token": (None, None),
+}
+
+
+async def ilike_page(session, term: str) -> tuple[list[Todo], int]:
+    """Run the previous ILIKE search: exact count, then the first page."""
+    pattern = f"%{term}%"
+    filtered = select(Todo).where(or_(Todo.title.ilike(pattern), Todo.description.ilike(pattern)))
+    total = await session.scalar(select(func.count()).select_from(filtered.subquery()))
+    page = await session.scalars(filtered.order_by(Todo.created_at.desc()).limit(50))
+    return list(page.all()), total
+
+
+async def main() -> None:
+    args = parse_args(__doc__.splitlines()[0], rows=1_000_000)
+    async with seeded_session(args.rows) as session:
+        # Merge the GIN pending list so the index is fully built, as after autovacuum
+        await session.execute(text("SELECT gin_clean_pending_list('ix_todos_search_vector')"))
+        rare = await session.scalar(text("SELECT md5((:rows / 2)::text)"), {"rows": args.rows})
+        repository = TodoRepository(session)
+        print(f"{args.rows} rows, {args.repeat} calls per case")
+        for name, (query, ilike_term) in CASES.items():
+            query = query or rare
+            ilike_term = ilike_term or rare
+            filters = TodoFilterParams(search=query, limit=50)
+            ilike = report(
+                f"{name}: ILIKE",
+                await measure(lambda t=ilike_term: ilike_page(session, t), repeat=args.repeat),
+            )
+            fts = report(
+                f"{name}: full-text",
+                await measure(lambda f=filters: repository.list_filtered(f), repeat=args.repeat),
+            )
+            print(f"{'':<48} speedup {ilike / fts:5.2f}x")
+            ranked = filters.model_copy(update={"sort_by": SortBy.RELEVANCE})
+            report(
+                f"{name}: full-text, sort_by=relevance",
+                await measure(lambda f=ranked: repository.list_filtered(f), repeat=args.repeat),
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
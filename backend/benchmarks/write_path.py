@@ -0,0 +1,210 @@
+"""Benchmark: request body validation, decoded dicts + Python pre-pass vs raw JSON bytes.
+
+Times validating ``POST /api/v1/todos`` and ``POST /api/v1/todos/bulk``
+bodies (one todo, and 1000) two ways:
+
+- before: ``json.loads``, then ``model_validate`` with ``BaseSchema``'s
+  former ``mode="before"`` validator, which walked every field's annotation
+  in Python on each (nested) model to turn empty datetime strings into None
+- now: ``model_validate_json`` on the raw bytes, with the empty-string
+  handling built into the core schema
+
+and the same through a FastAPI app (ASGI call with a stub endpoint, no
+database): a regular body parameter with the before models vs
+``json_body`` with the current ones. Both paths accept the same bodies
+(checked before timing).
+
+Usage:
+    uv run python -m benchmarks.write_path --repeat 2000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Annotated, Any, Union, get_args, get_origin
+
+from fastapi import APIRouter, FastAPI, Response
+from pydantic import BaseModel, create_model, model_validator
+
+from app.core.routing import JSONBodyRoute, json_body
+from app.features.todos.schemas import TodoBulkCreate, TodoCreate
+from benchmarks.common import WORDS
+
+
+def _is_datetime_type(tp: Any) -> bool:
+    """``BaseSchema``'s former annotation check."""
+    if tp is datetime:
+        return True
+    origin = get_origin(tp)
+    if origin is Annotated:
+        args = get_args(tp)
+        return _is_datetime_type(args[0]) if args else False
+    if origin is Union or str(origin) == "<class 'types.UnionType'>":
+        return any(_is_datetime_type(a) for a in get_args(tp))
+    return False
+
+
+class LegacyBaseSchema(BaseModel):
+    """``BaseSchema`` as it was: a Python pass over every field before validation."""
+
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_empty_datetime_strings(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            for name, field in cls.model_fields.items():
+                if name in data and _is_datetime_type(field.annotation):
+                    v = data[name]
+                    if isinstance(v, str) and v.strip() == "":
+                        data[name] = None
+        return data
+
+
+def legacy(model: type[BaseModel], **annotations: Any) -> type[BaseModel]:
+    """Copy ``model``'s fields and config onto ``LegacyBaseSchema`` (some annotations replaced)."""
+    base = type(
+        f"Legacy{model.__name__}Base", (LegacyBaseSchema,), {"model_config": model.model_config}
+    )
+    fields = {
+        name: (annotations.get(name, field.annotation), field)
+        for name, field in model.model_fields.items()
+    }
+    return create_model(f"Legacy{model.__name__}", __base__=base, **fields)
+
+
+LegacyTodoCreate = legacy(TodoCreate)
+LegacyTodoBulkCreate = legacy(TodoBulkCreate, items=list[LegacyTodoCreate])
+
+
+def make_todo(i: int) -> dict:
+    """One create body, half of them with an empty due date as HTML forms send it."""
+    return {
+        "title": f"Todo {i} {WORDS[i % 20]}",
+        "description": f"{WORDS[(i * 7) % 20]} {WORDS[(i * 11) % 20]}" if i % 2 else None,
+        "priority": ["low", "medium", "high"][i % 3],
+        "due_date": "" if i % 2 else f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T09:00:00Z",
+    }
+
+
+def make_app(create: type[BaseModel], bulk: type[BaseModel], *, raw_json: bool) -> FastAPI:
+    """App with the two write routes and endpoints that only acknowledge the body.
+
+    With ``raw_json`` the bodies are ``json_body`` parameters, else regular ones.
+    """
+    if raw_json:
+        create = Annotated[create, json_body(create)]  # type: ignore[assignment]
+        bulk = Annotated[bulk, json_body(bulk)]  # type: ignore[assignment]
+    router = APIRouter(route_class=JSONBodyRoute)
+
+    @router.post("/todos", status_code=201)
+    async def create_todo(data: create) -> Response:  # type: ignore[valid-type]
+        return Response(status_code=201)
+
+    @router.post("/todos/bulk", status_code=201)
+    async def bulk_create_todos(data: bulk) -> Response:  # type: ignore[valid-type]
+        return Response(status_code=201)
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def post(app: FastAPI, path: str, body: bytes) -> int:
+    """Send one JSON POST through ``app``'s ASGI interface; return the status."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+
+    async def receive() -> dict:
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def per_call(fn: Callable[[], Any], *, repeat: int) -> float:
+    """Call ``fn`` once to warm up, then ``repeat`` times; return the median in µs."""
+    await fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(durations)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="Timed calls per case")
+    args = parser.parse_args()
+    before_app = make_app(LegacyTodoCreate, LegacyTodoBulkCreate, raw_json=False)
+    now_app = make_app(TodoCreate, TodoBulkCreate, raw_json=True)
+    cases = [
+        ("create, 1 todo", "/todos", TodoCreate, LegacyTodoCreate, make_todo(1)),
+        (
+            "bulk, 1000 todos",
+            "/todos/bulk",
+            TodoBulkCreate,
+            LegacyTodoBulkCreate,
+            {"items": [make_todo(i) for i in range(1000)]},
+        ),
+    ]
+
+    print(f"{args.repeat} calls per case, median")
+    for label, path, model, legacy_model, payload in cases:
+        body = json.dumps(payload).encode()
+        old = legacy_model.model_validate(json.loads(body)).model_dump()
+        assert old == model.model_validate_json(body).model_dump()  # noqa: S101
+        assert await post(before_app, path, body) == await post(now_app, path, body) == 201  # noqa: S101
+        repeat = args.repeat if len(body) < 1000 else max(args.repeat // 20, 10)
+
+        async def validate_before(body=body, legacy_model=legacy_model) -> None:
+            legacy_model.model_validate(json.loads(body))
+
+        async def validate_now(body=body, model=model) -> None:
+            model.model_validate_json(body)
+
+        async def request_before(body=body, path=path) -> None:
+            await post(before_app, path, body)
+
+        async def request_now(body=body, path=path) -> None:
+            await post(now_app, path, body)
+
+        for stage, old_fn, new_fn in [
+            ("validate", validate_before, validate_now),
+            ("request", request_before, request_now),
+        ]:
+            old_us = await per_call(old_fn, repeat=repeat)
+            new_us = await per_call(new_fn, repeat=repeat)
+            print(
+                f"{label:<17} {stage:<9} before {old_us:9.1f} µs   now {new_us:9.1f} µs   "
+                f"speedup {old_us / new_us:4.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""Benchmark: statements per single-row write, legacy vs RETURNING path.
+
+The legacy path is what a request did before writes used RETURNING: create
+is INSERT + SELECT (refresh), update is SELECT + UPDATE + SELECT (load,
+write, refresh) and delete is SELECT + DELETE (load, delete). The RETURNING
+path (``create``, ``update_by_id``, ``delete_by_id``) issues one statement
+each. The identity map is cleared before every call, as each request gets a
+fresh session. Statements are counted with a ``before_cursor_execute`` hook.
+
+Usage:
+    uv run python -m benchmarks.write_round_trips --rows 10000 --repeat 200
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import event
+
+from app.features.todos.models import Todo
+from app.features.todos.repository import TodoRepository
+from benchmarks.common import measure, parse_args, report, seeded_session
+
+
+async def main() -> None:
+    args = parse_args(__doc__.splitlines()[0], rows=10_000)
+    async with seeded_session(args.rows) as session:
+        repository = TodoRepository(session)
+        statements = 0
+
+        def count_statement(*_: object) -> None:
+            nonlocal statements
+            statements += 1
+
+        event.listen(session.bind.sync_engine, "before_cursor_execute", count_statement)
+
+        target = await repository.create({"title": "benchmark target"})
+        doomed = [
+            todo.id
+            for todo in await repository.create_many(
+                [{"title": f"benchmark doomed {i}"} for i in range(2 * (args.repeat + 1))],
+            )
+        ]
+
+        async def legacy_create() -> None:
+            todo = Todo(title="benchmark create")
+            session.add(todo)
+            await session.commit()
+            await session.refresh(todo)
+
+        async def legacy_update() -> None:
+            todo = await session.get(Todo, target.id)
+            todo.completed = not todo.completed
+            await session.commit()
+            await session.refresh(todo)
+
+        async def legacy_delete() -> None:
+            todo = await session.get(Todo, doomed.pop())
+            await session.delete(todo)
+            await session.commit()
+
+        async def returning_update() -> None:
+            await repository.update_by_id(target.id, {"completed": not target.completed})
+
+        cases: dict[str, tuple[Callable[[], Awaitable[object]], ...]] = {
+            "create": (legacy_create, lambda: repository.create({"title": "benchmark create"})),
+            "update": (legacy_update, returning_update),
+            "delete": (legacy_delete, lambda: repository.delete_by_id(doomed.pop())),
+        }
+
+        print(f"{args.rows} rows, {args.repeat} calls per case")
+        for name, (legacy, returning) in cases.items():
+            medians = []
+            for label, fn in (("legacy", legacy), ("RETURNING", returning)):
+
+                async def fresh_session_call(fn: Callable[[], Awaitable[object]] = fn) -> None:
+                    session.expunge_all()
+                    await fn()
+
+                statements = 0
+                durations = await measure(fresh_session_call, repeat=args.repeat)
+                medians.append(report(f"{name}: {label}", durations))
+                print(f"{'':<48} {statements / (args.repeat + 1):.1f} statements per call")
+            print(f"{'':<48} speedup {medians[0] / medians[1]:5.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,6 +6,7 @@ This module creates and configures the main FastAPI application with:
 - Custom exception handlers for domain errors
 - API versioning with /api/v1 prefix
 - Health check endpoints
+- Prometheus metrics endpoint (/metrics)
 - OpenAPI documentation
 """
 
@@ -15,8 +16,10 @@ from fastapi.responses import JSONResponse
 
 from app.core.exceptions import ForbiddenError, NotFoundError, ValidationError
 from app.core.middleware import RequestIDMiddleware
+from app.core.routing import json_body_openapi
 from app.core.settings import settings
 from app.features.health.router import router as health_router
+from app.features.metrics.router import router as metrics_router
 from app.features.todos.router import router as todos_router
 
 # Create FastAPI application
@@ -69,4 +72,8 @@ async def validation_exception_handler(request: Request, exc: ValidationError) -
 
 # Include API routers
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(todos_router)
+
+# Document json_body request bodies (see app.core.routing)
+app.openapi = json_body_openapi(app)
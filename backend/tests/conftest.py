@@ -167,8 +167,8 @@ def test_client(db_container: PostgresContainer) -> Generator[TestClient, None,
     application. The client handles the full request/response cycle including
     middleware, validation, and serialization.
 
-    Overrides the database dependency to use the test container database,
-    ensuring integration tests run against the test database.
+    Overrides the database dependencies (primary and read replica) to use the
+    test container database, ensuring integration tests run against the test database.
 
     Uses context manager to ensure proper cleanup of async resources between tests.
 
@@ -190,7 +190,7 @@ def test_client(db_container: PostgresContainer) -> Generator[TestClient, None,
             assert response.status_code == 200
     """
     # Import here to avoid circular imports
-    from app.core.database import get_db
+    from app.core.database import get_db, get_read_db
 
     # Create a new engine for the test database
     connection_url = db_container.get_connection_url().replace(
@@ -218,8 +218,9 @@ def test_client(db_container: PostgresContainer) -> Generator[TestClient, None,
             finally:
                 await session.close()
 
-    # Override the dependency
+    # Override the dependencies (reads and writes both go to the test database)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     try:
         with TestClient(app) as client:
@@ -10,8 +10,9 @@ Tests cover:
 """
 
 import pytest
+from pydantic import ValidationError
 
-from app.core.settings import Settings, settings
+from app.core.settings import PoolerMode, Settings, settings
 
 
 class TestSettingsDefaults:
@@ -46,6 +47,38 @@ class TestSettingsDefaults:
         s = Settings()
         assert s.api_v1_prefix == "/api/v1"
 
+    def test_entity_cache_disabled_by_default(self):
+        """Test no repository opts into the entity cache by default."""
+        s = Settings()
+        assert s.entity_cache_models == set()
+        assert s.entity_cache_max_size > 0
+        assert s.entity_cache_ttl_seconds > 0
+
+    def test_access_log_unsampled_by_default(self):
+        """Test every access-log line is written unless sampling is configured."""
+        s = Settings()
+        assert s.access_log_sample_rate == 1
+        assert s.access_log_route_rates == {}
+        assert s.access_log_max_per_second == 0
+
+    def test_no_read_replicas_by_default(self):
+        """Test all traffic goes to the primary unless replicas are configured."""
+        s = Settings()
+        assert s.database_replica_urls == []
+        assert s.database_replica_sticky_seconds > 0
+        assert s.database_replica_retry_seconds > 0
+
+    def test_pool_defaults(self):
+        """Test the connection pool defaults match SQLAlchemy's QueuePool defaults."""
+        s = Settings()
+        assert s.db_pool_size == 5
+        assert s.db_max_overflow == 10
+        assert s.db_pool_timeout == 30.0
+        assert s.db_pool_recycle == -1
+        assert s.db_pool_pre_ping is False
+        assert s.db_pool_use_lifo is False
+        assert s.db_pooler_mode == PoolerMode.NONE
+
 
 class TestSettingsEnvironmentOverrides:
     """Test environment variable overrides for settings."""
@@ -84,6 +117,98 @@ class TestSettingsEnvironmentOverrides:
         s = Settings()
         assert s.api_v1_prefix == "/v1"
 
+    def test_entity_cache_override(self, monkeypatch):
+        """Test ENTITY_CACHE_* environment variables enable and size the cache."""
+        monkeypatch.setenv("ENTITY_CACHE_MODELS", "todos, users")
+        monkeypatch.setenv("ENTITY_CACHE_MAX_SIZE", "50")
+        monkeypatch.setenv("ENTITY_CACHE_TTL_SECONDS", "2.5")
+        s = Settings()
+        assert s.entity_cache_models == {"todos", "users"}
+        assert s.entity_cache_max_size == 50
+        assert s.entity_cache_ttl_seconds == 2.5
+
+    def test_access_log_sampling_override(self, monkeypatch):
+        """Test ACCESS_LOG_* environment variables configure access-log sampling."""
+        monkeypatch.setenv("ACCESS_LOG_SAMPLE_RATE", "0.1")
+        monkeypatch.setenv("ACCESS_LOG_ROUTE_RATES", "/api/v1/health=0, /api/v1/todos/{id}=0.05")
+        monkeypatch.setenv("ACCESS_LOG_MAX_PER_SECOND", "100")
+        monkeypatch.setenv("ACCESS_LOG_SLOW_MS", "250")
+        s = Settings()
+        assert s.access_log_sample_rate == 0.1
+        assert s.access_log_route_rates == {"/api/v1/health": 0, "/api/v1/todos/{id}": 0.05}
+        assert s.access_log_max_per_second == 100
+        assert s.access_log_slow_ms == 250
+
+    @pytest.mark.parametrize(
+        "rates",
+        [
+            "/api/v1/health=5",
+            "/api/v1/health=-1",
+            "/api/v1/health=nan",
+            "/a=x",
+            "/a=0.1,/b",
+            "=0.5",
+        ],
+    )
+    def test_access_log_route_rates_rejected(self, monkeypatch, rates):
+        """Test malformed ACCESS_LOG_ROUTE_RATES pairs fail when settings load."""
+        monkeypatch.setenv("ACCESS_LOG_ROUTE_RATES", rates)
+        with pytest.raises(ValidationError, match="access_log_route_rates"):
+            Settings()
+
+    def test_metrics_override(self, monkeypatch):
+        """Test METRICS_* environment variables configure cross-worker metrics snapshots."""
+        monkeypatch.setenv("METRICS_DIR", "/run/metrics")
+        monkeypatch.setenv("METRICS_SNAPSHOT_SECONDS", "5")
+        s = Settings()
+        assert s.metrics_dir == "/run/metrics"
+        assert s.metrics_snapshot_seconds == 5
+
+        monkeypatch.setenv("METRICS_SNAPSHOT_SECONDS", "0")
+        with pytest.raises(ValidationError):
+            Settings()
+
+    def test_database_replicas_override(self, monkeypatch):
+        """Test DATABASE_REPLICA_* environment variables configure read replicas."""
+        monkeypatch.setenv(
+            "DATABASE_REPLICA_URLS",
+            "postgresql+asyncpg://u:p@replica1/db, postgresql+asyncpg://u:p@replica2/db",
+        )
+        monkeypatch.setenv("DATABASE_REPLICA_STICKY_SECONDS", "0")
+        monkeypatch.setenv("DATABASE_REPLICA_RETRY_SECONDS", "5")
+        s = Settings()
+        assert s.database_replica_urls == [
+            "postgresql+asyncpg://u:p@replica1/db",
+            "postgresql+asyncpg://u:p@replica2/db",
+        ]
+        assert s.database_replica_sticky_seconds == 0
+        assert s.database_replica_retry_seconds == 5
+
+    def test_pool_override(self, monkeypatch):
+        """Test DB_POOL_* environment variables configure the connection pool."""
+        monkeypatch.setenv("DB_POOL_SIZE", "20")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+        monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+        monkeypatch.setenv("DB_POOL_RECYCLE", "1800")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "true")
+        monkeypatch.setenv("DB_POOL_USE_LIFO", "true")
+        s = Settings()
+        assert s.db_pool_size == 20
+        assert s.db_max_overflow == 0
+        assert s.db_pool_timeout == 2.5
+        assert s.db_pool_recycle == 1800
+        assert s.db_pool_pre_ping is True
+        assert s.db_pool_use_lifo is True
+
+    def test_pooler_mode_override(self, monkeypatch):
+        """Test DB_POOLER_MODE configures PgBouncer compatibility and rejects unknown modes."""
+        monkeypatch.setenv("DB_POOLER_MODE", "transaction")
+        assert Settings().db_pooler_mode == PoolerMode.TRANSACTION
+
+        monkeypatch.setenv("DB_POOLER_MODE", "statement")
+        with pytest.raises(ValidationError):
+            Settings()
+
 
 class TestSettingsSingleton:
     """Test settings singleton pattern."""
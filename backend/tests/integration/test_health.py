@@ -31,6 +31,27 @@ class TestHealthEndpoints:
         assert response.status_code == 200
         assert response.json() == {"status": "healthy"}
 
+    def test_health_endpoint_takes_no_database_session(self):
+        """Test that /health resolves no session dependency, so polling holds no connection.
+
+        Validates:
+        - Endpoint answers even if opening a session would fail
+        """
+        from app.core.database import get_db, get_read_db
+
+        async def no_session():
+            pytest.fail("/health must not open a database session")
+            yield
+
+        app.dependency_overrides[get_db] = no_session
+        app.dependency_overrides[get_read_db] = no_session
+        try:
+            response = client.get("/api/v1/health")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+
     def test_health_db_endpoint_returns_200_when_db_available(self):
         """Test that /health/db returns 200 when database is available.
 
@@ -55,6 +76,24 @@ class TestHealthEndpoints:
             assert data["database"] == "disconnected"
             assert "error" in data
 
+    def test_health_pool_endpoint_reports_primary_pool(self):
+        """Test that /health/pool reports the primary pool without a database round trip.
+
+        Validates:
+        - Endpoint returns 200 with an overall status
+        - The primary pool is listed first with its configured size
+        """
+        response = client.get("/api/v1/health/pool")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] in ["healthy", "saturated"]
+        primary = data["pools"][0]
+        assert primary["name"] == "primary"
+        assert primary["size"] == 5
+        assert primary["max_overflow"] == 10
+        assert primary["timeouts"] >= 0
+
 
 class TestHealthServiceIntegration:
     """Test HealthService with real database session."""
@@ -119,6 +158,7 @@ class TestHealthFeatureArchitecture:
         routes = [route.path for route in router.routes]  # type: ignore[attr-defined]
         assert "/api/v1/health" in routes
         assert "/api/v1/health/db" in routes
+        assert "/api/v1/health/pool" in routes
 
     def test_service_contains_business_logic(self):
         """Test that service layer contains business logic.
@@ -0,0 +1,532 @@
+"""Integration tests for TodoRepository against PostgreSQL.
+
+These tests exercise SQL that only PostgreSQL runs in production (the joined
+page + total query, keyset predicates on native enums, query plans) inside a
+rolled-back transaction.
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+from app.core.pagination import CountMode, encode_cursor
+from app.features.todos.models import PriorityEnum, Todo
+from app.features.todos.repository import TodoRepository
+from app.features.todos.schemas import SearchMode, SortBy, SortOrder, TodoFilterParams
+
+
+@pytest.fixture()
+def repository(db_session: AsyncSession) -> TodoRepository:
+    """Create a TodoRepository bound to the isolated test session."""
+    return TodoRepository(db_session)
+
+
+async def _seed(repository: TodoRepository, count: int) -> None:
+    priorities = list(PriorityEnum)
+    await repository.create_many(
+        [
+            {
+                "title": f"repo-test {i}",
+                "description": "needle" if i % 2 else "haystack",
+                "priority": priorities[i % 3],
+            }
+            for i in range(count)
+        ],
+    )
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("offset", [0, 5, 9, 10, 25])
+async def test_single_query_matches_two_queries(repository: TodoRepository, offset: int):
+    """Test the single-statement path returns the same page and total as count + page.
+
+    Validates:
+    - Totals agree on full, partial and past-the-end pages
+    - Items and next_cursor agree
+    """
+    await _seed(repository, 10)
+    filters = TodoFilterParams(search="repo-test", offset=offset, limit=4)
+
+    one = await repository.list_filtered(filters, single_query=True)
+    two = await repository.list_filtered(filters, single_query=False)
+
+    assert one.total == two.total == 10
+    assert [todo.id for todo in one.items] == [todo.id for todo in two.items]
+    assert one.next_cursor == two.next_cursor
+
+
+@pytest.mark.asyncio()
+async def test_single_query_total_with_cursor(repository: TodoRepository):
+    """Test cursor pages report the total for the filters, not the rows left."""
+    await _seed(repository, 10)
+    filters = TodoFilterParams(search="needle", limit=2, sort_by=SortBy.PRIORITY)
+
+    first = await repository.list_filtered(filters)
+    second = await repository.list_filtered(
+        filters.model_copy(update={"cursor": first.next_cursor}),
+    )
+
+    assert first.total == second.total == 5
+    assert {todo.id for todo in first.items}.isdisjoint(todo.id for todo in second.items)
+
+
+@pytest.mark.asyncio()
+async def test_single_query_no_matches(repository: TodoRepository):
+    """Test an empty first page reports a zero total."""
+    page = await repository.list_filtered(TodoFilterParams(search="no-such-todo"))
+
+    assert page.items == []
+    assert page.total == 0
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio()
+async def test_estimated_count(repository: TodoRepository):
+    """Test estimated totals come from the planner and never undercount seen rows.
+
+    Validates:
+    - A middle page reports an estimate of at least the rows seen so far plus one
+    - The last page reports the exact total derived from the offset
+    """
+    await _seed(repository, 10)
+    filters = TodoFilterParams(search="repo-test", limit=4, count=CountMode.ESTIMATED)
+
+    first = await repository.list_filtered(filters)
+    last = await repository.list_filtered(filters.model_copy(update={"offset": 8}))
+
+    assert first.count_mode == CountMode.ESTIMATED
+    assert first.has_more is True
+    assert first.total is not None
+    assert first.total >= 5
+    assert (last.total, last.count_mode, last.has_more) == (10, CountMode.EXACT, False)
+
+
+@pytest.mark.asyncio()
+async def test_no_count(repository: TodoRepository):
+    """Test count=none skips the total and reports has_more from the extra row."""
+    await _seed(repository, 10)
+    filters = TodoFilterParams(search="repo-test", limit=5, count=CountMode.NONE)
+
+    first = await repository.list_filtered(filters)
+    second = await repository.list_filtered(
+        filters.model_copy(update={"cursor": first.next_cursor}),
+    )
+
+    assert (first.total, first.has_more, first.count_mode) == (None, True, CountMode.NONE)
+    assert (second.total, second.has_more) == (None, False)
+    assert len(second.items) == 5
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("single_query", [True, False])
+async def test_sparse_fields_load_only_requested_columns(repository: TodoRepository, single_query):
+    """Test fields= loads only the requested columns plus the keyset."""
+    await _seed(repository, 3)
+    repository.session.expunge_all()
+    filters = TodoFilterParams(search="repo-test", fields="priority", sort_by=SortBy.TITLE)
+
+    page = await repository.list_filtered(filters, single_query=single_query)
+
+    assert len(page.items) == 3
+    loaded = set(inspect(page.items[0]).dict)
+    assert {"id", "priority", "title"} <= loaded
+    assert "description" not in loaded
+
+
+@pytest.mark.asyncio()
+async def test_full_text_search(repository: TodoRepository):
+    """Test search uses web search syntax over title and description.
+
+    Validates:
+    - Words match stemmed forms in either column
+    - "-word" excludes and quoted phrases require adjacency
+    """
+    await repository.create_many(
+        [
+            {"title": "Write quarterly reports", "description": "finance draft"},
+            {"title": "Report bug", "description": "login page crashes"},
+            {"title": "Plan offsite", "description": "book the report venue"},
+        ],
+    )
+
+    async def titles(search: str) -> set[str]:
+        page = await repository.list_filtered(TodoFilterParams(search=search))
+        return {todo.title for todo in page.items}
+
+    assert await titles("report") == {"Write quarterly reports", "Report bug", "Plan offsite"}
+    assert await titles("report -draft") == {"Report bug", "Plan offsite"}
+    assert await titles('"quarterly reports"') == {"Write quarterly reports"}
+    assert await titles("crashing") == {"Report bug"}
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("single_query", [True, False])
+async def test_sort_by_relevance(repository: TodoRepository, single_query):
+    """Test relevance ranks title matches above description matches and pages by offset."""
+    await repository.create_many(
+        [
+            {"title": "Groceries", "description": "buy milk"},
+            {"title": "Milk the cows", "description": "milk milk"},
+            {"title": "Milk", "description": None},
+        ],
+    )
+    filters = TodoFilterParams(search="milk", sort_by=SortBy.RELEVANCE, limit=2)
+
+    first = await repository.list_filtered(filters, single_query=single_query)
+    rest = await repository.list_filtered(
+        filters.model_copy(update={"offset": 2}),
+        single_query=single_query,
+    )
+
+    assert first.total == 3
+    assert [todo.title for todo in first.items] == ["Milk the cows", "Milk"]
+    assert first.has_more is True
+    assert first.next_cursor is None
+    assert [todo.title for todo in rest.items] == ["Groceries"]
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    "update",
+    [{"search": None}, {"search": "  "}, {"cursor": "abc"}],
+)
+async def test_sort_by_relevance_invalid(repository: TodoRepository, update):
+    """Test relevance sort needs a search term and rejects cursors."""
+    filters = TodoFilterParams(search="milk", sort_by=SortBy.RELEVANCE).model_copy(update=update)
+
+    with pytest.raises(ValidationError):
+        await repository.list_filtered(filters)
+
+
+@pytest.mark.asyncio()
+async def test_substring_search(repository: TodoRepository):
+    """Test substring mode matches fragments inside words and treats % and _ literally."""
+    await repository.create_many(
+        [
+            {"title": "Refactor authentication", "description": None},
+            {"title": "Sale", "description": "50% off everything"},
+            {"title": "Sale", "description": "500 off_peak"},
+        ],
+    )
+
+    async def descriptions(search: str) -> list[str | None]:
+        filters = TodoFilterParams(search=search, search_mode=SearchMode.SUBSTRING)
+        page = await repository.list_filtered(filters)
+        return sorted(todo.description or todo.title for todo in page.items)
+
+    assert await descriptions("thent") == ["Refactor authentication"]
+    assert await descriptions("50%") == ["50% off everything"]
+    assert await descriptions("f_p") == ["500 off_peak"]
+
+
+@pytest.mark.asyncio()
+async def test_fuzzy_search_ranks_by_similarity(repository: TodoRepository):
+    """Test fuzzy mode tolerates typos and relevance orders the closest match first."""
+    await repository.create_many(
+        [
+            {"title": "Call dentist", "description": "move the appointmnt"},
+            {"title": "Schedule appointment", "description": None},
+            {"title": "Buy groceries", "description": None},
+        ],
+    )
+    filters = TodoFilterParams(
+        search="appointment",
+        search_mode=SearchMode.FUZZY,
+        sort_by=SortBy.RELEVANCE,
+    )
+
+    page = await repository.list_filtered(filters)
+
+    assert [todo.title for todo in page.items] == ["Schedule appointment", "Call dentist"]
+
+
+def _plan_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _page_plans(repository: TodoRepository, filters: TodoFilterParams) -> list[dict]:
+    """Run ``list_filtered`` and return the EXPLAIN plan of every statement it sent."""
+    connection = await repository.session.connection()
+    statements = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, parameters))
+
+    event.listen(connection.sync_connection, "before_cursor_execute", capture)
+    try:
+        await repository.list_filtered(filters)
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", capture)
+
+    plans = []
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar_one()
+        plans.append((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+    return plans
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    "sort_by", [SortBy.CREATED_AT, SortBy.DUE_DATE, SortBy.PRIORITY, SortBy.TITLE]
+)
+@pytest.mark.parametrize(
+    "filter_by",
+    [
+        {},
+        {"completed": False},
+        {"priority": PriorityEnum.HIGH},
+        {"completed": False, "priority": PriorityEnum.LOW},
+    ],
+)
+async def test_top_n_page_is_read_in_index_order(
+    repository: TodoRepository,
+    sort_by: SortBy,
+    filter_by: dict,
+):
+    """Test every filter/sort combination reads its page from an index without sorting.
+
+    The filters are selective (10% incomplete, 5% high and 5% low
+    priority), so an index on the sort field alone would have to skip most
+    rows with a filter, and would otherwise lose to a bitmap scan plus a
+    top-N sort over every matching row. With an index on (filters, sort
+    field, id) the filters become the index range and the page is read in
+    order, which the plan must show: no Sort, every filter in the Index
+    Cond. The single-query total may still sort the page rows it joins (at
+    most ``limit + 1``), so only nodes below the LIMIT are checked. Both
+    directions are checked, paging by offset and by cursor.
+
+    Every filter group has a few NULL due dates, fewer than a page, so the
+    first page's cursor is a real date in both directions (NULL cursors are
+    covered by ``test_due_date_cursor_is_an_index_range``).
+    """
+    await repository.create_many(
+        [
+            {
+                "title": f"plan {i % 97}",
+                "completed": i % 10 != 0,
+                "priority": [PriorityEnum.LOW, PriorityEnum.HIGH][i % 20]
+                if i % 20 < 2
+                else PriorityEnum.MEDIUM,
+                "due_date": None if i % 1000 < 2 else datetime(2025, 11, i % 28 + 1, tzinfo=UTC),
+                "created_at": datetime(2025, 1, 1, tzinfo=UTC) + timedelta(minutes=i),
+            }
+            for i in range(2000)
+        ],
+    )
+    await repository.session.execute(text("ANALYZE todos"))
+    # Where only a few rows are expected to match, sorting them is cheap and the planner
+    # may rightly choose to; disabling sorts asks whether an index-ordered plan exists
+    await repository.session.execute(text("SET LOCAL enable_sort = off"))
+    await repository.session.execute(text("SET LOCAL enable_incremental_sort = off"))
+    for sort_order in SortOrder:
+        filters = TodoFilterParams(sort_by=sort_by, sort_order=sort_order, limit=5, **filter_by)
+        first = await repository.list_filtered(filters)
+        for update in ({"offset": 5}, {"cursor": first.next_cursor}):
+            plans = await _page_plans(repository, filters.model_copy(update=update))
+
+            limits = [
+                node for plan in plans for node in _plan_nodes(plan) if node["Node Type"] == "Limit"
+            ]
+            assert limits
+            for limit in limits:
+                nodes = list(_plan_nodes(limit))
+                node_types = {node["Node Type"] for node in nodes}
+                assert not node_types & {"Sort", "Incremental Sort"}, (sort_order, node_types)
+                # The filters narrow the index range instead of being checked row by row
+                (scan,) = [
+                    node for node in nodes if node["Node Type"] in {"Index Scan", "Index Only Scan"}
+                ]
+                for column in filter_by:
+                    assert column in scan.get("Index Cond", ""), (sort_order, scan["Index Name"])
+                if "cursor" in update:
+                    # So is the cursor: the page starts at the cursor's position in the index
+                    assert re.search(r"\bid\b", scan.get("Index Cond", "")), scan["Index Name"]
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("sort_order", list(SortOrder))
+@pytest.mark.parametrize("cursor_row", ["dated", "null"])
+async def test_due_date_cursor_is_an_index_range(
+    repository: TodoRepository,
+    sort_order: SortOrder,
+    cursor_row: str,
+):
+    """Test a deep due_date cursor, NULL or not, is the range of a single index scan.
+
+    due_date is nullable; keyed on its NULL-free sort key the cursor is one
+    row comparison, which must appear in the Index Cond (no OR branches
+    filtered row by row, no BitmapOr, no Sort), with sorts left enabled.
+    The pages must still follow the full ordering across the NULL boundary.
+    """
+    await repository.create_many(
+        [
+            {
+                "title": f"due {i}",
+                "due_date": None
+                if i % 4 == 0
+                else datetime(2025, 1, 1, tzinfo=UTC) + timedelta(hours=i),
+            }
+            for i in range(4000)
+        ],
+    )
+    await repository.session.execute(text("ANALYZE todos"))
+    descending = sort_order == SortOrder.DESC
+    if descending:
+        order_by = [Todo.due_date.desc().nulls_first(), Todo.id.desc()]
+    else:
+        order_by = [Todo.due_date.asc().nulls_last(), Todo.id.asc()]
+    rows = (
+        await repository.session.execute(select(Todo.due_date, Todo.id).order_by(*order_by))
+    ).all()
+    # Halfway through the NULLs (ascending: the tail) or through the dated rows
+    positions = [
+        i for i, row in enumerate(rows) if (row.due_date is None) == (cursor_row == "null")
+    ]
+    position = positions[len(positions) // 2]
+    cursor = encode_cursor(list(rows[position]), tag=f"due_date:{sort_order.value}")
+    filters = TodoFilterParams(sort_by=SortBy.DUE_DATE, sort_order=sort_order, limit=5)
+
+    page = await repository.list_filtered(filters.model_copy(update={"cursor": cursor}))
+    assert [todo.id for todo in page.items] == [row.id for row in rows[position + 1 : position + 6]]
+
+    plans = await _page_plans(repository, filters.model_copy(update={"cursor": cursor}))
+    nodes = [
+        node
+        for plan in plans
+        for limit in _plan_nodes(plan)
+        if limit["Node Type"] == "Limit"
+        for node in _plan_nodes(limit)
+    ]
+    node_types = {node["Node Type"] for node in nodes}
+    assert not node_types & {"Sort", "Incremental Sort", "BitmapOr", "Seq Scan"}, node_types
+    (scan,) = [node for node in nodes if node["Node Type"] in {"Index Scan", "Index Only Scan"}]
+    assert scan["Index Name"] == "ix_todos_due_date_id"
+    condition = scan.get("Index Cond", "")
+    assert "due_date" in condition, condition
+    assert re.search(r"\bid\b", condition), condition
+    assert "Filter" not in scan
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("sort_order", list(SortOrder))
+async def test_cursor_with_sort_column_filtered(repository: TodoRepository, sort_order: SortOrder):
+    """Test paging by cursor when the priority filter pins the priority sort."""
+    await _seed(repository, 12)
+    filters = TodoFilterParams(
+        search="repo-test",
+        priority=PriorityEnum.HIGH,
+        sort_by=SortBy.PRIORITY,
+        sort_order=sort_order,
+        limit=2,
+    )
+    expected = await repository.list_filtered(filters.model_copy(update={"limit": 100}))
+
+    seen = []
+    page = await repository.list_filtered(filters)
+    seen.extend(page.items)
+    while page.next_cursor is not None:
+        page = await repository.list_filtered(
+            filters.model_copy(update={"cursor": page.next_cursor})
+        )
+        seen.extend(page.items)
+
+    assert [todo.id for todo in seen] == [todo.id for todo in expected.items]
+    assert len(seen) == 4
+
+
+@pytest.mark.asyncio()
+async def test_sort_by_priority_is_ordinal(repository: TodoRepository):
+    """Test priority sorts by rank (low < medium < high), not alphabetically."""
+    await repository.create_many(
+        [
+            {"title": "ordinal", "priority": priority}
+            for priority in (PriorityEnum.HIGH, PriorityEnum.LOW, PriorityEnum.MEDIUM)
+        ],
+    )
+    filters = TodoFilterParams(search="ordinal", sort_by=SortBy.PRIORITY, sort_order="asc")
+
+    page = await repository.list_filtered(filters)
+
+    assert [todo.priority for todo in page.items] == [
+        PriorityEnum.LOW,
+        PriorityEnum.MEDIUM,
+        PriorityEnum.HIGH,
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_list_statements_are_reused_per_shape(repository: TodoRepository):
+    """Test requests differing only in values share cached statements and get their own rows."""
+    await _seed(repository, 6)
+    statements = TodoRepository.list_statements
+    statements.cache_clear()
+
+    needle = await repository.list_filtered(TodoFilterParams(search="needle", priority="low"))
+    haystack = await repository.list_filtered(TodoFilterParams(search="haystack", priority="high"))
+    await repository.list_filtered(TodoFilterParams(search="needle", sort_by=SortBy.TITLE))
+
+    assert {todo.description for todo in needle.items} == {"needle"}
+    assert {todo.priority for todo in needle.items} == {PriorityEnum.LOW}
+    assert {todo.description for todo in haystack.items} == {"haystack"}
+    assert {todo.priority for todo in haystack.items} == {PriorityEnum.HIGH}
+    info = statements.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
+@pytest.mark.asyncio()
+async def test_stream_filtered_batches_without_identity_map(repository: TodoRepository):
+    """Test streaming yields column rows in batches and never fills the identity map."""
+    await _seed(repository, 7)
+    repository.session.expunge_all()
+    filters = TodoFilterParams(search="repo-test", sort_by=SortBy.TITLE, sort_order=SortOrder.ASC)
+
+    batches = await repository.stream_filtered(filters, ["id", "title"], batch_size=3)
+    sizes = []
+    titles = []
+    async for rows in batches:
+        sizes.append(len(rows))
+        titles.extend(row.title for row in rows)
+        assert len(repository.session.identity_map) == 0
+
+    assert sizes == [3, 3, 1]
+    assert titles == sorted(titles)
+    assert len(titles) == 7
+
+
+@pytest.mark.asyncio()
+async def test_update_many_clears_nullable_column_in_every_row(repository: TodoRepository):
+    """Test a bulk update setting a column to NULL in every row of a group.
+
+    Validates:
+    - The VALUES column holding only NULLs is typed as the target column
+      (PostgreSQL would otherwise infer text and reject the assignment)
+    - Rows changing other attributes are updated alongside
+    """
+    due = datetime(2030, 1, 1, tzinfo=UTC)
+    todos = await repository.create_many(
+        [
+            {"title": f"clear-due {i}", "due_date": due, "priority": PriorityEnum.LOW}
+            for i in range(3)
+        ],
+    )
+
+    updated = await repository.update_many(
+        [
+            {"id": todos[0].id, "due_date": None},
+            {"id": todos[1].id, "due_date": None},
+            {"id": todos[2].id, "due_date": None, "priority": PriorityEnum.HIGH},
+        ],
+    )
+
+    by_id = {todo.id: todo for todo in updated}
+    assert [by_id[todo.id].due_date for todo in todos] == [None, None, None]
+    assert by_id[todos[2].id].priority == PriorityEnum.HIGH
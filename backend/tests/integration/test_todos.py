@@ -9,9 +9,18 @@ Defense-in-depth strategy:
 - Both layers handle the HTML form empty string issue
 """
 
+import csv
+import io
+import json
+import uuid
+
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from app.core import database
+from app.core.database import PRIMARY_STICKY_COOKIE, Replica, ReplicaSet
+
 
 def test_create_todo_with_empty_due_date_string_converted(test_client: TestClient):
     """Test that empty string for optional due_date is CONVERTED to None.
@@ -92,3 +101,367 @@ def test_create_todo_with_invalid_due_date(test_client: TestClient):
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     data = response.json()
     assert "detail" in data
+
+
+def _create_todos(test_client: TestClient, marker: str, count: int) -> list[int]:
+    """Create todos tagged with a unique marker so tests can filter to their own rows."""
+    priorities = ["low", "medium", "high"]
+    ids = []
+    for i in range(count):
+        response = test_client.post(
+            "/api/v1/todos",
+            json={
+                "title": f"{marker} {i % 4}",  # Duplicate titles exercise the id tie-breaker
+                "priority": priorities[i % 3],
+                "due_date": None if i % 3 == 0 else f"2025-11-{(i % 5) + 1:02d}T10:00:00Z",
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "due_date", "priority", "title"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_list_todos_cursor_pagination_matches_offset(
+    test_client: TestClient,
+    sort_by: str,
+    sort_order: str,
+):
+    """Test walking pages by cursor returns the same rows as a single offset page.
+
+    Validates:
+    - Every SortBy value and both directions can be paged with next_cursor
+    - Ties and NULL due dates neither skip nor repeat rows
+    - The last page has no next_cursor
+    """
+    marker = f"cursor-{uuid.uuid4().hex[:12]}"
+    ids = _create_todos(test_client, marker, 11)
+    params = {"search": marker, "sort_by": sort_by, "sort_order": sort_order}
+
+    full = test_client.get("/api/v1/todos", params={**params, "limit": 100}).json()
+    expected = [item["id"] for item in full["items"]]
+    assert sorted(expected) == sorted(ids)
+    assert full["next_cursor"] is None
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page_params = {**params, "limit": 4}
+        if cursor:
+            page_params["cursor"] = cursor
+        response = test_client.get("/api/v1/todos", params=page_params)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert page["total"] == len(ids)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_list_todos_cursor_rejects_other_sort(test_client: TestClient):
+    """Test a cursor issued for one ordering is rejected for another."""
+    marker = f"cursor-{uuid.uuid4().hex[:12]}"
+    _create_todos(test_client, marker, 3)
+    page = test_client.get(
+        "/api/v1/todos",
+        params={"search": marker, "limit": 1, "sort_by": "title"},
+    ).json()
+
+    response = test_client.get(
+        "/api/v1/todos",
+        params={"search": marker, "limit": 1, "sort_by": "priority", "cursor": page["next_cursor"]},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_list_todos_cursor_with_offset_rejected(test_client: TestClient):
+    """Test cursor and offset cannot be combined."""
+    marker = f"cursor-{uuid.uuid4().hex[:12]}"
+    _create_todos(test_client, marker, 3)
+    page = test_client.get("/api/v1/todos", params={"search": marker, "limit": 1}).json()
+
+    response = test_client.get(
+        "/api/v1/todos",
+        params={"search": marker, "limit": 1, "offset": 1, "cursor": page["next_cursor"]},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_bulk_create_update_delete(test_client: TestClient):
+    """Test the bulk endpoints round-trip a batch with per-item results.
+
+    Validates:
+    - POST /bulk creates every item and returns them in request order
+    - PATCH /bulk applies different partial updates and reports unknown IDs
+    - DELETE /bulk deletes in one call and reports unknown IDs
+    """
+    marker = f"bulk-{uuid.uuid4().hex[:12]}"
+    response = test_client.post(
+        "/api/v1/todos/bulk",
+        json={
+            "items": [
+                {"title": f"{marker} 0", "priority": "high"},
+                {"title": f"{marker} 1", "due_date": "2025-11-01T10:00:00Z"},
+                {"title": f"{marker} 2"},
+            ],
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    created = response.json()["results"]
+    assert [r["item"]["title"] for r in created] == [f"{marker} {i}" for i in range(3)]
+    assert all(r["status"] == "created" for r in created)
+    ids = [r["id"] for r in created]
+
+    response = test_client.patch(
+        "/api/v1/todos/bulk",
+        json={
+            "items": [
+                {"id": ids[0], "completed": True},
+                {"id": ids[1], "title": f"{marker} renamed", "priority": "low"},
+                {"id": 2_000_000_000, "completed": True},
+            ],
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    updated = response.json()["results"]
+    assert [r["status"] for r in updated] == ["updated", "updated", "not_found"]
+    assert updated[0]["item"]["completed"] is True
+    assert updated[1]["item"]["title"] == f"{marker} renamed"
+    assert updated[1]["item"]["priority"] == "low"
+
+    response = test_client.request(
+        "DELETE",
+        "/api/v1/todos/bulk",
+        json={"ids": [ids[0], ids[2], 2_000_000_000]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [r["status"] for r in response.json()["results"]] == ["deleted", "deleted", "not_found"]
+
+    remaining = test_client.get("/api/v1/todos", params={"search": marker}).json()
+    assert [item["id"] for item in remaining["items"]] == [ids[1]]
+
+
+@pytest.mark.parametrize("field", ["title", "completed", "priority"])
+def test_bulk_update_rejects_null_for_required_field(test_client: TestClient, field: str):
+    """Test a bulk update item nulling a NOT NULL column is a 422, not a failed batch."""
+    marker = f"bulk-null-{uuid.uuid4().hex[:12]}"
+    (todo_id,) = _create_todos(test_client, marker, 1)
+
+    response = test_client.patch(
+        "/api/v1/todos/bulk",
+        json={"items": [{"id": todo_id, "description": "kept?"}, {"id": todo_id, field: None}]},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["body", "items", 1, field]
+    todo = test_client.get(f"/api/v1/todos/{todo_id}").json()
+    assert todo["description"] is None  # nothing in the batch was applied
+
+
+@pytest.mark.parametrize("count", ["exact", "estimated", "none"])
+def test_list_todos_count_modes(test_client, count):
+    """Test the count query parameter is honored and reported back."""
+    marker = f"count-{uuid.uuid4().hex[:8]}"
+    _create_todos(test_client, marker, 3)
+
+    response = test_client.get(
+        "/api/v1/todos",
+        params={"search": marker, "limit": 2, "count": count},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["has_more"] is True
+    if count == "none":
+        assert data["total"] is None
+        assert data["count_mode"] == "none"
+    elif count == "exact":
+        assert data["total"] == 3
+        assert data["count_mode"] == "exact"
+    else:
+        assert data["total"] >= 3
+        assert data["count_mode"] == "estimated"
+
+
+def test_list_todos_sparse_fields(test_client):
+    """Test fields= trims list items to the requested fields plus id."""
+    marker = f"fields-{uuid.uuid4().hex[:8]}"
+    _create_todos(test_client, marker, 3)
+
+    response = test_client.get(
+        "/api/v1/todos",
+        params={"search": marker, "limit": 2, "fields": "title, priority", "sort_by": "due_date"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [set(item) for item in data["items"]] == [{"id", "title", "priority"}] * 2
+    assert data["total"] == 3
+    assert data["next_cursor"] is not None
+
+    next_page = test_client.get(
+        "/api/v1/todos",
+        params={
+            "search": marker,
+            "limit": 2,
+            "fields": "title",
+            "sort_by": "due_date",
+            "cursor": data["next_cursor"],
+        },
+    ).json()
+    assert [set(item) for item in next_page["items"]] == [{"id", "title"}]
+
+
+def test_get_todo_sparse_fields(test_client):
+    """Test fields= trims the detail response and rejects unknown fields."""
+    created = test_client.post("/api/v1/todos", json={"title": "Sparse"}).json()
+
+    response = test_client.get(f"/api/v1/todos/{created['id']}", params={"fields": "completed"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"id": created["id"], "completed": False}
+
+    response = test_client.get(f"/api/v1/todos/{created['id']}", params={"fields": "secret"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "secret" in response.json()["detail"]
+
+
+def test_list_todos_unknown_field(test_client):
+    """Test an unknown list field is a 422."""
+    response = test_client.get("/api/v1/todos", params={"fields": "title,nope"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_writes_pin_reads_to_primary(test_client: TestClient, monkeypatch):
+    """Test todo writes set the read-your-writes cookie when replicas are configured.
+
+    Validates:
+    - POST (model response) and DELETE (204) both carry the cookie
+    - GET responses do not
+    """
+    monkeypatch.setattr(
+        database, "replicas", ReplicaSet([Replica("stand-in", None)], retry_after=30)
+    )
+
+    created = test_client.post("/api/v1/todos", json={"title": "sticky"})
+    listed = test_client.get("/api/v1/todos", params={"limit": 1})
+    deleted = test_client.delete(f"/api/v1/todos/{created.json()['id']}")
+
+    assert PRIMARY_STICKY_COOKIE in created.cookies
+    assert PRIMARY_STICKY_COOKIE not in listed.cookies
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert PRIMARY_STICKY_COOKIE in deleted.cookies
+
+
+def test_export_todos_ndjson(test_client):
+    """Test the NDJSON export streams every matching todo in sort order."""
+    marker = f"export-{uuid.uuid4().hex[:8]}"
+    ids = _create_todos(test_client, marker, 5)
+
+    response = test_client.get(
+        "/api/v1/todos/export",
+        params={"search": marker, "sort_by": "created_at", "sort_order": "asc"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="todos.ndjson"' in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    items = [json.loads(line) for line in lines]
+    assert [item["id"] for item in items] == ids
+    listed = test_client.get("/api/v1/todos", params={"search": marker, "sort_order": "asc"})
+    assert items == listed.json()["items"]
+
+
+def test_export_todos_csv_with_filters_and_fields(test_client):
+    """Test the CSV export honors filters and fields, with a header row."""
+    marker = f"export-{uuid.uuid4().hex[:8]}"
+    _create_todos(test_client, marker, 6)
+
+    response = test_client.get(
+        "/api/v1/todos/export",
+        params={
+            "format": "csv",
+            "search": marker,
+            "priority": "high",
+            "fields": "title,due_date",
+            "sort_by": "title",
+            "sort_order": "asc",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "title", "due_date"]
+    assert [row[1] for row in rows[1:]] == [f"{marker} 1", f"{marker} 2"]
+    assert rows[1][2] == "2025-11-01T10:00:00Z"
+
+
+def test_export_todos_invalid_params(test_client):
+    """Test invalid export parameters fail before the stream starts."""
+    relevance = test_client.get("/api/v1/todos/export", params={"sort_by": "relevance"})
+    unknown = test_client.get("/api/v1/todos/export", params={"fields": "nope"})
+    bad_format = test_client.get("/api/v1/todos/export", params={"format": "xml"})
+
+    assert relevance.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert unknown.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert bad_format.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_import_todos_round_trips_export(test_client):
+    """Test an NDJSON export imports again through COPY, reporting bad rows by line."""
+    marker = f"import-{uuid.uuid4().hex[:8]}"
+    _create_todos(test_client, marker, 3)
+    exported = test_client.get(
+        "/api/v1/todos/export",
+        params={"search": marker, "sort_order": "asc"},
+    ).text
+    renamed = exported.replace(marker, f"{marker}-copy")
+
+    response = test_client.post(
+        "/api/v1/todos/import",
+        content=f'{renamed}{{"title": "{"x" * 201}"}}\n'.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["imported"], data["failed"]) == (3, 1)
+    assert data["errors"][0]["line"] == 4
+    assert data["errors"][0]["errors"][0].startswith("title:")
+    original = [json.loads(line) for line in exported.splitlines()]
+    copies = test_client.get(
+        "/api/v1/todos/export",
+        params={"search": f"{marker}-copy", "sort_order": "asc"},
+    ).text.splitlines()
+    keys = ("description", "completed", "priority", "due_date", "created_at")
+    assert [{k: json.loads(line)[k] for k in keys} for line in copies] == [
+        {k: item[k] for k in keys} for item in original
+    ]
+
+
+def test_import_todos_csv(test_client):
+    """Test a CSV import creates the rows in file order."""
+    marker = f"import-{uuid.uuid4().hex[:8]}"
+    body = f'title,priority,completed\n"{marker}, first",high,true\n{marker} second,,\n'
+
+    response = test_client.post(
+        "/api/v1/todos/import",
+        params={"format": "csv"},
+        content=body.encode(),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"imported": 2, "failed": 0, "errors": []}
+    items = test_client.get("/api/v1/todos", params={"search": marker, "sort_by": "title"}).json()
+    assert [(i["title"], i["priority"], i["completed"]) for i in items["items"]] == [
+        (f"{marker}, first", "high", True),
+        (f"{marker} second", "medium", False),
+    ]
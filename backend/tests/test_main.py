@@ -5,12 +5,19 @@ Tests cover:
 - CORS middleware
 - Request ID middleware
 - Custom exception handlers
+- Prometheus metrics endpoint
 - OpenAPI specification availability
 """
 
+import asyncio
+
 import pytest
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
+from structlog.testing import capture_logs
 
+from app.core import middleware
+from app.core.access_log import AccessLogSampler, always_log_request
 from app.core.exceptions import ForbiddenError, NotFoundError, ValidationError
 from main import app
 
@@ -94,6 +101,108 @@ class TestRequestIDMiddleware:
 
         assert request_id1 != request_id2
 
+    def test_completion_log_reports_pool_usage(self):
+        """Test the completion log line carries the request's pool checkouts and pool load."""
+        with capture_logs() as logs:
+            response = client.get("/api/v1/health")
+        assert response.status_code == 200
+
+        (line,) = [log for log in logs if log["event"] == "GET /api/v1/health"]
+        assert line["db"] == 0  # /health never touches the database
+        assert line["db_wait"] == 0
+        assert line["pool"].endswith("/15")  # in use / DB_POOL_SIZE + DB_MAX_OVERFLOW
+
+    def test_inbound_request_id_is_kept(self):
+        """Test a request ID set by the load balancer is returned and logged."""
+        with capture_logs() as logs:
+            response = client.get("/api/v1/health", headers={"X-Request-ID": "lb-1234.abcd:5678"})
+
+        assert response.headers["x-request-id"] == "lb-1234.abcd:5678"
+        (line,) = [log for log in logs if log["event"] == "GET /api/v1/health"]
+        assert line["request_id"] == "bcd:5678"  # last 8 characters
+
+    @pytest.mark.parametrize("inbound", ["", "has space", "x" * 129, "new\nline"])
+    def test_unacceptable_inbound_request_id_is_replaced(self, inbound):
+        """Test malformed inbound IDs are not echoed (or logged); a UUID4 is used instead."""
+        response = client.get("/api/v1/health", headers={"X-Request-ID": inbound})
+
+        assert response.headers["x-request-id"] != inbound
+        assert len(response.headers["x-request-id"]) == 36
+
+    def test_sampled_out_requests_are_not_logged(self, monkeypatch):
+        """Test fast 2xx lines follow the route's rate; errors and flagged requests always log."""
+        sampler = AccessLogSampler(default_rate=1, route_rates={"/api/v1/health": 0})
+        monkeypatch.setattr(middleware, "access_log_sampler", sampler)
+
+        @app.get("/test/flagged")
+        async def test_flagged():
+            always_log_request()
+            return {}
+
+        with capture_logs() as logs:
+            client.get("/api/v1/health")
+            client.get("/api/v1/health/db")
+            client.get("/api/v1/missing")
+            client.get("/test/flagged")
+
+        assert [log["event"] for log in logs if "code" in log] == [
+            "GET /api/v1/health/db",
+            "GET /api/v1/missing",
+            "GET /test/flagged",
+        ]
+        assert all("weight" not in log for log in logs)
+
+    def test_sampled_line_carries_weight(self, monkeypatch):
+        """Test a line sampled at 1/4 says it stands for four requests."""
+        sampler = AccessLogSampler(default_rate=0.25, rng=lambda: 0.0)
+        monkeypatch.setattr(middleware, "access_log_sampler", sampler)
+
+        with capture_logs() as logs:
+            client.get("/api/v1/health")
+
+        (line,) = [log for log in logs if log["event"] == "GET /api/v1/health"]
+        assert line["weight"] == 4
+
+    def test_unmatched_requests_share_one_sampling_route(self, monkeypatch):
+        """Test requests no route matched are sampled as ``unmatched``, not by their raw path."""
+        sampler = AccessLogSampler(default_rate=1, route_rates={middleware.UNMATCHED_ROUTE: 0})
+        monkeypatch.setattr(middleware, "access_log_sampler", sampler)
+
+        with capture_logs() as logs:
+            for i in range(3):
+                # Preflights are answered by CORSMiddleware with a 200, before any route
+                client.options(
+                    f"/api/v1/anything-{i}",
+                    headers={
+                        "Origin": "http://localhost:5173",
+                        "Access-Control-Request-Method": "GET",
+                    },
+                )
+
+        assert [log for log in logs if "code" in log] == []
+        assert sampler.stats.skipped == 3
+
+    def test_streaming_response_timed_to_last_byte(self):
+        """Test streamed bodies pass through and the duration covers the whole body."""
+
+        @app.get("/test/stream")
+        async def test_stream():
+            async def chunks():
+                for chunk in (b"a", b"b", b"c"):
+                    await asyncio.sleep(0.02)
+                    yield chunk
+
+            return StreamingResponse(chunks())
+
+        with capture_logs() as logs:
+            response = client.get("/test/stream")
+
+        assert response.content == b"abc"
+        assert "x-request-id" in response.headers
+        (line,) = [log for log in logs if log["event"] == "GET /test/stream"]
+        assert line["code"] == 200
+        assert line["t"] >= 60
+
 
 class TestExceptionHandlers:
     """Test custom exception handlers."""
@@ -135,6 +244,33 @@ class TestExceptionHandlers:
         assert response.json() == {"detail": "Invalid input"}
 
 
+class TestMetricsEndpoint:
+    """Test the Prometheus /metrics endpoint."""
+
+    def test_metrics_count_requests_per_route(self):
+        """Test that requests are counted and timed by route template, not raw path."""
+        client.get("/api/v1/health")
+        client.get("/no/such/path")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'http_requests_total{method="GET",route="/api/v1/health",status="200"}' in text
+        assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in text
+        assert (
+            'http_request_duration_seconds_bucket{method="GET",route="/api/v1/health",le="+Inf"}'
+            in text
+        )
+        assert "# TYPE http_requests_in_flight gauge" in text
+        assert "http_requests_in_flight 1" in text  # the scrape itself
+
+    def test_metrics_not_in_openapi_spec(self):
+        """Test that /metrics is not part of the API documentation."""
+        assert "/metrics" not in client.get("/openapi.json").json()["paths"]
+
+
 class TestOpenAPISpec:
     """Test OpenAPI specification availability."""
 
@@ -150,6 +286,17 @@ class TestOpenAPISpec:
         assert "/api/v1/health" in spec["paths"]
         assert "/api/v1/health/db" in spec["paths"]
 
+    def test_openapi_spec_documents_todo_bodies(self):
+        """Test that json_body request bodies are documented like regular ones."""
+        spec = client.get("/openapi.json").json()
+        create = spec["paths"]["/api/v1/todos"]["post"]
+        assert create["requestBody"]["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/TodoCreate"
+        }
+        assert "422" in create["responses"]
+        schemas = spec["components"]["schemas"]
+        assert {"TodoCreate", "TodoUpdate", "TodoBulkCreate"} <= schemas.keys()
+
     def test_openapi_docs_accessible(self):
         """Test that Swagger UI docs are accessible at default FastAPI path."""
         response = client.get("/docs")